@@ -0,0 +1,297 @@
+# benchmarks/bench_fanout.py
+"""Drive the promo send and auto-delete paths against a fake Telegram client.
+
+    python -m benchmarks.bench_fanout [--channels 10,100,1000] [--latency 0.05]
+        [--flood-rate 0.01] [--fail-rate 0.01] [--photo-fail-rate 0.05]
+
+Nothing leaves the machine: the fake client answers every call after
+--latency seconds and injects FloodWaits, permanent failures and rejected
+photos at the given rates. Storage is the in-memory backend, wrapped so
+every backend call is counted. Each scenario reports posts/second, wall
+time, DB calls per post and peak traced memory.
+"""
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import io
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# The harness never talks to Telegram or a database server
+os.environ["STORAGE_BACKEND"] = "memory"
+for name, value in (("API_ID", "1"), ("API_HASH", "bench"), ("BOT_TOKEN", "bench")):
+    os.environ.setdefault(name, value)
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import config
+    import database
+    from handlers import autocrossdel, campaigns, promo
+    from storage.memory import MemoryBackend
+    from utils import media
+
+from pyrogram.errors import ChatWriteForbidden, FloodWait, WebpageCurlFailed
+
+ADMIN_ID = config.ADMINS[0] if config.ADMINS else 1
+
+# -----------------------------
+# Fake Pyrogram client
+# -----------------------------
+class FakeClient:
+    """Answers the Client methods the bot uses, with latency and injected errors"""
+
+    def __init__(self, latency: float, flood_rate: float, flood_seconds: int, fail_rate: float, photo_fail_rate: float):
+        self.latency = latency
+        self.flood_rate = flood_rate
+        self.flood_seconds = flood_seconds
+        self.fail_rate = fail_rate
+        self.photo_fail_rate = photo_fail_rate
+        self.calls = 0
+        self.floods = 0
+        self.photo_fallbacks = 0
+        self.done = asyncio.Event()
+        self._next_id = 0
+        self._broken = set()  # chats that reject every post, like a channel that removed the bot
+
+    async def _call(self, chat_id=None, post=False):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if not post:
+            return
+        if random.random() < self.flood_rate:
+            self.floods += 1
+            raise FloodWait(value=self.flood_seconds)
+        if chat_id in self._broken or random.random() < self.fail_rate:
+            self._broken.add(chat_id)
+            raise ChatWriteForbidden()
+
+    def _message(self, **media):
+        self._next_id += 1
+        return SimpleNamespace(**{"id": self._next_id, "photo": None, "video": None, "animation": None, "document": None, **media})
+
+    async def get_me(self):
+        await self._call()
+        return SimpleNamespace(id=0, username="benchbot")
+
+    async def send_message(self, chat_id, text, reply_markup=None, parse_mode=None, **kwargs):
+        await self._call(chat_id, post=chat_id != ADMIN_ID)
+        return self._message()
+
+    async def send_photo(self, chat_id, photo, caption=None, reply_markup=None, parse_mode=None, **kwargs):
+        await self._call(chat_id, post=True)
+        if random.random() < self.photo_fail_rate:
+            self.photo_fallbacks += 1
+            raise WebpageCurlFailed()
+        return self._message(photo=SimpleNamespace(file_id=f"photo-{hash(photo) & 0xffff}"))
+
+    send_video = send_photo
+    send_document = send_photo
+
+    async def forward_messages(self, chat_id, from_chat_id, message_ids, **kwargs):
+        await self._call(chat_id, post=True)
+        return self._message()
+
+    async def edit_message_text(self, chat_id, message_id, text, **kwargs):
+        await self._call()
+        if text.startswith("✅"):
+            self.done.set()  # the campaign summary replaced the status message
+
+    async def delete_messages(self, chat_id, message_ids, **kwargs):
+        await self._call(chat_id)
+
+class FakeCallback:
+    """Just enough of a CallbackQuery for the promo wizard's last step"""
+
+    def __init__(self, client: FakeClient):
+        self.from_user = SimpleNamespace(id=ADMIN_ID)
+        self.message = SimpleNamespace(chat=SimpleNamespace(id=ADMIN_ID), id=1, edit_text=self._edit)
+        self.client = client
+
+    async def answer(self, *args, **kwargs):
+        pass
+
+    async def _edit(self, text, **kwargs):
+        await self.client.edit_message_text(ADMIN_ID, self.message.id, text)
+
+# -----------------------------
+# Counting storage backend
+# -----------------------------
+_inside_backend = contextvars.ContextVar("inside_backend", default=False)
+
+def counting_backend():
+    """Fresh in-memory backend whose async methods count their calls"""
+    backend = MemoryBackend()
+    backend.calls = {}
+    backend.idle_claims = 0
+    for name in dir(backend):
+        method = getattr(backend, name)
+        if name.startswith("_") or not asyncio.iscoroutinefunction(method):
+            continue
+
+        def wrap(name, method):
+            async def counted(*args, **kwargs):
+                if _inside_backend.get():
+                    return await method(*args, **kwargs)  # the backend calling itself is not a separate DB call
+                token = _inside_backend.set(True)
+                try:
+                    result = await method(*args, **kwargs)
+                finally:
+                    _inside_backend.reset(token)
+                if name == "claim_job" and result is None:
+                    backend.idle_claims += 1  # a worker polling an empty queue, not work done for a post
+                else:
+                    backend.calls[name] = backend.calls.get(name, 0) + 1
+                return result
+            return counted
+        setattr(backend, name, wrap(name, method))
+    return backend
+
+async def fresh_database(channels: int):
+    database.backend = counting_backend()
+    media._file_ids.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        await database.init_db()
+    ids = list(range(-1001000000000, -1001000000000 + channels))
+    for cid in ids:
+        await database.backend.save_channel({
+            "user_id": 1,
+            "channel_id": cid,
+            "username": f"chan{abs(cid)}",
+            "title": f"Channel {abs(cid)}",
+            "category": "tech",
+            "subs_range": "1k-5k",
+            "subs_count": 1000 + abs(cid) % 4000,
+            "status": "approved",
+            "added_at": datetime.utcnow(),
+        })
+    database.backend.calls.clear()
+    return ids
+
+# -----------------------------
+# Scenarios
+# -----------------------------
+async def run_send(client: FakeClient, ids, send_mode: str):
+    """One "Post Now" through create_promo_post, until the summary replaces the status message"""
+    session = {"final": ids, "category": "tech", "send_mode": send_mode, "duration": 3600}
+    if send_mode == "template":
+        session["template"] = "template1"
+    else:
+        session["custom_message"] = {"text": "Bench promo", "media": "bench-photo", "message_type": "photo"}
+    promo.selected_channels[ADMIN_ID] = session
+
+    await campaigns.start_campaign_workers(client)
+    try:
+        await promo.create_promo_post(client, FakeCallback(client))
+        await client.done.wait()
+    finally:
+        for worker in campaigns._workers:
+            worker.cancel()
+        await asyncio.gather(*campaigns._workers, return_exceptions=True)
+        campaigns._workers.clear()
+
+    return len(database.backend.promos)
+
+async def run_cleanup(client: FakeClient, ids):
+    """promo_cleanup_worker deleting one expired promo per channel"""
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    await database.backend.insert_promos([
+        {
+            "channel": f"@chan{abs(cid)}",
+            "message_id": index + 1,
+            "duration": 3600,
+            "created_at": expired - timedelta(seconds=3600),
+            "expires_at": expired,
+            "promo_id": database.generate_promo_id(),
+        }
+        for index, cid in enumerate(ids)
+    ])
+    database.backend.calls.clear()
+
+    worker = asyncio.create_task(autocrossdel.promo_cleanup_worker(client))
+    try:
+        while database.backend.promos:  # read directly so the harness's checks are not counted
+            await asyncio.sleep(0.01)
+    finally:
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+    return len(ids)
+
+SCENARIOS = {
+    "template": lambda client, ids: run_send(client, ids, "template"),
+    "custom": lambda client, ids: run_send(client, ids, "custom"),
+    "cleanup": run_cleanup,
+}
+
+async def measure(name: str, channels: int, args):
+    random.seed(args.seed)
+    ids = await fresh_database(channels)
+    client = FakeClient(args.latency, args.flood_rate, args.flood_seconds, args.fail_rate, args.photo_fail_rate)
+
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO()):
+        done = await SCENARIOS[name](client, ids)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+
+    backend = database.backend
+    db_calls = sum(backend.calls.values())
+    return {
+        "scenario": name,
+        "channels": channels,
+        "done": done,
+        "elapsed": elapsed,
+        "rate": done / elapsed if elapsed else 0.0,
+        "db_per_post": db_calls / done if done else 0.0,
+        "tg_calls": client.calls,
+        "floods": client.floods,
+        "fallbacks": client.photo_fallbacks,
+        "idle_claims": backend.idle_claims,
+        "peak_kb": peak / 1024,
+        "top_calls": sorted(backend.calls.items(), key=lambda item: -item[1])[:4],
+    }
+
+def report(row):
+    print(
+        f"{row['scenario']:<9} {row['channels']:>6} {row['done']:>6} {row['elapsed']:>8.2f}s {row['rate']:>9.1f}/s "
+        f"{row['db_per_post']:>7.2f} {row['tg_calls']:>7} {row['floods']:>5} {row['fallbacks']:>5} {row['peak_kb']:>9.0f}KB"
+    )
+    print("          db: " + ", ".join(f"{name}={count}" for name, count in row["top_calls"]) + f" (+{row['idle_claims']} idle polls)")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", default="10,100,1000", help="comma-separated channel counts")
+    parser.add_argument("--scenarios", default="template,custom,cleanup")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per fake Telegram call")
+    parser.add_argument("--flood-rate", type=float, default=0.01)
+    parser.add_argument("--flood-seconds", type=int, default=1)
+    parser.add_argument("--fail-rate", type=float, default=0.01, help="chance a channel rejects posts for good")
+    parser.add_argument("--photo-fail-rate", type=float, default=0.05, help="chance a photo is rejected and sent as text")
+    parser.add_argument("--concurrency", type=int, default=config.SEND_CONCURRENCY)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="show the bot's own log lines")
+    args = parser.parse_args()
+
+    # Retries and FloodWait requeues are picked up promptly instead of on the production poll interval
+    config.SEND_CONCURRENCY = args.concurrency
+    config.JOB_POLL_INTERVAL = 0.05
+    config.JOB_RETRY_BACKOFF = 0
+    config.AUTO_DELETE_CHECK_INTERVAL = 0.05
+    config.NOTIFY_ON_MANUAL_DELETION = False
+
+    print(
+        f"latency={args.latency}s flood={args.flood_rate:.0%}x{args.flood_seconds}s fail={args.fail_rate:.0%} "
+        f"photo-fail={args.photo_fail_rate:.0%} workers={args.concurrency}\n"
+    )
+    print(f"{'scenario':<9} {'chans':>6} {'posts':>6} {'wall':>9} {'rate':>11} {'db/post':>7} {'tg':>7} {'flood':>5} {'fallb':>5} {'peak mem':>11}")
+    tracemalloc.start()
+    for channels in (int(n) for n in args.channels.split(",")):
+        for name in args.scenarios.split(","):
+            report(await measure(name, channels, args))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+# benchmarks/bench_storage.py
+"""Run the bot's hot storage workloads against each backend and compare.
+
+    python -m benchmarks.bench_storage [--channels 20000] [--lookups 20000]
+
+memory and sqlite (a temp file) always run; mongo runs when MONGO_DB_URI is
+set, against a throwaway database that is dropped afterwards.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from storage.memory import MemoryBackend
+from storage.sqlite import SQLiteBackend
+
+CATEGORIES = ["Movies", "Music", "Tech", "Crypto", "Education", "Gaming"]
+RANGES = [(500, 1000), (1000, 5000), (5000, 10000), (10000, None)]
+
+def make_channel(channel_id: int, now: datetime):
+    return {
+        "user_id": channel_id % 5000,
+        "channel_id": channel_id,
+        "username": f"chan{channel_id}",
+        "title": f"Channel {channel_id}",
+        "category": random.choice(CATEGORIES),
+        "subs_range": "",
+        "subs_count": random.randint(500, 50000),
+        "status": random.choice(["APPROVED", "APPROVED", "APPROVED", "PENDING", "DENIED"]),
+        "added_at": now - timedelta(seconds=channel_id % 1000000),
+    }
+
+async def timed(results: dict, name: str, ops: int, coro):
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    results[name] = (ops, elapsed)
+
+async def run_workloads(backend, channels: int, lookups: int):
+    random.seed(42)
+    now = datetime.utcnow()
+    ids = list(range(-1001000000000, -1001000000000 + channels))
+    docs = [make_channel(cid, now) for cid in ids]
+    results = {}
+    await backend.init()
+
+    async def save_channels():
+        for doc in docs:
+            await backend.save_channel(doc)
+
+    async def upsert_users():
+        users = {user_id: f"user{user_id}" for user_id in range(channels)}
+        for start in range(0, len(users), 500):
+            await backend.upsert_users(dict(list(users.items())[start:start + 500]))
+
+    async def point_lookups():
+        for cid in random.choices(ids, k=lookups):
+            await backend.get_channel(cid)
+
+    async def bulk_lookups():
+        for _ in range(lookups // 50):
+            await backend.get_channels(random.sample(ids, 50))
+
+    async def range_queries():
+        for category in CATEGORIES:
+            for low, high in RANGES:
+                await backend.channels_in_range(category, low, high, set())
+
+    async def user_pages():
+        for user_id in random.choices(range(5000), k=lookups // 10):
+            await backend.user_channels_page(user_id, "APPROVED", 0, 1)
+
+    async def insert_promos():
+        # finish_campaign writes a campaign's promos in one batch; 50 posts per campaign
+        for start in range(0, lookups // 10, 50):
+            batch = []
+            for i in range(start, min(start + 50, lookups // 10)):
+                created_at = now - timedelta(seconds=random.randint(0, 7200))
+                batch.append({
+                    "channel": f"@chan{i}",
+                    "message_id": i,
+                    "duration": 3600,
+                    "created_at": created_at,
+                    "expires_at": created_at + timedelta(seconds=3600),
+                    "promo_id": f"PROMO_BENCH_{i}",
+                })
+            await backend.insert_promos(batch)
+
+    async def due_promos():
+        for _ in range(100):
+            await backend.due_promos(now, 100)
+
+    async def stats():
+        for _ in range(100):
+            await backend.counts()
+
+    await timed(results, "save_channel", channels, save_channels())
+    await timed(results, "upsert_users (batches of 500)", channels, upsert_users())
+    await timed(results, "get_channel", lookups, point_lookups())
+    await timed(results, "get_channels (50 ids)", lookups // 50, bulk_lookups())
+    await timed(results, "channels_in_range", len(CATEGORIES) * len(RANGES), range_queries())
+    await timed(results, "user_channels_page", lookups // 10, user_pages())
+    await timed(results, "insert_promos (batches of 50)", lookups // 10, insert_promos())
+    await timed(results, "due_promos (100)", 100, due_promos())
+    await timed(results, "counts", 100, stats())
+    return results
+
+def print_results(name: str, results: dict):
+    print(f"\n== {name} ==")
+    print(f"{'workload':32} {'ops':>8} {'total s':>9} {'us/op':>10} {'ops/s':>12}")
+    for workload, (ops, elapsed) in results.items():
+        print(f"{workload:32} {ops:>8} {elapsed:>9.3f} {elapsed / ops * 1e6:>10.1f} {ops / elapsed:>12.0f}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    print_results("memory", await run_workloads(MemoryBackend(), args.channels, args.lookups))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteBackend(os.path.join(tmp, "bench.db"))
+        print_results("sqlite", await run_workloads(backend, args.channels, args.lookups))
+        backend.conn.close()
+
+    uri = os.getenv("MONGO_DB_URI")
+    if uri:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from storage.mongo import MongoBackend
+        client = AsyncIOMotorClient(uri)
+        db_name = f"promofather_bench_{int(time.time())}"
+        try:
+            print_results("mongo", await run_workloads(MongoBackend(client, db_name), args.channels, args.lookups))
+        finally:
+            await client.drop_database(db_name)
+    else:
+        print("\n(mongo skipped: set MONGO_DB_URI to include it)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+# benchmarks/bench_templates.py
+"""Time promo rendering for large channel lists, cold versus memoized.
+
+    python -m benchmarks.bench_templates [--channels 100,500,2000] [--repeat 200]
+
+"cold" calls the template functions through __wrapped__, which is what every
+render cost before memoization; "cached" goes through generate_promo_message
+and generate_promo_buttons after one warm-up call, the path build_payload
+takes when the same group is posted again (schedules, auto groups, retries).
+"""
+import argparse
+import time
+
+from utils import crosstempl
+
+def make_channels(count: int):
+    return [
+        {
+            "channel_id": -1001000000000 - i,
+            "username": f"chan{i}" if i % 7 else None,  # every seventh channel is private
+            "title": f"Channel number {i}",
+        }
+        for i in range(count)
+    ]
+
+def per_call(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+def measure(template_id: str, channels, repeat: int):
+    key = crosstempl.channel_key(channels)
+    render_message = crosstempl._render_message.__wrapped__
+    render_buttons = crosstempl._render_buttons.__wrapped__
+
+    crosstempl._render_message.cache_clear()
+    crosstempl._render_buttons.cache_clear()
+    crosstempl.generate_promo_message(template_id, channels, "tech", "Bench")
+    crosstempl.generate_promo_buttons(channels, "benchbot")
+
+    return {
+        "key": per_call(lambda: crosstempl.channel_key(channels), repeat),
+        "text_cold": per_call(lambda: render_message(template_id, crosstempl.channel_key(channels), "tech", "Bench"), repeat),
+        "text_cached": per_call(lambda: crosstempl.generate_promo_message(template_id, channels, "tech", "Bench"), repeat),
+        "buttons_cold": per_call(lambda: render_buttons(crosstempl.channel_key(channels), "benchbot"), repeat),
+        "buttons_cached": per_call(lambda: crosstempl.generate_promo_buttons(channels, "benchbot"), repeat),
+        "length": len(render_message(template_id, key, "tech", "Bench")),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", default="100,500,2000", help="comma-separated channel counts")
+    parser.add_argument("--templates", default="template6,template1", help="template6 is the grid, the only one that renders every channel")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'template':<10} {'chans':>6} {'chars':>7} {'key':>9} {'text cold':>10} {'cached':>9} {'btns cold':>10} {'cached':>9}")
+    for template_id in args.templates.split(","):
+        for count in (int(n) for n in args.channels.split(",")):
+            row = measure(template_id, make_channels(count), args.repeat)
+            print(
+                f"{template_id:<10} {count:>6} {row['length']:>7} {row['key'] * 1e6:>7.1f}us "
+                f"{row['text_cold'] * 1e6:>8.1f}us {row['text_cached'] * 1e6:>7.1f}us "
+                f"{row['buttons_cold'] * 1e6:>8.1f}us {row['buttons_cached'] * 1e6:>7.1f}us"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -22,18 +22,73 @@ EVALOP = [int(eval_id) for eval_id in getenv("EVALOP", str(OWNER_ID)).split(",")
 # ───── Mongo & Logging ───── #
 MONGO_DB_URI = getenv("MONGO_DB_URI")
 MONGO_DB_NAME = getenv("MONGO_DB_NAME", "Promosfather")
+# Connection pool tuning (shared by every module through storage.get_mongo_client)
+MONGO_MAX_POOL_SIZE = int(getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGO_COMPRESSORS = getenv("MONGO_COMPRESSORS", "zlib")  # e.g. "zstd,snappy,zlib"; empty disables
+
+# Storage backend: "mongo", "sqlite" or "memory" (defaults to mongo when MONGO_DB_URI is set)
+STORAGE_BACKEND = getenv("STORAGE_BACKEND", "mongo" if MONGO_DB_URI else "memory").lower()
+SQLITE_PATH = getenv("SQLITE_PATH", "promofather.db")
+if STORAGE_BACKEND not in ("mongo", "sqlite", "memory"):
+    raise SystemExit(f"[ERROR] - Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+if STORAGE_BACKEND == "mongo" and not MONGO_DB_URI:
+    raise SystemExit("[ERROR] - STORAGE_BACKEND is mongo but MONGO_DB_URI is not set.")
+
+# Write-behind batching for /start user upserts
+USER_FLUSH_INTERVAL_MS = int(getenv("USER_FLUSH_INTERVAL_MS", "500"))
+USER_FLUSH_MAX_BATCH = int(getenv("USER_FLUSH_MAX_BATCH", "500"))
+
+# Admin stats screen is cached for this many seconds
+STATS_CACHE_TTL = int(getenv("STATS_CACHE_TTL", "30"))
+
+# Read-through cache of channel documents (Mongo / SQLite backends)
+CHANNEL_CACHE_SIZE = int(getenv("CHANNEL_CACHE_SIZE", "5000"))
+CHANNEL_CACHE_TTL = int(getenv("CHANNEL_CACHE_TTL", "60"))
 LOGGER_ID = int(getenv("LOGGER_ID", -1001234567890))
 
 # ───── Promo Configurations ───── #
 MIN_CHANNELS_FOR_CROSS_PROMO = int(getenv("MIN_CHANNELS_FOR_CROSS_PROMO", "3"))
+AUTO_GROUP_TEMPLATE = getenv("AUTO_GROUP_TEMPLATE", "template1")  # template used by auto-grouped campaigns
+FAIR_PICK_SIZE = int(getenv("FAIR_PICK_SIZE", "10"))  # channels chosen by the "Fair Pick" button
 PROMO_IMAGE = "https://i.ibb.co/tpqjvwDV/promobanner2.jpg"  # Default promo image URL
 # Eligibility settings
 MIN_SUBSCRIBERS = 500  # 👈 You can change this anytime (e.g., 100, 10, 1000, etc.)
 
+# Subscriber ranges used by submission and promo selection (single source of truth)
+# key -> (button label, min subs inclusive, max subs exclusive or None for open-ended)
+SUBS_RANGES = {
+    "500-999": ("500 – 999 subs", 500, 1000),
+    "1k-5k": ("1k – 5k subs", 1000, 5000),
+    "5k-10k": ("5k – 10k subs", 5000, 10000),
+    "10k+": ("10k+ subs", 10000, None),
+}
+
 # Auto-delete settings
 AUTO_DELETE_ENABLED = getenv("AUTO_DELETE_ENABLED", "True").lower() == "true"
 AUTO_DELETE_CHECK_INTERVAL = int(getenv("AUTO_DELETE_CHECK_INTERVAL", "60"))  # seconds
+AUTO_DELETE_BATCH_SIZE = int(getenv("AUTO_DELETE_BATCH_SIZE", "100"))  # due promos fetched per query
 NOTIFY_ON_MANUAL_DELETION = getenv("NOTIFY_ON_MANUAL_DELETION", "True").lower() == "true"
+CAMPAIGN_DELETE_CONCURRENCY = int(getenv("CAMPAIGN_DELETE_CONCURRENCY", "10"))  # channels cleared at once by a campaign takedown
+SEND_CONCURRENCY = int(getenv("SEND_CONCURRENCY", "10"))  # campaign send workers, shared by all running campaigns (not per send)
+JOB_MAX_ATTEMPTS = int(getenv("JOB_MAX_ATTEMPTS", "3"))  # tries per channel before a campaign job fails
+JOB_RETRY_BACKOFF = int(getenv("JOB_RETRY_BACKOFF", "30"))  # seconds before the first retry, doubled each time
+JOB_POLL_INTERVAL = int(getenv("JOB_POLL_INTERVAL", "5"))  # idle workers look for due retries this often
+JOB_LEASE_SECONDS = int(getenv("JOB_LEASE_SECONDS", "300"))  # a job left sending this long is presumed abandoned and requeued
+PROGRESS_EDIT_INTERVAL = int(getenv("PROGRESS_EDIT_INTERVAL", "5"))  # at most one campaign status edit per this many seconds
+SCHEDULE_SPREAD_WINDOW = int(getenv("SCHEDULE_SPREAD_WINDOW", "120"))  # seconds over which schedules due together are staggered
+FLOOD_WAIT_RETRIES = int(getenv("FLOOD_WAIT_RETRIES", "3"))  # FloodWait requeues per campaign job (retries per channel in a takedown) before it fails
+FLOOD_WAIT_MAX = int(getenv("FLOOD_WAIT_MAX", "120"))  # longer FloodWaits fail the job/channel instead of waiting
+
+# Outbound rate scheduler (every send/edit/delete goes through it, see utils/outbound.py)
+OUTBOUND_GLOBAL_RATE = float(getenv("OUTBOUND_GLOBAL_RATE", "25"))  # messages per second across all chats
+OUTBOUND_GLOBAL_BURST = float(getenv("OUTBOUND_GLOBAL_BURST", "25"))
+OUTBOUND_CHAT_RATE = float(getenv("OUTBOUND_CHAT_RATE", "1"))  # messages per second into one chat
+OUTBOUND_CHAT_BURST = float(getenv("OUTBOUND_CHAT_BURST", "3"))
 
 # ───── Heroku Configuration (Optional) ───── #
 HEROKU_APP_NAME = getenv("HEROKU_APP_NAME")
@@ -83,6 +138,9 @@ print(f"API_HASH: {API_HASH}")
 print(f"BOT_TOKEN: {'Set' if BOT_TOKEN else 'Not Set'}")
 print(f"MONGO_DB_URI: {'Set' if MONGO_DB_URI else 'Not Set'}")
 print(f"MONGO_DB_NAME: {MONGO_DB_NAME}")
+print(f"STORAGE_BACKEND: {STORAGE_BACKEND}")
+print(f"MONGO_MAX_POOL_SIZE: {MONGO_MAX_POOL_SIZE}")
+print(f"MONGO_MIN_POOL_SIZE: {MONGO_MIN_POOL_SIZE}")
 print(f"RENDER_PORT: {RENDER_PORT}")
 print(f"AUTO_DELETE_CHECK_INTERVAL: {AUTO_DELETE_CHECK_INTERVAL}")
 print(f"NOTIFY_ON_MANUAL_DELETION: {NOTIFY_ON_MANUAL_DELETION}")
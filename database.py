@@ -1,278 +1,520 @@
 # database.py
 import config
-from pymongo import MongoClient
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
+from utils.cache import TTLCache
+from utils.snowflake import next_id
+import storage
 
 # -----------------------------
-# MongoDB Connection
+# Storage backend (mongo / sqlite / memory, see config.STORAGE_BACKEND)
 # -----------------------------
-if config.MONGO_DB_URI:
-    client = MongoClient(config.MONGO_DB_URI)
-    db = client[config.MONGO_DB_NAME]  # Use DB name from config
-    print(f"[DB] Connected to MongoDB: {config.MONGO_DB_NAME}")
-else:
-    # fallback in-memory store for dev
-    db = {"submissions": [], "promos": [], "banned_users": [], "banned_channels": [], "users": []}
-    print("[DB] Warning: MongoDB URI not found. Using in-memory store.")
+backend = storage.create_backend()
+
+def pool_stats():
+    """Connection pool statistics, or None when Mongo is not in use"""
+    if backend.name != "mongo":
+        return None
+    from storage.mongo import pool_listener
+    return pool_listener.snapshot()
+
+async def init_db():
+    """Create tables/collections and indexes so hot paths never check for them"""
+    await backend.init()
+    await load_ban_sets()
 
 # -----------------------------
 # Save user information
 # -----------------------------
-def save_user(user_id: int, username: str):
-    if isinstance(db, dict):  # in-memory
-        # Check if user already exists
-        for user in db.get("users", []):
-            if user["user_id"] == user_id:
-                # Update username if changed
-                user["username"] = username
-                return
-        # Add new user
-        if "users" not in db:
-            db["users"] = []
-        db["users"].append({"user_id": user_id, "username": username})
-    else:
-        # Create users collection if it doesn't exist
-        if "users" not in db.list_collection_names():
-            db.create_collection("users")
-        # Upsert user data
-        db.users.update_one(
-            {"user_id": user_id},
-            {"$set": {"user_id": user_id, "username": username}},
-            upsert=True
-        )
+async def save_user(user_id: int, username: str):
+    await backend.upsert_users({user_id: username})
+
+# -----------------------------
+# Channel document cache (read-through, invalidated on writes)
+# -----------------------------
+# Entries are dropped only after the write completes; dropping first would let a
+# concurrent get_channel_by_id re-cache the old document for CHANNEL_CACHE_TTL.
+# The memory backend already holds the documents, so it skips the cache
+_cache_channels = backend.name != "memory"
+_channel_cache = TTLCache(maxsize=config.CHANNEL_CACHE_SIZE, ttl=config.CHANNEL_CACHE_TTL)
+
+def channel_cache_stats():
+    return _channel_cache.stats()
+
+# -----------------------------
+# Write-behind buffer for user upserts
+# -----------------------------
+_pending_users = {}  # user_id -> username (last write wins)
+_users_flush_now = asyncio.Event()
+
+def queue_user(user_id: int, username: str):
+    """Buffer a user upsert; user_flush_worker writes it in the next batch"""
+    _pending_users[user_id] = username
+    if len(_pending_users) >= config.USER_FLUSH_MAX_BATCH:
+        _users_flush_now.set()
+
+async def flush_users():
+    """Write all buffered user upserts in one batch (one bulk_write / transaction)"""
+    if not _pending_users:
+        return 0
+    batch = dict(_pending_users)
+    _pending_users.clear()
+
+    try:
+        await backend.upsert_users(batch)
+    except Exception as e:
+        # Put the batch back unless a newer write for the same user arrived meanwhile
+        for user_id, username in batch.items():
+            _pending_users.setdefault(user_id, username)
+        print(f"[DB] User flush failed, will retry: {e}")
+        return 0
+    return len(batch)
+
+async def user_flush_worker():
+    """Flush buffered users every USER_FLUSH_INTERVAL_MS or once the batch is full"""
+    while True:
+        try:
+            await asyncio.wait_for(_users_flush_now.wait(), config.USER_FLUSH_INTERVAL_MS / 1000)
+        except asyncio.TimeoutError:
+            pass
+        _users_flush_now.clear()
+        await flush_users()
 
 # -----------------------------
 # Check if user exists
 # -----------------------------
-def user_exists(user_id: int):
-    if isinstance(db, dict):
-        return any(user["user_id"] == user_id for user in db.get("users", []))
-    else:
-        if "users" in db.list_collection_names():
-            return db.users.count_documents({"user_id": user_id}) > 0
-        return False
+async def user_exists(user_id: int):
+    if user_id in _pending_users:
+        return True
+    return await backend.user_exists(user_id)
 
 # -----------------------------
 # Get all users (updated to use users collection)
 # -----------------------------
-def get_all_users():
-    if isinstance(db, dict):
-        return db.get("users", [])
-    else:
-        if "users" in db.list_collection_names():
-            return list(db.users.find({}, {"_id": 0}))
-        return []
+async def get_all_users():
+    await flush_users()
+    return await backend.all_users()
 
 # -----------------------------
 # Save a channel submission
 # -----------------------------
-def save_submission(data: dict):
-    if isinstance(db, dict):  # in-memory
-        db["submissions"].append(data)
-    else:
-        db.submissions.insert_one(data)
+async def save_submission(data: dict):
+    # channel_id is unique, so a resubmission replaces the old entry
+    await backend.save_channel(data)
+    _channel_cache.pop(data["channel_id"])
 
 # -----------------------------
 # Update status (APPROVED / DENIED)
 # -----------------------------
-def update_status(channel_id: int, status: str):
-    if isinstance(db, dict):  # in-memory
-        for ch in db["submissions"]:
-            if ch["channel_id"] == channel_id:
-                ch["status"] = status
-                ch["updated_at"] = datetime.utcnow()
-                return True
-        return False
-    else:
-        result = db.submissions.update_one(
-            {"channel_id": channel_id},
-            {"$set": {"status": status, "updated_at": datetime.utcnow()}}
-        )
-        return result.modified_count > 0
+async def update_status(channel_id: int, status: str):
+    result = await backend.set_channel_status(channel_id, status, datetime.utcnow())
+    _channel_cache.pop(channel_id)
+    return result
 
 # -----------------------------
 # Get channels for a user
 # -----------------------------
-def get_user_channels(user_id: int, status_filter=None):
-    if isinstance(db, dict):  # in-memory
-        channels = [ch for ch in db["submissions"] if ch["user_id"] == user_id]
-    else:
-        query = {"user_id": user_id}
-        if status_filter:
-            query["status"] = status_filter
-        channels = list(db.submissions.find(query).sort("added_at", -1))
-    return channels
+async def get_user_channels(user_id: int, status_filter=None):
+    return await backend.user_channels(user_id, status_filter)
 
 # -----------------------------
 # Count channels for a user
 # -----------------------------
-def count_user_channels(user_id: int):
-    if isinstance(db, dict):
-        return len([ch for ch in db["submissions"] if ch["user_id"] == user_id])
-    else:
-        return db.submissions.count_documents({"user_id": user_id})
+async def count_user_channels(user_id: int):
+    return await backend.count_user_channels(user_id)
 
 # -----------------------------
 # Remove a channel
 # -----------------------------
-def remove_channel(user_id: int, channel_id: int):
-    if isinstance(db, dict):
-        before = len(db["submissions"])
-        db["submissions"] = [
-            ch for ch in db["submissions"]
-            if not (ch["user_id"] == user_id and ch["channel_id"] == channel_id)
-        ]
-        return len(db["submissions"]) < before
-    else:
-        result = db.submissions.delete_one({"user_id": user_id, "channel_id": channel_id})
-        return result.deleted_count > 0
+async def remove_channel(user_id: int, channel_id: int):
+    result = await backend.remove_channel(user_id, channel_id)
+    _channel_cache.pop(channel_id)
+    return result
 
 # -----------------------------
 # Helper: Get channel by ID
 # -----------------------------
-def get_channel_by_id(channel_id: int):
-    if isinstance(db, dict):
-        for ch in db["submissions"]:
-            if ch["channel_id"] == channel_id:
-                return ch
-        return None
-    else:
-        return db.submissions.find_one({"channel_id": channel_id})
+async def get_channel_by_id(channel_id: int):
+    if not _cache_channels:
+        return await backend.get_channel(channel_id)
+    channel = _channel_cache.get(channel_id)
+    if channel is None:
+        channel = await backend.get_channel(channel_id)
+        if channel is not None:
+            _channel_cache.set(channel_id, channel)
+    return channel
+
+# -----------------------------
+# Helper: Get many channels in one query
+# -----------------------------
+async def get_channels_by_ids(channel_ids):
+    """Resolve channel ids with one $in query, returned in the given order (missing ids skipped).
+
+    Cached documents are reused, but fetched ones are not cached: the bulk query
+    projects only the promo fields, while the cache holds full documents.
+    """
+    channel_ids = [cid for cid in channel_ids if cid not in banned_channel_ids]
+    found = {}
+    missing = []
+    for cid in channel_ids:
+        channel = _channel_cache.get(cid) if _cache_channels else None
+        if channel is not None:
+            found[cid] = channel
+        else:
+            missing.append(cid)
+    if missing:
+        for channel in await backend.get_channels(missing):
+            found[channel["channel_id"]] = channel
+    return [found[cid] for cid in channel_ids if cid in found]
 
 # -----------------------------
 # PROMO FUNCTIONS
 # -----------------------------
-def get_channels_by_category(category: str):
-    if isinstance(db, dict):
-        return [c for c in db["submissions"] if c.get("category") == category and c.get("status") == "APPROVED"]
-    else:
-        return list(db.submissions.find({"category": category, "status": "APPROVED"}))
-    
-def get_promo_by_id(promo_id: str):
-    if isinstance(db, dict):
-        for promo in db["promos"]:
-            if promo.get("promo_id") == promo_id:
-                return promo
-        return None
-    else:
-        return db.promos.find_one({"promo_id": promo_id})
+async def get_approved_channels():
+    """Every approved, non-banned channel in one query (input of the auto-grouping engine)"""
+    return await backend.approved_channels(banned_channel_ids)
+
+async def get_channels_by_category(category: str):
+    """Approved, non-banned channels in a category"""
+    return await backend.channels_in_range(category, None, None, banned_channel_ids)
+
+async def get_channels_by_range(category: str, subs_range: str):
+    """Approved, non-banned channels in a category whose subs_count falls in a config.SUBS_RANGES entry"""
+    if subs_range not in config.SUBS_RANGES:
+        return []
+    _, low, high = config.SUBS_RANGES[subs_range]
+    return await backend.channels_in_range(category, low, high, banned_channel_ids)
+
+async def get_promo_by_id(promo_id: str):
+    return await backend.get_promo(promo_id)
 
 def generate_promo_id():
-    import time
-    import random
-    return f"PROMO_{int(time.time())}_{random.randint(1000, 9999)}"
-
-def save_promo_post(channel: str, message_id: int, duration: int):
-    promo_data = {
-        "channel": channel,
-        "message_id": message_id,
+    """Unique, time-sortable promo id (zero-padded so string order matches creation order)"""
+    return f"PROMO_{next_id():019d}"
+
+def generate_campaign_id():
+    return f"CAMP_{next_id():019d}"
+
+# -----------------------------
+# CAMPAIGNS (one record per send, grouping all of its posts)
+# -----------------------------
+def generate_job_id():
+    return f"JOB_{next_id():019d}"
+
+async def create_campaign(channels, duration: int, admin_id: int, mode: str, payload: dict,
+                          template=None, category=None, admin_chat_id=None, status_message_id=None, start_at=None):
+    """Record a send as a running campaign plus one pending job per channel.
+
+    channels are submission documents; workers post the payload to each of them
+    (not before start_at, if given) and finish_campaign turns the sent jobs into
+    promo records. Returns the campaign id.
+    """
+    created_at = datetime.utcnow()
+    start_at = start_at or created_at
+    campaign_id = generate_campaign_id()
+    await backend.insert_campaign({
+        "campaign_id": campaign_id,
+        "admin_id": admin_id,
+        "mode": mode,
+        "template": template,
+        "category": category,
+        "duration": duration,
+        "post_count": 0,
+        "failed_count": 0,
+        "created_at": created_at,
+        "expires_at": created_at + timedelta(seconds=duration),
+        "status": "running",
+        "payload": payload,
+        "admin_chat_id": admin_chat_id,
+        "status_message_id": status_message_id,
+        "channel_count": len(channels),
+        "open_jobs": len(channels),  # jobs not yet sent or failed, kept by settle_job
+        "finished_at": None,
+    })
+    if channels:
+        await backend.insert_jobs([
+            {
+                "job_id": generate_job_id(),
+                "campaign_id": campaign_id,
+                "channel_id": channel["channel_id"],
+                "target": f"@{channel['username']}" if channel.get("username") else channel["channel_id"],
+                "title": channel.get("title") or str(channel["channel_id"]),
+                "status": "pending",
+                "attempts": 0,
+                "flood_waits": 0,
+                "not_before": start_at,
+                "message_id": None,
+                "error": None,
+                "sent_at": None,
+                "updated_at": created_at,
+            }
+            for channel in channels
+        ])
+    return campaign_id
+
+async def update_campaign(campaign_id: str, fields: dict):
+    await backend.update_campaign(campaign_id, fields)
+
+async def get_running_campaigns():
+    return await backend.running_campaigns()
+
+async def finish_campaign(campaign_id: str):
+    """Close a campaign whose jobs are all sent or failed and record its posts.
+
+    Returns the updated campaign, or None if another worker already closed it.
+    """
+    campaign = await backend.get_campaign(campaign_id)
+    if not campaign:
+        return None
+    sent = await backend.campaign_jobs(campaign_id, "sent")
+    failed = await backend.campaign_jobs(campaign_id, "failed")
+    finished_at = datetime.utcnow()
+    fields = {"post_count": len(sent), "failed_count": len(failed), "finished_at": finished_at}
+    if not await backend.finish_campaign(campaign_id, fields):
+        return None
+    duration = campaign["duration"]
+    if sent:
+        await backend.insert_promos([
+            {
+                "channel": job["target"],
+                "message_id": job["message_id"],
+                "duration": duration,
+                "created_at": job["sent_at"],
+                "expires_at": job["sent_at"] + timedelta(seconds=duration),
+                "promo_id": generate_promo_id(),
+                "campaign_id": campaign_id,
+            }
+            for job in sent
+        ])
+        # Exposure counters move with the promos, so fair picks always see current counts
+        await backend.record_exposure([job["channel_id"] for job in sent], finished_at)
+    campaign.update(fields, status="done")
+    return campaign
+
+async def get_channel_exposure(channel_ids):
+    """{channel_id: {appearances, last_featured_at}} for the given channels; never-featured ones are absent"""
+    return await backend.get_exposure(list(channel_ids))
+
+# -----------------------------
+# SCHEDULES (campaigns that fire later, once or on a cron rule)
+# -----------------------------
+def generate_schedule_id():
+    return f"SCHED_{next_id():019d}"
+
+async def create_schedule(channel_ids, duration: int, admin_id: int, admin_chat_id: int, mode: str, next_run: datetime,
+                          rule=None, template=None, category=None, custom_message=None):
+    """Store a campaign to launch at next_run, then again on every match of `rule` if one is given.
+
+    Channels are kept as ids and the promo is rendered at launch time, so
+    each run uses current titles and skips channels banned in the meantime.
+    """
+    schedule_id = generate_schedule_id()
+    await backend.insert_schedule({
+        "schedule_id": schedule_id,
+        "admin_id": admin_id,
+        "admin_chat_id": admin_chat_id,
+        "mode": mode,
+        "template": template,
+        "category": category,
+        "channel_ids": list(channel_ids),
+        "custom_message": custom_message,
         "duration": duration,
+        "rule": rule,
+        "status": "active",
+        "next_run": next_run,
+        "last_run": None,
+        "last_campaign_id": None,
+        "run_count": 0,
         "created_at": datetime.utcnow(),
-        "promo_id": generate_promo_id()
-    }
-    if isinstance(db, dict):
-        db["promos"].append(promo_data)
-        return promo_data["promo_id"]
-    else:
-        result = db.promos.insert_one(promo_data)
-        return promo_data["promo_id"]
-
-def get_scheduled_promos():
-    if isinstance(db, dict):
-        return db["promos"]
-    else:
-        return list(db.promos.find({}))
-
-def remove_promo_post(channel: str, message_id: int):
-    if isinstance(db, dict):
-        db["promos"] = [p for p in db["promos"] if not (p["channel"] == channel and p["message_id"] == message_id)]
-    else:
-        db.promos.delete_one({"channel": channel, "message_id": message_id})
+    })
+    return schedule_id
+
+async def get_schedule(schedule_id: str):
+    return await backend.get_schedule(schedule_id)
+
+async def update_schedule(schedule_id: str, fields: dict):
+    await backend.update_schedule(schedule_id, fields)
+
+async def remove_schedule(schedule_id: str):
+    return await backend.remove_schedule(schedule_id)
+
+async def get_active_schedules():
+    return await backend.active_schedules()
+
+async def get_next_schedule_run():
+    return await backend.next_schedule_run()
+
+async def get_due_schedules(now: datetime):
+    return await backend.due_schedules(now)
+
+# -----------------------------
+# CAMPAIGN JOBS (one per channel, claimed by the send workers)
+# -----------------------------
+async def claim_job(now: datetime):
+    """Take the next due pending job, or None if nothing is due"""
+    return await backend.claim_job(now)
+
+async def update_job(job_id: str, fields: dict):
+    await backend.update_job(job_id, dict(fields, updated_at=datetime.utcnow()))
+
+async def settle_job(job: dict, fields: dict):
+    """Record a sent/failed outcome; returns the campaign's open job count, or None if nothing changed"""
+    return await backend.settle_job(job["job_id"], job["campaign_id"], dict(fields, updated_at=datetime.utcnow()))
+
+async def requeue_stalled_jobs():
+    """Jobs left sending longer than JOB_LEASE_SECONDS go back to pending; returns how many.
+
+    Younger ones may still be in flight in this or another process, so they are left alone.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=config.JOB_LEASE_SECONDS)
+    return await backend.requeue_jobs("sending", stale_before)
+
+async def get_job_counts(campaign_id: str):
+    return await backend.job_counts(campaign_id)
+
+async def get_campaign_jobs(campaign_id: str, status=None):
+    return await backend.campaign_jobs(campaign_id, status)
+
+async def get_campaign(campaign_id: str):
+    return await backend.get_campaign(campaign_id)
+
+async def get_campaign_promos(campaign_id: str):
+    return await backend.campaign_promos(campaign_id)
+
+async def remove_campaign_promos(campaign_id: str, channels):
+    """Drop a campaign's promo records in the given channels only; returns how many were removed"""
+    return await backend.remove_campaign_promos(campaign_id, list(channels))
+
+async def remove_campaign(campaign_id: str):
+    """Drop a campaign with its promo and job records; returns the number of promos removed"""
+    return await backend.remove_campaign(campaign_id)
+
+async def get_campaigns_page(page: int, per_page: int):
+    """Return (campaigns on this page, newest first, total campaigns)"""
+    return await backend.campaigns_page(page, per_page)
+
+async def get_due_promos(now: datetime, limit: int):
+    """Promos whose expires_at has passed, soonest first, at most `limit` of them"""
+    return await backend.due_promos(now, limit)
+
+async def remove_promo_post(channel: str, message_id: int):
+    await backend.remove_promo(channel, message_id)
+
+# -----------------------------
+# MEDIA FILE_ID CACHE (see utils/media.py)
+# -----------------------------
+async def get_media_file_id(key: str):
+    doc = await backend.get_media(key)
+    return doc["file_id"] if doc else None
+
+async def save_media_file_id(key: str, url: str, media_type: str, file_id: str):
+    await backend.save_media({
+        "key": key,
+        "url": url,
+        "media_type": media_type,
+        "file_id": file_id,
+        "updated_at": datetime.utcnow(),
+    })
+
+async def remove_media_file_id(key: str):
+    await backend.remove_media(key)
 
 # -----------------------------
 # BAN/UNBAN FUNCTIONS
 # -----------------------------
-def ban_user(user_id: int):
-    if isinstance(db, dict):
-        if user_id not in db["banned_users"]:
-            db["banned_users"].append(user_id)
-    else:
-        # Create banned_users collection if it doesn't exist
-        if "banned_users" not in db.list_collection_names():
-            db.create_collection("banned_users")
-        db.banned_users.update_one(
-            {"user_id": user_id},
-            {"$set": {"user_id": user_id, "banned_at": datetime.utcnow()}},
-            upsert=True
-        )
-
-def unban_user(user_id: int):
-    if isinstance(db, dict):
-        if user_id in db["banned_users"]:
-            db["banned_users"].remove(user_id)
-    else:
-        if "banned_users" in db.list_collection_names():
-            db.banned_users.delete_one({"user_id": user_id})
-
-def is_user_banned(user_id: int):
-    if isinstance(db, dict):
-        return user_id in db["banned_users"]
-    else:
-        if "banned_users" in db.list_collection_names():
-            return db.banned_users.count_documents({"user_id": user_id}) > 0
-        return False
-
-def ban_channel(channel_id: int):
-    if isinstance(db, dict):
-        if channel_id not in db["banned_channels"]:
-            db["banned_channels"].append(channel_id)
-    else:
-        # Create banned_channels collection if it doesn't exist
-        if "banned_channels" not in db.list_collection_names():
-            db.create_collection("banned_channels")
-        db.banned_channels.update_one(
-            {"channel_id": channel_id},
-            {"$set": {"channel_id": channel_id, "banned_at": datetime.utcnow()}},
-            upsert=True
-        )
-
-def unban_channel(channel_id: int):
-    if isinstance(db, dict):
-        if channel_id in db["banned_channels"]:
-            db["banned_channels"].remove(channel_id)
-    else:
-        if "banned_channels" in db.list_collection_names():
-            db.banned_channels.delete_one({"channel_id": channel_id})
-
-def is_channel_banned(channel_id: int):
-    if isinstance(db, dict):
-        return channel_id in db["banned_channels"]
-    else:
-        if "banned_channels" in db.list_collection_names():
-            return db.banned_channels.count_documents({"channel_id": channel_id}) > 0
-        return False
-
-def get_banned_users():
-    if isinstance(db, dict):
-        return db["banned_users"]
-    else:
-        if "banned_users" in db.list_collection_names():
-            return list(db.banned_users.find({}, {"_id": 0}))
-        return []
+# Ban lists live in memory so checks never hit the database.
+# config.BANNED_USERS is a pyrogram user filter (a set), so handlers can drop
+# banned users' updates before doing any work.
+banned_user_ids = config.BANNED_USERS
+banned_channel_ids = set()
 
-def get_banned_channels():
-    if isinstance(db, dict):
-        return db["banned_channels"]
-    else:
-        if "banned_channels" in db.list_collection_names():
-            return list(db.banned_channels.find({}, {"_id": 0}))
-        return []
+async def load_ban_sets():
+    """Load banned user and channel ids into memory (called once at startup)"""
+    users, channels = await asyncio.gather(backend.banned_users(), backend.banned_channels())
+    banned_user_ids.clear()
+    banned_user_ids.update(doc["user_id"] for doc in users)
+    banned_channel_ids.clear()
+    banned_channel_ids.update(doc["channel_id"] for doc in channels)
+    print(f"[DB] Loaded {len(banned_user_ids)} banned users and {len(banned_channel_ids)} banned channels")
+
+async def ban_user(user_id: int):
+    banned_user_ids.add(user_id)
+    await backend.ban_user(user_id, datetime.utcnow())
+
+async def unban_user(user_id: int):
+    banned_user_ids.discard(user_id)
+    await backend.unban_user(user_id)
+
+async def is_user_banned(user_id: int):
+    return user_id in banned_user_ids
+
+async def ban_channel(channel_id: int):
+    banned_channel_ids.add(channel_id)
+    await backend.ban_channel(channel_id, datetime.utcnow())
+    _channel_cache.pop(channel_id)
+
+async def unban_channel(channel_id: int):
+    banned_channel_ids.discard(channel_id)
+    await backend.unban_channel(channel_id)
+    _channel_cache.pop(channel_id)
+
+async def is_channel_banned(channel_id: int):
+    return channel_id in banned_channel_ids
+
+async def get_banned_users():
+    return await backend.banned_users()
+
+async def get_banned_channels():
+    return await backend.banned_channels()
 
 # -----------------------------
 # GET ALL CHANNELS
 # -----------------------------
-def get_all_channels():
-    if isinstance(db, dict):
-        return db["submissions"]
-    else:
-        return list(db.submissions.find({}, {"_id": 0}))
\ No newline at end of file
+async def get_all_channels():
+    return await backend.all_channels()
+
+# -----------------------------
+# PAGINATION (one page per query)
+# -----------------------------
+async def get_users_page(page: int, per_page: int):
+    """Return (users on this page, total users)"""
+    await flush_users()
+    return await backend.users_page(page, per_page)
+
+async def get_channels_page(page: int, per_page: int):
+    """Return (channels on this page, total channels)"""
+    return await backend.channels_page(page, per_page)
+
+async def get_user_channels_page(user_id: int, page: int, per_page: int, status_filter=None):
+    """Return (user's channels on this page, newest first, total matching)"""
+    return await backend.user_channels_page(user_id, status_filter, page, per_page)
+
+async def get_promos_page(page: int, per_page: int):
+    """Return (promos on this page, total promos)"""
+    return await backend.promos_page(page, per_page)
+
+# -----------------------------
+# ADMIN STATS (server-side counts, cached briefly)
+# -----------------------------
+_stats_cache = TTLCache(maxsize=1, ttl=config.STATS_CACHE_TTL)
+
+async def get_stats():
+    """Channel/user/ban counts for the admin stats screen"""
+    stats = _stats_cache.get("stats")
+    if stats is not None:
+        return stats
+
+    await flush_users()
+    by_status, users, banned_users, banned_channels = await backend.counts()
+
+    stats = {
+        "total_channels": sum(by_status.values()),
+        "pending": by_status.get("PENDING", 0),
+        "approved": by_status.get("APPROVED", 0),
+        "denied": by_status.get("DENIED", 0),
+        "users": users,
+        "banned_users": banned_users,
+        "banned_channels": banned_channels,
+    }
+    _stats_cache.set("stats", stats)
+    return stats
@@ -5,6 +5,7 @@ from pyrogram.enums import ParseMode
 from datetime import datetime, timedelta
 import config
 import database
+from utils.outbound import scheduler
 
 # Admin panel keyboard
 def get_admin_panel():
@@ -17,6 +18,8 @@ def get_admin_panel():
          InlineKeyboardButton("🗑️ Delete Channel", callback_data="delete_channel_menu:0")],
         [InlineKeyboardButton("📊 Stats", callback_data="admin_stats"),
          InlineKeyboardButton("🚫 Ban Menu", callback_data="ban_menu")],
+        [InlineKeyboardButton("🤝 Auto Groups", callback_data="auto_groups"),
+         InlineKeyboardButton("🗓 Scheduled Promos", callback_data="schedules_menu")],
         [InlineKeyboardButton("↩ Back to Main", callback_data="go_back_start")]
     ])
 
@@ -27,23 +30,17 @@ async def admin_stats_cb(client: Client, cq: CallbackQuery):
         await cq.answer("❌ Admin access required!", show_alert=True)
         return
     
-    # Get basic stats
-    all_channels = database.get_all_channels()
-    total_channels = len(all_channels)
-    pending_count = len([ch for ch in all_channels if ch.get("status") == "PENDING"])
-    approved_count = len([ch for ch in all_channels if ch.get("status") == "APPROVED"])
-    total_users = len(database.get_all_users())
-    banned_users = len(database.get_banned_users())
-    banned_channels = len(database.get_banned_channels())
+    # Get basic stats (counted server-side, cached for STATS_CACHE_TTL)
+    stats = await database.get_stats()
     
     stats_text = (
         "📊 **Bot Statistics**\n\n"
-        f"• Total Channels: {total_channels}\n"
-        f"• Pending Approvals: {pending_count}\n"
-        f"• Approved Channels: {approved_count}\n"
-        f"• Total Users: {total_users}\n"
-        f"• Banned Users: {banned_users}\n"
-        f"• Banned Channels: {banned_channels}\n\n"
+        f"• Total Channels: {stats['total_channels']}\n"
+        f"• Pending Approvals: {stats['pending']}\n"
+        f"• Approved Channels: {stats['approved']}\n"
+        f"• Total Users: {stats['users']}\n"
+        f"• Banned Users: {stats['banned_users']}\n"
+        f"• Banned Channels: {stats['banned_channels']}\n\n"
         "More stats coming soon..."
     )
     
@@ -58,7 +55,7 @@ async def ping_command(client, message):
 # Debug command for admins
 @Client.on_message(filters.command("debug") & filters.user(config.ADMINS))
 async def debug_command(client, message):
-    await message.reply_text(
+    text = (
         f"🤖 **Bot Debug Info**\n\n"
         f"• Your ID: `{message.from_user.id}`\n"
         f"• ADMINS list: `{config.ADMINS}`\n"
@@ -67,12 +64,39 @@ async def debug_command(client, message):
         f"• MongoDB connected: `{bool(config.MONGO_DB_URI)}`"
     )
 
+    pool = database.pool_stats()
+    if pool:
+        text += (
+            f"\n\n🔌 **Mongo Pool**\n"
+            f"• Open / max: `{pool['open']}/{pool['max_pool_size']}`\n"
+            f"• Checked out: `{pool['checked_out']}` (peak `{pool['peak_checked_out']}`)\n"
+            f"• Checkouts: `{pool['checkouts']}` (failed `{pool['checkout_failures']}`)\n"
+            f"• Wait queue: avg `{pool['avg_wait_ms']:.1f}ms`, max `{pool['max_wait_ms']:.1f}ms`"
+        )
+
+    cache = database.channel_cache_stats()
+    text += (
+        f"\n\n🗂 **Channel Cache**\n"
+        f"• Entries: `{cache['size']}/{cache['maxsize']}`\n"
+        f"• Hits / misses: `{cache['hits']}/{cache['misses']}` ({cache['hit_rate']:.0%})"
+    )
+
+    outbound = scheduler.stats()
+    text += f"\n\n📤 **Outbound Scheduler** (chats tracked: `{outbound.pop('chats_tracked')}`)"
+    for name, row in outbound.items():
+        text += (
+            f"\n• {name}: queued `{row['queued']}`, sent `{row['granted']}`, "
+            f"wait avg `{row['avg_wait_ms']:.0f}ms` / max `{row['max_wait_ms']:.0f}ms`"
+        )
+
+    await message.reply_text(text)
+
 # Delete promo menu
 @Client.on_callback_query(filters.regex(r"^delete_promo_menu$"))
 async def delete_promo_menu(client: Client, cq: CallbackQuery):
     await cq.answer()
     
-    promos = database.get_scheduled_promos()
+    promos, _ = await database.get_promos_page(0, 10)  # Show first 10 promos
     if not promos:
         await cq.message.edit_text(
             "📭 **No Active Promotions to Delete**",
@@ -84,7 +108,7 @@ async def delete_promo_menu(client: Client, cq: CallbackQuery):
         return
     
     buttons = []
-    for promo in promos[:10]:  # Show first 10 promos
+    for promo in promos:
         short_id = promo.get('promo_id', 'N/A')[:8] + "..." if promo.get('promo_id') else 'N/A'
         buttons.append([InlineKeyboardButton(
             f"🗑️ {promo['channel']} - ID: {short_id}",
@@ -121,7 +145,7 @@ async def execute_delete_promo(client: Client, cq: CallbackQuery):
     await cq.answer()
     promo_id = cq.matches[0].group(1)
     
-    promo_data = database.get_promo_by_id(promo_id)
+    promo_data = await database.get_promo_by_id(promo_id)
     if not promo_data:
         await cq.message.edit_text(
             "❌ Promo not found. It may have been already deleted.",
@@ -134,7 +158,7 @@ async def execute_delete_promo(client: Client, cq: CallbackQuery):
     
     try:
         await client.delete_messages(promo_data["channel"], promo_data["message_id"])
-        database.remove_promo_post(promo_data["channel"], promo_data["message_id"])
+        await database.remove_promo_post(promo_data["channel"], promo_data["message_id"])
         
         await cq.message.edit_text(
             f"✅ **Promo Deleted Successfully**\n\n"
@@ -163,8 +187,8 @@ async def list_promos_menu(client: Client, cq: CallbackQuery):
     # Extract page number from callback data (default to 0 if not provided)
     page = int(cq.matches[0].group(1) or 0) if cq.matches else 0
     
-    promos = database.get_scheduled_promos()
-    if not promos:
+    promos_page, total_promos = await database.get_promos_page(page, ITEMS_PER_PAGE)
+    if not total_promos:
         await cq.message.edit_text(
             "📭 **No Active Promotions**",
             reply_markup=InlineKeyboardMarkup([
@@ -174,12 +198,9 @@ async def list_promos_menu(client: Client, cq: CallbackQuery):
         )
         return
     
-    # Paginate the promos
-    ITEMS_PER_PAGE = 5
     start_idx = page * ITEMS_PER_PAGE
     end_idx = start_idx + ITEMS_PER_PAGE
-    promos_page = promos[start_idx:end_idx]
-    total_pages = (len(promos) + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
+    total_pages = (total_promos + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
     
     # Build the message with summarized info
     promo_list = []
@@ -218,7 +239,7 @@ async def list_promos_menu(client: Client, cq: CallbackQuery):
     
     nav_buttons.append(InlineKeyboardButton(f"📄 {page+1}/{total_pages}", callback_data="no_action"))
     
-    if end_idx < len(promos):
+    if end_idx < total_promos:
         nav_buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"list_promos_menu:{page+1}"))
     
     if nav_buttons:
@@ -233,7 +254,7 @@ async def list_promos_menu(client: Client, cq: CallbackQuery):
     buttons.append([InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")])
     
     message_text = (
-        f"📋 **Active Promotions** ({len(promos)} total)\n\n"
+        f"📋 **Active Promotions** ({total_promos} total)\n\n"
         + "\n".join(promo_list)
         + f"\n\n**Page {page+1} of {total_pages}**"
     )
@@ -259,7 +280,7 @@ async def list_promos_menu(client: Client, cq: CallbackQuery):
                 )
             
             short_message = (
-                f"📋 **Active Promotions** ({len(promos)} total)\n\n"
+                f"📋 **Active Promotions** ({total_promos} total)\n\n"
                 + "\n".join(short_promo_list)
                 + f"\n\n**Page {page+1} of {total_pages}**\n"
                 "Use 'View Details' to see more information."
@@ -282,18 +303,17 @@ async def view_promo_details(client: Client, cq: CallbackQuery):
     await cq.answer()
     page = int(cq.matches[0].group(1))
     
-    promos = database.get_scheduled_promos()
-    if not promos:
+    # Get the first promo from the current page for detailed view
+    promos, total_promos = await database.get_promos_page(page * ITEMS_PER_PAGE, 1)
+    if not total_promos:
         await cq.answer("No active promotions found.", show_alert=True)
         return
     
-    # Get the first promo from the current page for detailed view
-    start_idx = page * 5
-    if start_idx >= len(promos):
+    if not promos:
         await cq.answer("Invalid page.", show_alert=True)
         return
     
-    promo = promos[start_idx]
+    promo = promos[0]
     
     # Get detailed information
     created_at = promo.get("created_at")
@@ -309,7 +329,7 @@ async def view_promo_details(client: Client, cq: CallbackQuery):
     minutes_left = max(0, int((time_left.total_seconds() % 3600) // 60))
     
     # Get channel info from database
-    channel_info = database.get_channel_by_id(promo['channel'])
+    channel_info = await database.get_channel_by_id(promo['channel'])
     channel_title = channel_info.get('title', 'Unknown') if channel_info else 'Unknown'
     
     details_text = (
@@ -340,10 +360,8 @@ async def view_promo_details(client: Client, cq: CallbackQuery):
 # ============== PAGINATION HELPERS =================
 ITEMS_PER_PAGE = 5
 
-def paginate_list(items, page):
-    start = page * ITEMS_PER_PAGE
-    end = start + ITEMS_PER_PAGE
-    return items[start:end], len(items) > end
+def has_next_page(page, total):
+    return (page + 1) * ITEMS_PER_PAGE < total
 
 # ================= BAN & UNBAN MENU =================
 @Client.on_callback_query(filters.regex(r"^ban_menu$"))
@@ -365,8 +383,8 @@ async def ban_menu(client: Client, cq: CallbackQuery):
 @Client.on_callback_query(filters.regex(r"^check_users:(\d+)$"))
 async def check_users_cb(client: Client, cq: CallbackQuery):
     page = int(cq.matches[0].group(1))
-    users = database.get_all_users()
-    users_page, has_next = paginate_list(users, page)
+    users_page, total_users = await database.get_users_page(page, ITEMS_PER_PAGE)
+    has_next = has_next_page(page, total_users)
 
     if not users_page:
         await cq.message.edit_text(
@@ -390,7 +408,7 @@ async def check_users_cb(client: Client, cq: CallbackQuery):
     if page > 0:
         nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"check_users:{page-1}"))
     
-    total_pages = (len(users) + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
+    total_pages = (total_users + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
     nav_buttons.append(InlineKeyboardButton(f"📄 {page+1}/{total_pages}", callback_data="no_action"))
     
     if has_next:
@@ -407,8 +425,8 @@ async def check_users_cb(client: Client, cq: CallbackQuery):
 @Client.on_callback_query(filters.regex(r"^check_channels:(\d+)$"))
 async def check_channels_cb(client: Client, cq: CallbackQuery):
     page = int(cq.matches[0].group(1))
-    channels = database.get_all_channels()
-    channels_page, has_next = paginate_list(channels, page)
+    channels_page, total_channels = await database.get_channels_page(page, ITEMS_PER_PAGE)
+    has_next = has_next_page(page, total_channels)
 
     if not channels_page:
         await cq.message.edit_text(
@@ -444,7 +462,7 @@ async def check_channels_cb(client: Client, cq: CallbackQuery):
     if page > 0:
         nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"check_channels:{page-1}"))
     
-    total_pages = (len(channels) + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
+    total_pages = (total_channels + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
     nav_buttons.append(InlineKeyboardButton(f"📄 {page+1}/{total_pages}", callback_data="no_action"))
     
     if has_next:
@@ -461,8 +479,8 @@ async def check_channels_cb(client: Client, cq: CallbackQuery):
 @Client.on_callback_query(filters.regex(r"^delete_channel_menu:(\d+)$"))
 async def delete_channel_menu(client: Client, cq: CallbackQuery):
     page = int(cq.matches[0].group(1))
-    channels = database.get_all_channels()
-    channels_page, has_next = paginate_list(channels, page)
+    channels_page, total_channels = await database.get_channels_page(page, ITEMS_PER_PAGE)
+    has_next = has_next_page(page, total_channels)
 
     if not channels_page:
         await cq.message.edit_text(
@@ -494,7 +512,7 @@ async def delete_channel_menu(client: Client, cq: CallbackQuery):
     if page > 0:
         nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"delete_channel_menu:{page-1}"))
     
-    total_pages = (len(channels) + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
+    total_pages = (total_channels + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
     nav_buttons.append(InlineKeyboardButton(f"📄 {page+1}/{total_pages}", callback_data="no_action"))
     
     if has_next:
@@ -517,7 +535,7 @@ async def confirm_channel_delete(client: Client, cq: CallbackQuery):
     channel_id = int(cq.matches[0].group(1))
     page = int(cq.matches[0].group(2))
     
-    channel_data = database.get_channel_by_id(channel_id)
+    channel_data = await database.get_channel_by_id(channel_id)
     if not channel_data:
         await cq.answer("❌ Channel not found.", show_alert=True)
         return
@@ -548,7 +566,7 @@ async def execute_channel_delete(client: Client, cq: CallbackQuery):
     channel_id = int(cq.matches[0].group(1))
     page = int(cq.matches[0].group(2))
     
-    channel_data = database.get_channel_by_id(channel_id)
+    channel_data = await database.get_channel_by_id(channel_id)
     if not channel_data:
         await cq.answer("❌ Channel not found.", show_alert=True)
         return
@@ -559,7 +577,7 @@ async def execute_channel_delete(client: Client, cq: CallbackQuery):
     
     try:
         # Delete channel from database
-        success = database.remove_channel(owner_id, channel_id)
+        success = await database.remove_channel(owner_id, channel_id)
         
         if success:
             # Notify the channel owner
@@ -636,11 +654,11 @@ async def banuser_cmd(client, message: Message):
         user_id = int(message.command[1])
         
         # Check if user is already banned
-        if database.is_user_banned(user_id):
+        if await database.is_user_banned(user_id):
             await message.reply_text(f"❌ User `{user_id}` is already banned.")
             return
             
-        database.ban_user(user_id)
+        await database.ban_user(user_id)
         await message.reply_text(f"✅ User `{user_id}` has been banned.")
         
         # Notify the banned user if possible
@@ -665,11 +683,11 @@ async def unbanuser_cmd(client, message: Message):
         user_id = int(message.command[1])
         
         # Check if user is not banned
-        if not database.is_user_banned(user_id):
+        if not await database.is_user_banned(user_id):
             await message.reply_text(f"❌ User `{user_id}` is not banned.")
             return
             
-        database.unban_user(user_id)
+        await database.unban_user(user_id)
         await message.reply_text(f"✅ User `{user_id}` has been unbanned.")
         
         # Notify the unbanned user if possible
@@ -694,15 +712,15 @@ async def banchannel_cmd(client, message: Message):
         channel_id = int(message.command[1])
         
         # Check if channel is already banned
-        if database.is_channel_banned(channel_id):
+        if await database.is_channel_banned(channel_id):
             await message.reply_text(f"❌ Channel `{channel_id}` is already banned.")
             return
             
-        database.ban_channel(channel_id)
+        await database.ban_channel(channel_id)
         await message.reply_text(f"✅ Channel `{channel_id}` has been banned.")
         
         # Notify the channel owner if possible
-        channel_data = database.get_channel_by_id(channel_id)
+        channel_data = await database.get_channel_by_id(channel_id)
         if channel_data:
             try:
                 await client.send_message(
@@ -726,15 +744,15 @@ async def unbanchannel_cmd(client, message: Message):
         channel_id = int(message.command[1])
         
         # Check if channel is not banned
-        if not database.is_channel_banned(channel_id):
+        if not await database.is_channel_banned(channel_id):
             await message.reply_text(f"❌ Channel `{channel_id}` is not banned.")
             return
             
-        database.unban_channel(channel_id)
+        await database.unban_channel(channel_id)
         await message.reply_text(f"✅ Channel `{channel_id}` has been unbanned.")
         
         # Notify the channel owner if possible
-        channel_data = database.get_channel_by_id(channel_id)
+        channel_data = await database.get_channel_by_id(channel_id)
         if channel_data:
             try:
                 await client.send_message(
@@ -2,23 +2,47 @@
 from pyrogram import Client, filters
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery, Message
 from pyrogram.enums import ParseMode
+from pyrogram.errors import FloodWait
 import asyncio
 import database
 import config
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # Import admin panel from admin.py
 from handlers.admin import get_admin_panel
-
-# Store promo IDs for tracking
-promo_tracking = {}
-
-# Generate unique promo ID
-def generate_promo_id():
-    return f"PROMO_{int(time.time())}_{hash(str(time.time())) % 10000}"
+from utils.outbound import priority, send_priority, BULK, NORMAL
 
 # Auto-delete worker
+async def delete_expired_promo(client: Client, promo: dict):
+    """Delete one expired promo message, notify admins and drop its record"""
+    expires_at = promo["expires_at"]
+    try:
+        await client.delete_messages(promo["channel"], promo["message_id"])
+        print(f"[AUTO-DELETE] Deleted expired promo from {promo['channel']}")
+        
+        # Notify admin if configured
+        if config.NOTIFY_ON_MANUAL_DELETION:
+            for admin_id in config.ADMINS:
+                try:
+                    await client.send_message(
+                        admin_id,
+                        f"🕒 **Auto-Deleted Promo**\n\n"
+                        f"• Channel: {promo['channel']}\n"
+                        f"• Message ID: {promo['message_id']}\n"
+                        f"• Duration: {promo['duration']//3600} hours\n"
+                        f"• Expired at: {expires_at.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+                        parse_mode=ParseMode.HTML
+                    )
+                except:
+                    pass
+        
+    except Exception as e:
+        print(f"[AUTO-DELETE] Error deleting message: {e}")
+    
+    # Remove from database
+    await database.remove_promo_post(promo["channel"], promo["message_id"])
+
 async def promo_cleanup_worker(client: Client):
     """Auto-delete expired promos"""
     if not config.AUTO_DELETE_ENABLED:
@@ -26,52 +50,24 @@ async def promo_cleanup_worker(client: Client):
         return
     
     print("[AUTO-DELETE] Auto-delete worker started")
+    send_priority.set(NORMAL)  # the worker runs in its own task, so this only affects its own sends
     while True:
         try:
-            promos = database.get_scheduled_promos()
-            current_time = datetime.utcnow()
+            # Only promos that are already due, soonest first
+            promos = await database.get_due_promos(datetime.utcnow(), config.AUTO_DELETE_BATCH_SIZE)
             
+            removed = 0
             for promo in promos:
                 try:
-                    # Check if promo should be deleted
-                    created_at = promo.get("created_at")
-                    if isinstance(created_at, str):
-                        created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    
-                    expires_at = created_at + timedelta(seconds=promo["duration"])
-                    
-                    if current_time >= expires_at:
-                        # Delete the promo
-                        try:
-                            await client.delete_messages(promo["channel"], promo["message_id"])
-                            print(f"[AUTO-DELETE] Deleted expired promo from {promo['channel']}")
-                            
-                            # Notify admin if configured
-                            if config.NOTIFY_ON_MANUAL_DELETION:
-                                for admin_id in config.ADMINS:
-                                    try:
-                                        await client.send_message(
-                                            admin_id,
-                                            f"🕒 **Auto-Deleted Promo**\n\n"
-                                            f"• Channel: {promo['channel']}\n"
-                                            f"• Message ID: {promo['message_id']}\n"
-                                            f"• Duration: {promo['duration']//3600} hours\n"
-                                            f"• Expired at: {expires_at.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-                                            parse_mode=ParseMode.HTML
-                                        )
-                                    except:
-                                        pass
-                            
-                        except Exception as e:
-                            print(f"[AUTO-DELETE] Error deleting message: {e}")
-                        
-                        # Remove from database
-                        database.remove_promo_post(promo["channel"], promo["message_id"])
-                        
+                    await delete_expired_promo(client, promo)
+                    removed += 1
                 except Exception as e:
                     print(f"[AUTO-DELETE] Error processing promo: {e}")
             
-            await asyncio.sleep(config.AUTO_DELETE_CHECK_INTERVAL)
+            # A full batch that made progress means more are due right now; otherwise wait
+            # for the next cycle, so records that keep failing are not retried in a tight loop
+            if len(promos) < config.AUTO_DELETE_BATCH_SIZE or not removed:
+                await asyncio.sleep(config.AUTO_DELETE_CHECK_INTERVAL)
             
         except Exception as e:
             print(f"[AUTO-DELETE] Worker error: {e}")
@@ -91,7 +87,7 @@ async def delete_promo_command(client: Client, message: Message):
         return
     
     promo_id = args[1]
-    promo_data = database.get_promo_by_id(promo_id)
+    promo_data = await database.get_promo_by_id(promo_id)
     
     if not promo_data:
         await message.reply_text(
@@ -105,7 +101,7 @@ async def delete_promo_command(client: Client, message: Message):
         await client.delete_messages(promo_data["channel"], promo_data["message_id"])
         
         # Remove from database
-        database.remove_promo_post(promo_data["channel"], promo_data["message_id"])
+        await database.remove_promo_post(promo_data["channel"], promo_data["message_id"])
         
         await message.reply_text(
             f"✅ **Promo Deleted Successfully**\n\n"
@@ -124,31 +120,173 @@ async def delete_promo_command(client: Client, message: Message):
             parse_mode=ParseMode.HTML
         )
 
+# -----------------------------
+# Campaign takedown (every post of one send at once)
+# -----------------------------
+async def bounded_gather(items, worker, concurrency: int, flood_retries: int = 0, max_flood_wait: int = 0):
+    """Run worker(item) for every item, at most `concurrency` at a time.
+
+    Results come back in the order of `items`; an exception raised by a worker
+    is returned in its slot instead of cancelling the others. A FloodWait is
+    slept off outside the concurrency slot and only that item is retried, up
+    to `flood_retries` times and only while the wait is <= `max_flood_wait`.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item):
+        attempt = 0
+        while True:
+            try:
+                async with semaphore:
+                    return await worker(item)
+            except FloodWait as e:
+                attempt += 1
+                if attempt > flood_retries or e.value > max_flood_wait:
+                    raise
+                print(f"[CAMPAIGN-DELETE] FloodWait {e.value}s, retry {attempt}/{flood_retries}")
+                await asyncio.sleep(e.value)
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+async def takedown_campaign(client: Client, campaign_id: str):
+    """Delete all posts of a campaign concurrently and drop the records of the ones deleted.
+
+    Returns the summary text, or None if the campaign does not exist.
+    """
+    campaign = await database.get_campaign(campaign_id)
+    if campaign and campaign.get("status") == "running":
+        # Its posts are only recorded as promos when it finishes; wait for that rather than orphan them
+        counts = await database.get_job_counts(campaign_id)
+        done = counts.get("sent", 0) + counts.get("failed", 0)
+        return (
+            f"⏳ **Campaign Still Posting**\n\n"
+            f"• Campaign ID: `{campaign_id}`\n"
+            f"• Progress: {done}/{campaign.get('channel_count') or done} channels\n\n"
+            "Delete it once it has finished."
+        )
+    promos = await database.get_campaign_promos(campaign_id)
+    if not campaign and not promos:
+        return None
+
+    # One delete_messages call per channel, however many posts it holds
+    by_channel = {}
+    for promo in promos:
+        by_channel.setdefault(promo["channel"], []).append(promo["message_id"])
+
+    async def delete_channel_posts(channel):
+        await client.delete_messages(channel, by_channel[channel])
+
+    started = time.perf_counter()
+    channels = list(by_channel)
+    with priority(BULK):
+        results = await bounded_gather(
+            channels, delete_channel_posts, config.CAMPAIGN_DELETE_CONCURRENCY,
+            flood_retries=config.FLOOD_WAIT_RETRIES, max_flood_wait=config.FLOOD_WAIT_MAX
+        )
+    elapsed = time.perf_counter() - started
+
+    lines = []
+    cleared = []
+    for channel, result in zip(channels, results):
+        if isinstance(result, Exception):
+            lines.append(f"❌ {channel} — {result}")
+        else:
+            cleared.append(channel)
+            lines.append(f"✅ {channel}")
+    failed = len(channels) - len(cleared)
+
+    # Posts that could not be deleted keep their records: the cleanup worker retries them
+    # at expiry, and the campaign stays so /deletecampaign can be run again
+    if failed:
+        removed = await database.remove_campaign_promos(campaign_id, cleared)
+    else:
+        removed = await database.remove_campaign(campaign_id)
+    if len(lines) > 30:
+        lines = lines[:30] + [f"... and {len(lines) - 30} more"]
+
+    print(f"[CAMPAIGN-DELETE] {campaign_id}: {len(channels) - failed}/{len(channels)} channels cleared, {removed} records removed in {elapsed:.1f}s")
+    return (
+        (f"🗑 **Campaign Partly Deleted**\n\n" if failed else f"🗑 **Campaign Deleted**\n\n")
+        + f"• Campaign ID: `{campaign_id}`\n"
+        f"• Channels cleared: {len(channels) - failed}/{len(channels)}\n"
+        f"• Records removed: {removed}\n"
+        f"• Time: {elapsed:.1f}s\n"
+        + (f"• Kept for retry: {failed} channels\n" if failed else "")
+        + "\n" + "\n".join(lines)
+    )
+
+@Client.on_message(filters.command("deletecampaign") & filters.user(config.ADMINS))
+async def delete_campaign_command(client: Client, message: Message):
+    """Delete every post of a campaign by ID"""
+    args = message.text.split()
+    if len(args) < 2:
+        await message.reply_text(
+            "❌ **Usage:** /deletecampaign <campaign_id>\n\n"
+            "The campaign ID is shown after a promo is sent.",
+            parse_mode=ParseMode.HTML
+        )
+        return
+
+    status = await message.reply_text("⏳ Deleting campaign posts...")
+    summary = await takedown_campaign(client, args[1])
+    await status.edit_text(summary or "❌ Campaign ID not found.", parse_mode=ParseMode.HTML)
+
+@Client.on_callback_query(filters.regex(r"^delete_campaign:(.+)$") & filters.user(config.ADMINS))
+async def confirm_delete_campaign(client: Client, cq: CallbackQuery):
+    await cq.answer()
+    campaign_id = cq.matches[0].group(1)
+    await cq.message.edit_text(
+        f"⚠️ **Confirm Deletion**\n\n"
+        f"Delete every post of campaign `{campaign_id}` from all channels?",
+        reply_markup=InlineKeyboardMarkup([
+            [InlineKeyboardButton("✅ Yes, Delete All", callback_data=f"delete_campaign_yes:{campaign_id}")],
+            [InlineKeyboardButton("❌ Cancel", callback_data="admin_panel")]
+        ]),
+        parse_mode=ParseMode.HTML
+    )
+
+@Client.on_callback_query(filters.regex(r"^delete_campaign_yes:(.+)$") & filters.user(config.ADMINS))
+async def execute_delete_campaign(client: Client, cq: CallbackQuery):
+    await cq.answer("Deleting campaign posts...")
+    summary = await takedown_campaign(client, cq.matches[0].group(1))
+    await cq.message.edit_text(
+        summary or "❌ Campaign not found. It may have been already deleted.",
+        reply_markup=InlineKeyboardMarkup([
+            [InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")]
+        ]),
+        parse_mode=ParseMode.HTML
+    )
+
 # List active promos
+PROMOS_PER_PAGE = 20
+
 @Client.on_message(filters.command("listpromos") & filters.user(config.ADMINS))
 async def list_promos_command(client: Client, message: Message):
-    """List all active promotions"""
-    promos = database.get_scheduled_promos()
+    """List active promotions, one page at a time: /listpromos [page]"""
+    args = message.text.split()
+    page = int(args[1]) - 1 if len(args) > 1 and args[1].isdigit() and int(args[1]) > 0 else 0
+    promos, total = await database.get_promos_page(page, PROMOS_PER_PAGE)
     
-    if not promos:
+    if not total:
         await message.reply_text(
             "📭 **No Active Promotions**\n\nThere are no active cross-promotions running.",
             parse_mode=ParseMode.HTML
         )
         return
     
+    total_pages = (total + PROMOS_PER_PAGE - 1) // PROMOS_PER_PAGE
+    if not promos:
+        await message.reply_text(
+            f"❌ There are only {total_pages} pages of promotions.",
+            parse_mode=ParseMode.HTML
+        )
+        return
+    
+    now = datetime.utcnow()
     promo_list = []
     for promo in promos:
-        created_at = promo.get("created_at")
-        if isinstance(created_at, str):
-            try:
-                created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            except:
-                created_at = datetime.utcnow()
-        
-        expires_at = created_at + timedelta(seconds=promo["duration"])
-        time_left = expires_at - datetime.utcnow()
-        hours_left = max(0, int(time_left.total_seconds() // 3600))
+        expires_at = promo["expires_at"]
+        hours_left = max(0, int((expires_at - now).total_seconds() // 3600))
         
         promo_list.append(
             f"• **ID:** `{promo.get('promo_id', 'N/A')}`\n"
@@ -158,7 +296,10 @@ async def list_promos_command(client: Client, message: Message):
             f"  **Expires:** {expires_at.strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
         )
     
+    footer = f"\n📄 Page {page + 1}/{total_pages} · {total} promos"
+    if page + 1 < total_pages:
+        footer += f" · /listpromos {page + 2} for more"
     await message.reply_text(
-        "📋 **Active Promotions**\n\n" + "\n".join(promo_list),
+        "📋 **Active Promotions**\n\n" + "\n".join(promo_list) + footer,
         parse_mode=ParseMode.HTML
     )
\ No newline at end of file
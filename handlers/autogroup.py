@@ -0,0 +1,141 @@
+# handlers/autogroup.py
+from pyrogram import Client, filters
+from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery, Message
+from pyrogram.enums import ParseMode
+import asyncio
+import time
+import database
+import config
+from handlers.campaigns import build_payload, wake_workers
+from handlers.promo import CATEGORY_NAMES, range_label
+from utils.grouping import group_channels
+
+# -----------------------------
+# Grouping all approved channels at once
+# -----------------------------
+async def compute_groups():
+    """One query for every approved channel, then one in-process partition pass"""
+    started = time.perf_counter()
+    channels = await database.get_approved_channels()
+    groups, leftovers = group_channels(channels, config.MIN_CHANNELS_FOR_CROSS_PROMO, config.SUBS_RANGES)
+    return groups, leftovers, len(channels), time.perf_counter() - started
+
+def groups_preview(groups, leftovers, total, elapsed):
+    per_category = {}
+    for group in groups:
+        stats = per_category.setdefault(group["category"], [0, 0])
+        stats[0] += 1
+        stats[1] += len(group["channels"])
+
+    lines = [
+        f"• {CATEGORY_NAMES.get(category, category)}: {count} groups, {channels} channels"
+        for category, (count, channels) in sorted(per_category.items())
+    ]
+    text = (
+        f"🤝 **Auto Cross-Promo Groups**\n\n"
+        f"Approved channels are grouped per category and subscriber range, "
+        f"at least {config.MIN_CHANNELS_FOR_CROSS_PROMO} per group, neighbours in subscriber count together.\n\n"
+        + ("\n".join(lines) if lines else "No category has enough approved channels yet.")
+        + f"\n\n📊 {len(groups)} groups from {total} channels, {len(leftovers)} left over ({elapsed * 1000:.0f} ms)"
+    )
+    if groups:
+        largest = max(groups, key=lambda g: g["max_subs"] - g["min_subs"])
+        text += (
+            f"\n📏 Widest group: {largest['min_subs']}–{largest['max_subs']} subs "
+            f"({range_label(largest['subs_range'])})"
+        )
+    return text
+
+def launch_keyboard(has_groups):
+    buttons = []
+    if has_groups:
+        buttons += [
+            [InlineKeyboardButton("🚀 Launch All · 6 Hours", callback_data="auto_groups_launch:21600"),
+             InlineKeyboardButton("🚀 Launch All · 12 Hours", callback_data="auto_groups_launch:43200")],
+            [InlineKeyboardButton("🚀 Launch All · 24 Hours", callback_data="auto_groups_launch:86400")],
+        ]
+    buttons.append([InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")])
+    return InlineKeyboardMarkup(buttons)
+
+async def launch_groups(client: Client, groups, duration: int, admin_id: int):
+    """Queue one campaign per group; the job workers post them all"""
+    bot_username = (await client.get_me()).username
+    campaign_ids = []
+    for group in groups:
+        payload = await build_payload(
+            client, group["channels"], "template",
+            template_id=config.AUTO_GROUP_TEMPLATE,
+            category=group["category"],
+            bot_username=bot_username
+        )
+        campaign_ids.append(await database.create_campaign(
+            group["channels"], duration, admin_id, "template", payload,
+            template=config.AUTO_GROUP_TEMPLATE,
+            category=group["category"]
+        ))
+    wake_workers()
+    return campaign_ids
+
+# -----------------------------
+# Admin panel
+# -----------------------------
+# One launch at a time across admins: a double tap would post every approved channel twice
+_launch_lock = asyncio.Lock()
+
+@Client.on_callback_query(filters.regex(r"^auto_groups$") & filters.user(config.ADMINS))
+async def auto_groups_menu(client: Client, cq: CallbackQuery):
+    await cq.answer()
+    groups, leftovers, total, elapsed = await compute_groups()
+    await cq.message.edit_text(
+        groups_preview(groups, leftovers, total, elapsed),
+        reply_markup=launch_keyboard(bool(groups)),
+        parse_mode=ParseMode.HTML
+    )
+
+@Client.on_message(filters.command("autogroups") & filters.user(config.ADMINS))
+async def auto_groups_command(client: Client, message: Message):
+    groups, leftovers, total, elapsed = await compute_groups()
+    await message.reply_text(
+        groups_preview(groups, leftovers, total, elapsed),
+        reply_markup=launch_keyboard(bool(groups)),
+        parse_mode=ParseMode.HTML
+    )
+
+@Client.on_callback_query(filters.regex(r"^auto_groups_launch:(\d+)$") & filters.user(config.ADMINS))
+async def auto_groups_launch(client: Client, cq: CallbackQuery):
+    if _launch_lock.locked():
+        await cq.answer("Auto groups are already being launched.", show_alert=True)
+        return
+    async with _launch_lock:
+        await cq.answer("Launching groups...")
+        # Drop the launch buttons first so a repeated callback has nothing left to tap
+        await cq.message.edit_text("⏳ Launching auto groups...", parse_mode=ParseMode.HTML)
+        duration = int(cq.matches[0].group(1))
+        try:
+            # Regroup now: channels may have been approved or banned since the preview
+            groups, leftovers, total, _ = await compute_groups()
+            campaign_ids = await launch_groups(client, groups, duration, cq.from_user.id)
+        except Exception as e:
+            print(f"[AUTO-GROUP] Launch by admin {cq.from_user.id} failed: {e}")
+            await cq.message.edit_text(
+                f"❌ **Auto Groups Launch Failed**\n\n{e}\n\n"
+                "Campaigns queued before the error keep posting; check /listpromos before retrying.",
+                reply_markup=InlineKeyboardMarkup([
+                    [InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")]
+                ]),
+                parse_mode=ParseMode.HTML
+            )
+            return
+    posts = sum(len(group["channels"]) for group in groups)
+    print(f"[AUTO-GROUP] Admin {cq.from_user.id} launched {len(campaign_ids)} campaigns, {posts} posts")
+    await cq.message.edit_text(
+        f"🚀 **Auto Groups Launched**\n\n"
+        f"• Campaigns queued: {len(campaign_ids)}\n"
+        f"• Channels posting: {posts} of {total} ({len(leftovers)} left over)\n"
+        f"• Auto-delete after {duration//3600} hours\n\n"
+        "Posts go out through the campaign queue; use /listpromos to follow them.",
+        reply_markup=InlineKeyboardMarkup([
+            [InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")]
+        ]),
+        parse_mode=ParseMode.HTML
+    )
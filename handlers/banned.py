@@ -0,0 +1,20 @@
+# handlers/banned.py
+from pyrogram import Client
+from pyrogram.types import Message, CallbackQuery
+import config
+
+# Banned users are dropped here, before any other handler (group 0) or DB call runs.
+# config.BANNED_USERS is filled at startup by database.load_ban_sets() and kept in
+# sync by database.ban_user / database.unban_user.
+
+@Client.on_message(config.BANNED_USERS, group=-1)
+async def drop_banned_message(client: Client, message: Message):
+    message.stop_propagation()
+
+@Client.on_callback_query(config.BANNED_USERS, group=-1)
+async def drop_banned_callback(client: Client, cq: CallbackQuery):
+    try:
+        await cq.answer("🚫 You have been banned from using this bot.", show_alert=True)
+    except Exception:
+        pass
+    cq.stop_propagation()
@@ -0,0 +1,418 @@
+# handlers/campaigns.py
+from pyrogram import Client
+from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from pyrogram.enums import ParseMode
+from pyrogram.errors import (
+    FloodWait, BadRequest, Forbidden,
+    MediaEmpty, MediaInvalid, MediaCaptionTooLong, WebpageCurlFailed, WebpageMediaEmpty,
+    ImageProcessFailed, PhotoInvalidDimensions, PhotoExtInvalid, ExternalUrlInvalid,
+    FileIdInvalid, FileReferenceExpired
+)
+import asyncio
+import time
+import database
+import config
+from datetime import datetime, timedelta
+from utils.cache import TTLCache
+from utils.media import send_cached
+from utils.outbound import send_priority, BULK
+from utils.crosstempl import get_template, generate_promo_message, generate_promo_buttons, generate_grid_promo_buttons
+
+# -----------------------------
+# Sending one payload to one channel
+# -----------------------------
+# Telegram rejected the media itself; the same post still works as plain text
+MEDIA_ERRORS = (
+    MediaEmpty, MediaInvalid, MediaCaptionTooLong, WebpageCurlFailed, WebpageMediaEmpty,
+    ImageProcessFailed, PhotoInvalidDimensions, PhotoExtInvalid, ExternalUrlInvalid,
+    FileIdInvalid, FileReferenceExpired
+)
+
+def channel_target(channel):
+    return f"@{channel['username']}" if channel.get("username") else channel["channel_id"]
+
+def dump_buttons(markup):
+    """Url-only keyboard as plain rows of {text, url}, so it can be stored with the campaign"""
+    return [[{"text": b.text, "url": b.url} for b in row] for row in markup.inline_keyboard]
+
+def load_buttons(rows):
+    return InlineKeyboardMarkup([[InlineKeyboardButton(b["text"], url=b["url"]) for b in row] for row in rows])
+
+async def build_payload(client, channels, mode, template_id=None, category=None, custom_message=None, bot_username=None):
+    """Render what every channel of a campaign receives: the post itself plus the shared buttons"""
+    # Get bot username for the "Add Your Channel" button
+    if bot_username is None:
+        bot_username = (await client.get_me()).username
+    if mode == "custom":
+        return {
+            "kind": "custom",
+            "custom_message": custom_message,
+            "buttons": dump_buttons(generate_promo_buttons(channels, bot_username)),
+        }
+
+    # Use special buttons for grid template
+    if template_id == "template6":
+        promo_buttons = generate_grid_promo_buttons(channels, bot_username)
+    else:
+        promo_buttons = generate_promo_buttons(channels, bot_username)
+    return {
+        "kind": "template",
+        "text": generate_promo_message(template_id, channels, category, config.BOT_NAME),
+        "image": getattr(config, "PROMO_IMAGE", None),
+        "buttons": dump_buttons(promo_buttons),
+    }
+
+async def send_media_or_text(client, target, send_media, text, reply_markup):
+    """Try send_media(); fall back to a text message only when the media was rejected"""
+    if send_media is not None:
+        try:
+            return await send_media()
+        except MEDIA_ERRORS as e:
+            print(f"Media send failed for {target}: {e}. Falling back to text.")
+    return await client.send_message(
+        chat_id=target,
+        text=text,
+        reply_markup=reply_markup,
+        parse_mode=ParseMode.MARKDOWN
+    )
+
+async def send_template_promo(client, target, payload, promo_buttons):
+    """Post a rendered template (with the promo banner if configured) and return the message id"""
+    send_photo = None
+    if payload.get("image"):
+        send_photo = lambda: send_cached(payload["image"], "photo", lambda photo: client.send_photo(
+            chat_id=target,
+            photo=photo,
+            caption=payload["text"],
+            reply_markup=promo_buttons,
+            parse_mode=ParseMode.MARKDOWN
+        ))
+    sent = await send_media_or_text(client, target, send_photo, payload["text"], promo_buttons)
+    return sent.id
+
+async def send_custom_promo(client, target, custom_message, promo_buttons):
+    """Post an admin-written promo in one channel and return the message id"""
+    # Forwarded messages are forwarded as-is, without buttons
+    if custom_message.get("is_forward"):
+        forwarded_msg = await client.forward_messages(
+            chat_id=target,
+            from_chat_id=custom_message["forward_from_chat_id"],
+            message_ids=custom_message["forward_from_message_id"]
+        )
+        if forwarded_msg:
+            return forwarded_msg.id
+        sent = await client.send_message(
+            chat_id=target,
+            text=custom_message.get("text", "🔗 **Check out these channels:**"),
+            parse_mode=ParseMode.MARKDOWN
+        )
+        return sent.id
+
+    senders = {"photo": client.send_photo, "video": client.send_video, "document": client.send_document}
+    media_type = custom_message["message_type"]
+    send_media = None
+    if custom_message["media"] and media_type in senders:
+        send_media = lambda: senders[media_type](
+            target,
+            custom_message["media"],
+            caption=custom_message["text"],
+            reply_markup=promo_buttons,
+            parse_mode=ParseMode.MARKDOWN
+        )
+    sent = await send_media_or_text(client, target, send_media, custom_message["text"], promo_buttons)
+    return sent.id
+
+async def send_payload(client, target, payload, promo_buttons):
+    if payload["kind"] == "custom":
+        return await send_custom_promo(client, target, payload["custom_message"], promo_buttons)
+    return await send_template_promo(client, target, payload, promo_buttons)
+
+# -----------------------------
+# Campaign summaries
+# -----------------------------
+def campaign_result_keyboard(campaign_id, has_posts):
+    """Keyboard under a send summary: one-shot takedown of the whole campaign"""
+    buttons = []
+    if has_posts:
+        buttons.append([InlineKeyboardButton("🗑 Delete Campaign", callback_data=f"delete_campaign:{campaign_id}")])
+    buttons.append([InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")])
+    return InlineKeyboardMarkup(buttons)
+
+def throughput(count, elapsed):
+    return f"{count / elapsed:.1f} posts/s ({elapsed:.1f}s)" if elapsed > 0 else f"{count} posts"
+
+def campaign_summary(campaign, failed_titles):
+    """Final status text for a finished campaign"""
+    posted = campaign["post_count"]
+    total = campaign.get("channel_count") or posted + campaign["failed_count"]
+    elapsed = (campaign["finished_at"] - campaign["created_at"]).total_seconds()
+    label = "Custom promo" if campaign["mode"] == "custom" else "Promo"
+
+    text = f"✅ {label} posted in {posted}/{total} channels!\n"
+    text += f"⏰ Auto-delete after {campaign['duration']//3600} hours.\n"
+    text += f"⚡ {throughput(posted, elapsed)}\n"
+    if campaign.get("template"):
+        text += f"🎨 Template: {get_template(campaign['template'])['name']}\n"
+    if posted:
+        text += f"📋 Campaign ID: `{campaign['campaign_id']}`\n"
+    if failed_titles:
+        text += f"\n❌ Failed: {', '.join(failed_titles[:3])}"
+        if len(failed_titles) > 3:
+            text += f" and {len(failed_titles)-3} more..."
+    return text
+
+# -----------------------------
+# Live progress (coalesced edits of the status message)
+# -----------------------------
+def format_eta(seconds: float):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+class CampaignProgress:
+    """Latest job counts of a running campaign and when its status message was last edited"""
+
+    def __init__(self, campaign: dict):
+        self.campaign_id = campaign["campaign_id"]
+        self.chat_id = campaign.get("admin_chat_id")
+        self.message_id = campaign.get("status_message_id")
+        self.counts = {}  # read by flush_progress, once per edit
+        self.started = time.monotonic()
+        self.settled_at_start = (campaign.get("channel_count") or 0) - (campaign.get("open_jobs") or 0)
+        self.last_edit = self.started  # the status message was just written by whoever queued the campaign
+        self.last_text = None
+        self.dirty = False  # jobs settled since the counts were last read
+        self.editing = False
+        self.flush_task = None
+
+    def text(self):
+        sent = self.counts.get("sent", 0)
+        failed = self.counts.get("failed", 0)
+        remaining = self.counts.get("pending", 0) + self.counts.get("sending", 0)
+        elapsed = time.monotonic() - self.started
+        rate = (sent + failed - self.settled_at_start) / elapsed if elapsed > 0 else 0
+        eta = format_eta(remaining / rate) if rate > 0 else "estimating..."
+        return (
+            f"⏳ **Posting campaign** `{self.campaign_id}`\n\n"
+            f"✅ Sent: {sent}\n"
+            f"❌ Failed: {failed}\n"
+            f"📨 Remaining: {remaining}\n"
+            f"⚡ {rate:.1f} posts/s · ETA {eta}"
+        )
+
+_progress = {}  # campaign_id -> CampaignProgress
+
+async def note_progress(client: Client, campaign_id: str):
+    """A job settled; the status message is recounted and edited at most once per PROGRESS_EDIT_INTERVAL"""
+    progress = _progress.get(campaign_id)
+    if progress is None:
+        campaign = await database.get_campaign(campaign_id)
+        if not campaign or campaign.get("status") != "running":
+            return  # noted just as the campaign finished; its summary is already up
+        progress = _progress.setdefault(campaign_id, CampaignProgress(campaign))
+    progress.dirty = True
+    if progress.message_id and progress.flush_task is None:
+        progress.flush_task = asyncio.create_task(flush_progress(client, progress))
+
+async def flush_progress(client: Client, progress: CampaignProgress):
+    """Wait out the edit interval, then count the jobs and show the result; repeat while jobs keep settling"""
+    try:
+        while progress.dirty and _progress.get(progress.campaign_id) is progress:
+            await asyncio.sleep(max(0, progress.last_edit + config.PROGRESS_EDIT_INTERVAL - time.monotonic()))
+            if _progress.get(progress.campaign_id) is not progress:
+                return  # finished while we slept
+            progress.dirty = False
+            progress.counts = await database.get_job_counts(progress.campaign_id)
+            if _progress.get(progress.campaign_id) is not progress:
+                return
+            text = progress.text()
+            if text == progress.last_text:
+                continue
+            progress.last_text = text
+            progress.last_edit = time.monotonic()
+            progress.editing = True
+            try:
+                await client.edit_message_text(progress.chat_id, progress.message_id, text, parse_mode=ParseMode.HTML)
+            except Exception as e:
+                if "MESSAGE_NOT_MODIFIED" not in str(e):
+                    print(f"[CAMPAIGN] Could not update progress for {progress.campaign_id}: {e}")
+            finally:
+                progress.editing = False
+    finally:
+        progress.flush_task = None  # only once no edit is in flight, so stop_progress can always reach it
+
+async def stop_progress(campaign_id: str):
+    """Stop progress edits, letting one already in flight land first so it cannot overwrite the summary"""
+    progress = _progress.pop(campaign_id, None)
+    task = progress.flush_task if progress else None
+    if task is None:
+        return
+    if progress.editing:
+        await task  # the loop sees the campaign is gone and ends after this edit
+    else:
+        task.cancel()
+
+async def maybe_finish(client: Client, campaign_id: str, open_jobs: int = 0):
+    """Close the campaign once no job is pending or in flight and post its summary; otherwise report progress.
+
+    open_jobs is the campaign's running counter after the job just settled; only when
+    it reaches zero are the jobs counted in full, to confirm before closing.
+    """
+    if open_jobs > 0:
+        await note_progress(client, campaign_id)
+        return
+    counts = await database.get_job_counts(campaign_id)
+    if counts.get("pending") or counts.get("sending"):
+        await note_progress(client, campaign_id)
+        return
+    campaign = await database.finish_campaign(campaign_id)
+    if campaign is None:
+        return  # already closed by another worker, or deleted
+    await stop_progress(campaign_id)
+    _payloads.pop(campaign_id)
+
+    failed = await database.get_campaign_jobs(campaign_id, "failed")
+    print(f"[CAMPAIGN] {campaign_id} done: {campaign['post_count']} posted, {campaign['failed_count']} failed")
+    if not campaign.get("admin_chat_id") or not campaign.get("status_message_id"):
+        return
+    try:
+        await client.edit_message_text(
+            campaign["admin_chat_id"],
+            campaign["status_message_id"],
+            campaign_summary(campaign, [job["title"] for job in failed]),
+            reply_markup=campaign_result_keyboard(campaign_id, campaign["post_count"] > 0),
+            parse_mode=ParseMode.HTML
+        )
+    except Exception as e:
+        if "MESSAGE_NOT_MODIFIED" not in str(e):
+            print(f"[CAMPAIGN] Could not post summary for {campaign_id}: {e}")
+
+# -----------------------------
+# Job workers (one job = one channel of one campaign)
+# -----------------------------
+_payloads = TTLCache(maxsize=64, ttl=3600)  # campaign_id -> (payload, keyboard)
+_wake = asyncio.Event()
+_workers = []
+
+def wake_workers():
+    """Tell idle workers new jobs are waiting instead of letting them sleep out the poll interval"""
+    _wake.set()
+
+async def campaign_payload(campaign_id: str):
+    cached = _payloads.get(campaign_id)
+    if cached is None:
+        campaign = await database.get_campaign(campaign_id)
+        if not campaign or not campaign.get("payload"):
+            return None
+        payload = campaign["payload"]
+        cached = (payload, load_buttons(payload["buttons"]))
+        _payloads.set(campaign_id, cached)
+    return cached
+
+async def run_job(client: Client, job: dict):
+    """Post one job and record the outcome; FloodWaits and transient errors go back in the queue"""
+    cached = await campaign_payload(job["campaign_id"])
+    if cached is None:
+        # Campaign deleted while its jobs were queued: close the job so a restart does not requeue it
+        await database.settle_job(job, {"status": "failed", "error": "campaign not found"})
+        return
+    payload, promo_buttons = cached
+
+    try:
+        message_id = await send_payload(client, job["target"], payload, promo_buttons)
+    except FloodWait as e:
+        flood_waits = (job.get("flood_waits") or 0) + 1
+        if e.value > config.FLOOD_WAIT_MAX or flood_waits > config.FLOOD_WAIT_RETRIES:
+            # Waiting this out would hold back the whole campaign's summary and promo records
+            outcome = {"status": "failed", "error": f"FloodWait {e.value}s"}
+            print(f"❌ Could not post in {job['target']}: FloodWait {e.value}s (wait #{flood_waits})")
+        else:
+            # Telegram's wait is not the channel's fault: requeue without spending an attempt
+            await database.update_job(job["job_id"], {
+                "status": "pending",
+                "attempts": job["attempts"] - 1,
+                "flood_waits": flood_waits,
+                "not_before": datetime.utcnow() + timedelta(seconds=e.value),
+                "error": f"FloodWait {e.value}s",
+            })
+            print(f"[CAMPAIGN] FloodWait {e.value}s for {job['target']}, requeued")
+            return
+    except (BadRequest, Forbidden) as e:
+        # Bot removed, channel gone, no rights: retrying will not help
+        outcome = {"status": "failed", "error": str(e)}
+        print(f"❌ Could not post in {job['target']}: {e}")
+    except Exception as e:
+        if job["attempts"] >= config.JOB_MAX_ATTEMPTS:
+            outcome = {"status": "failed", "error": str(e)}
+            print(f"❌ Could not post in {job['target']} after {job['attempts']} attempts: {e}")
+        else:
+            backoff = config.JOB_RETRY_BACKOFF * 2 ** (job["attempts"] - 1)
+            await database.update_job(job["job_id"], {
+                "status": "pending",
+                "not_before": datetime.utcnow() + timedelta(seconds=backoff),
+                "error": str(e),
+            })
+            print(f"[CAMPAIGN] Error posting in {job['target']}, retry in {backoff}s: {e}")
+            return
+    else:
+        outcome = {
+            "status": "sent",
+            "message_id": message_id,
+            "sent_at": datetime.utcnow(),
+            "error": None,
+        }
+
+    open_jobs = await database.settle_job(job, outcome)
+    if open_jobs is not None:  # None: requeued by an expired lease meanwhile, or campaign deleted
+        await maybe_finish(client, job["campaign_id"], open_jobs)
+
+async def campaign_worker(client: Client):
+    """Claim due jobs one at a time until there are none, then wait to be woken"""
+    send_priority.set(BULK)  # interactive replies overtake campaign posts in the outbound scheduler
+    while True:
+        try:
+            _wake.clear()
+            job = await database.claim_job(datetime.utcnow())
+            if job is None:
+                try:
+                    await asyncio.wait_for(_wake.wait(), config.JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass  # check again for jobs whose backoff or FloodWait has run out
+                continue
+            await run_job(client, job)
+        except Exception as e:
+            print(f"[CAMPAIGN] Worker error: {e}")
+            await asyncio.sleep(5)
+
+async def lease_worker():
+    """Requeue jobs whose sender died (here or in another process) once their lease runs out"""
+    while True:
+        await asyncio.sleep(config.JOB_LEASE_SECONDS)
+        try:
+            requeued = await database.requeue_stalled_jobs()
+            if requeued:
+                print(f"[CAMPAIGN] Requeued {requeued} jobs whose lease expired")
+                wake_workers()
+        except Exception as e:
+            print(f"[CAMPAIGN] Lease check error: {e}")
+
+async def start_campaign_workers(client: Client):
+    """Resume whatever a previous run left unfinished, then start the worker pool"""
+    requeued = await database.requeue_stalled_jobs()
+    if requeued:
+        print(f"[CAMPAIGN] Requeued {requeued} jobs interrupted by the last shutdown")
+    for campaign in await database.get_running_campaigns():
+        # Recount once: a crash between settling a job and decrementing open_jobs leaves the counter high
+        counts = await database.get_job_counts(campaign["campaign_id"])
+        open_jobs = counts.get("pending", 0) + counts.get("sending", 0)
+        if open_jobs != campaign.get("open_jobs"):
+            await database.update_campaign(campaign["campaign_id"], {"open_jobs": open_jobs})
+        await maybe_finish(client, campaign["campaign_id"], open_jobs)
+
+    for _ in range(config.SEND_CONCURRENCY):
+        _workers.append(asyncio.create_task(campaign_worker(client)))
+    _workers.append(asyncio.create_task(lease_worker()))
+    print(f"[CAMPAIGN] {config.SEND_CONCURRENCY} campaign workers started")
@@ -2,20 +2,16 @@
 from pyrogram import Client, filters
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery, Message, ForceReply
 from pyrogram.enums import ParseMode
-import asyncio
 import database
 import config
-from pymongo import MongoClient
-from datetime import datetime
+from datetime import datetime, timedelta
+from handlers.campaigns import build_payload, wake_workers
+from handlers.schedules import parse_when, reschedule
+from utils.cron import CronRule
+from utils.fairness import fair_pick
 
 # Import templates
-from utils.crosstempl import get_promo_templates, generate_promo_message, generate_promo_buttons, get_template_selection_keyboard, generate_grid_promo_buttons
-
-# -----------------------------
-# MongoDB Connection
-# -----------------------------
-client = MongoClient(config.MONGO_DB_URI)
-db = client[config.MONGO_DB_NAME]  # Use DB name from config
+from utils.crosstempl import get_template_selection_keyboard
 
 # Temporary in-memory selection store (per admin)
 selected_channels = {}
@@ -30,13 +26,49 @@ CATEGORY_NAMES = {
     "forex": "💸 Forex, Betting & Crypto"
 }
 
-# Subscriber ranges
-SUBS_RANGES = {
-    "500-999": "500 – 999 subs",
-    "1k-5k": "1k – 5k subs", 
-    "5k-10k": "5k – 10k subs",
-    "10k+": "10k+ subs"
-}
+def range_label(subs_range):
+    return config.SUBS_RANGES[subs_range][0] if subs_range in config.SUBS_RANGES else subs_range
+
+def channel_selection_keyboard(channels, selected_set, category):
+    """ON/OFF keyboard for the listed channels plus the navigation rows"""
+    buttons = []
+    for ch in channels:
+        cid = ch["channel_id"]
+        title = ch.get("title", "Channel")
+        subs = ch.get("subs_count", 0)
+        text = f"✅ {title} ({subs} subs)" if cid in selected_set else f"❌ {title} ({subs} subs)"
+        buttons.append([InlineKeyboardButton(text, callback_data=f"toggle_channel:{cid}")])
+
+    buttons.append([InlineKeyboardButton(f"⚖️ Fair Pick ({config.FAIR_PICK_SIZE} least featured)", callback_data="fair_pick")])
+    buttons.append([InlineKeyboardButton("🔒 Done Selecting", callback_data="done_selecting")])
+    buttons.append([InlineKeyboardButton("↩ Choose Different Range", callback_data=f"promo_category:{category}")])
+    buttons.append([InlineKeyboardButton("↩ Back to Categories", callback_data="send_promos")])
+    return InlineKeyboardMarkup(buttons)
+
+async def queue_campaign(callback, channels, duration, mode, payload, template=None, category=None):
+    """Store the campaign with one job per channel and hand it to the workers.
+
+    The callback message becomes the live status; the workers replace it with
+    the summary when the last channel is done.
+    """
+    await callback.answer()
+    campaign_id = await database.create_campaign(
+        channels, duration, callback.from_user.id, mode, payload,
+        template=template,
+        category=category,
+        admin_chat_id=callback.message.chat.id,
+        status_message_id=callback.message.id
+    )
+    wake_workers()
+    try:
+        await callback.message.edit_text(
+            f"⏳ Posting to {len(channels)} channels...\n"
+            f"📋 Campaign ID: `{campaign_id}`",
+            parse_mode=ParseMode.HTML
+        )
+    except Exception as e:
+        print(f"Error in queue_campaign: {e}")
+    return campaign_id
 
 # ---- Step 1: Admin chooses category ----
 @Client.on_callback_query(filters.regex(r"^send_promos$"))
@@ -87,7 +119,7 @@ async def choose_subs_range(client, callback: CallbackQuery):
 
     # Create buttons for subscriber ranges
     buttons = []
-    for range_key, range_name in SUBS_RANGES.items():
+    for range_key, (range_name, _, _) in config.SUBS_RANGES.items():
         buttons.append([InlineKeyboardButton(range_name, callback_data=f"promo_range:{range_key}:{category}")])
     
     buttons.append([InlineKeyboardButton("↩ Back to Categories", callback_data="send_promos")])
@@ -110,30 +142,18 @@ async def list_channels_by_range(client, callback: CallbackQuery):
     subs_range = callback.matches[0].group(1)
     category = callback.matches[0].group(2)
     
+    # Only channels in this category and subscriber range come back from the DB
+    filtered_channels = await database.get_channels_by_range(category, subs_range)
+
+    # Keep the listing in the session so toggles don't query again
     admin_id = callback.from_user.id
     selected_channels[admin_id] = {
         "category": category,
         "subs_range": subs_range,
+        "listed": filtered_channels,
         "selected": set()
     }
 
-    # Get all channels in this category
-    all_channels = database.get_channels_by_category(category)
-    
-    # Filter channels by subscriber range
-    filtered_channels = []
-    for channel in all_channels:
-        subs_count = channel.get('subs_count', 0)
-        
-        if subs_range == "500-999" and 500 <= subs_count <= 999:
-            filtered_channels.append(channel)
-        elif subs_range == "1k-5k" and 1000 <= subs_count <= 5000:
-            filtered_channels.append(channel)
-        elif subs_range == "5k-10k" and 5000 <= subs_count <= 10000:
-            filtered_channels.append(channel)
-        elif subs_range == "10k+" and subs_count >= 10000:
-            filtered_channels.append(channel)
-
     if not filtered_channels:
         kb = InlineKeyboardMarkup([
             [InlineKeyboardButton("↩ Choose Different Range", callback_data=f"promo_category:{category}")],
@@ -142,7 +162,7 @@ async def list_channels_by_range(client, callback: CallbackQuery):
         try:
             await callback.message.edit_text(
                 f"❌ No channels found in {CATEGORY_NAMES.get(category, category)} "
-                f"with {SUBS_RANGES.get(subs_range, subs_range)}.",
+                f"with {range_label(subs_range)}.",
                 reply_markup=kb,
                 parse_mode=ParseMode.HTML
             )
@@ -153,26 +173,17 @@ async def list_channels_by_range(client, callback: CallbackQuery):
         return
 
     # Build buttons with ON/OFF for selection
-    buttons = []
-    for ch in filtered_channels:
-        cid = ch["channel_id"]
-        title = ch.get("title", "Channel")
-        subs = ch.get("subs_count", 0)
-        buttons.append([InlineKeyboardButton(f"❌ {title} ({subs} subs)", callback_data=f"toggle_channel:{cid}")])
-
-    buttons.append([InlineKeyboardButton("🔒 Done Selecting", callback_data="done_selecting")])
-    buttons.append([InlineKeyboardButton("↩ Choose Different Range", callback_data=f"promo_category:{category}")])
-    buttons.append([InlineKeyboardButton("↩ Back to Categories", callback_data="send_promos")])
+    keyboard = channel_selection_keyboard(filtered_channels, set(), category)
 
     msg_text = (
         f"🎬 **Available Channels in {CATEGORY_NAMES.get(category, category)} "
-        f"({SUBS_RANGES.get(subs_range, subs_range)}):**\n\n" +
+        f"({range_label(subs_range)}):**\n\n" +
         "\n".join([f"• {c.get('title','Unknown')} (@{c.get('username','private')}) - {c.get('subs_count',0)} subs" 
                   for c in filtered_channels])
     )
     
     try:
-        await callback.message.edit_text(msg_text, reply_markup=InlineKeyboardMarkup(buttons), parse_mode=ParseMode.HTML)
+        await callback.message.edit_text(msg_text, reply_markup=keyboard, parse_mode=ParseMode.HTML)
     except Exception as e:
         if "MESSAGE_NOT_MODIFIED" not in str(e):
             await callback.answer("An error occurred. Please try again.", show_alert=True)
@@ -196,42 +207,55 @@ async def toggle_channel(client, callback: CallbackQuery):
         selected_set.add(channel_id)
         await callback.answer("Channel selected", show_alert=False)
 
-    # refresh markup
+    # refresh markup from the listing cached in the session
     category = selected_channels[admin_id]["category"]
-    subs_range = selected_channels[admin_id]["subs_range"]
-
-    all_channels = database.get_channels_by_category(category)
-    filtered_channels = []
-    for channel in all_channels:
-        subs_count = channel.get('subs_count', 0)
-        
-        if subs_range == "500-999" and 500 <= subs_count <= 999:
-            filtered_channels.append(channel)
-        elif subs_range == "1k-5k" and 1000 <= subs_count <= 5000:
-            filtered_channels.append(channel)
-        elif subs_range == "5k-10k" and 5000 <= subs_count <= 10000:
-            filtered_channels.append(channel)
-        elif subs_range == "10k+" and subs_count >= 10000:
-            filtered_channels.append(channel)
+    if "listed" not in selected_channels[admin_id]:
+        selected_channels[admin_id]["listed"] = await database.get_channels_by_range(
+            category, selected_channels[admin_id]["subs_range"]
+        )
+    keyboard = channel_selection_keyboard(selected_channels[admin_id]["listed"], selected_set, category)
 
-    buttons = []
-    for ch in filtered_channels:
-        cid = ch["channel_id"]
-        title = ch.get("title", "Channel")
-        subs = ch.get("subs_count", 0)
-        text = f"✅ {title} ({subs} subs)" if cid in selected_set else f"❌ {title} ({subs} subs)"
-        buttons.append([InlineKeyboardButton(text, callback_data=f"toggle_channel:{cid}")])
+    try:
+        await callback.message.edit_reply_markup(keyboard)
+    except Exception as e:
+        if "MESSAGE_NOT_MODIFIED" not in str(e):
+            await callback.answer("An error occurred. Please try again.", show_alert=True)
+            print(f"Error in toggle_channel: {e}")
 
-    buttons.append([InlineKeyboardButton("🔒 Done Selecting", callback_data="done_selecting")])
-    buttons.append([InlineKeyboardButton("↩ Choose Different Range", callback_data=f"promo_category:{category}")])
-    buttons.append([InlineKeyboardButton("↩ Back to Categories", callback_data="send_promos")])
+# ---- Fair pick: select the least-featured channels of the listing ----
+@Client.on_callback_query(filters.regex(r"^fair_pick$"))
+async def fair_pick_channels(client, callback: CallbackQuery):
+    admin_id = callback.from_user.id
+    session = selected_channels.get(admin_id)
 
+    if not session or "listed" not in session:
+        await callback.answer("Please start over with /sendpromos", show_alert=True)
+        return
+
+    listed = session["listed"]
+    exposure = await database.get_channel_exposure(c["channel_id"] for c in listed)
+    picked = fair_pick(listed, exposure, config.FAIR_PICK_SIZE)
+    session["selected"] = {c["channel_id"] for c in picked}
+    await callback.answer(f"Selected the {len(picked)} least-featured channels", show_alert=False)
+
+    category = session["category"]
+    lines = []
+    for c in picked:
+        seen = exposure.get(c["channel_id"])
+        featured = f"featured {seen['appearances']}×, last {seen['last_featured_at'].strftime('%Y-%m-%d')}" if seen else "never featured"
+        lines.append(f"• {c.get('title', 'Unknown')} - {c.get('subs_count', 0)} subs ({featured})")
     try:
-        await callback.message.edit_reply_markup(InlineKeyboardMarkup(buttons))
+        await callback.message.edit_text(
+            f"⚖️ **Fair Pick in {CATEGORY_NAMES.get(category, category)} "
+            f"({range_label(session['subs_range'])}):**\n\n" + "\n".join(lines) +
+            "\n\nAdjust the selection below or tap Done Selecting.",
+            reply_markup=channel_selection_keyboard(listed, session["selected"], category),
+            parse_mode=ParseMode.HTML
+        )
     except Exception as e:
         if "MESSAGE_NOT_MODIFIED" not in str(e):
             await callback.answer("An error occurred. Please try again.", show_alert=True)
-            print(f"Error in toggle_channel: {e}")
+            print(f"Error in fair_pick_channels: {e}")
 
 # ---- Step 4: Choose Template ----
 @Client.on_callback_query(filters.regex(r"^done_selecting$"))
@@ -291,105 +315,161 @@ async def set_promo_duration(client, callback: CallbackQuery):
             await callback.answer("An error occurred. Please try again.", show_alert=True)
             print(f"Error in set_promo_duration: {e}")
 
-# ---- Step 6: Send Promo ----
-@Client.on_callback_query(filters.regex(r"^promo_duration:(\d+)$"))
-async def create_promo_post(client, callback: CallbackQuery):
+# ---- Step 6: Choose When (now, later, or on a rule) ----
+def timing_keyboard():
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("🚀 Post Now", callback_data="promo_when:now")],
+        [InlineKeyboardButton("⏰ In 1 Hour", callback_data="promo_when:in:3600"),
+         InlineKeyboardButton("⏰ In 6 Hours", callback_data="promo_when:in:21600")],
+        [InlineKeyboardButton("🔁 Daily at This Time", callback_data="promo_when:daily")],
+        [InlineKeyboardButton("✍️ Custom Time or Rule", callback_data="promo_when:custom")],
+        [InlineKeyboardButton("↩ Cancel", callback_data="done_selecting")]
+    ])
+
+@Client.on_callback_query(filters.regex(r"^(custom_)?promo_duration:(\d+)$"))
+async def choose_promo_timing(client, callback: CallbackQuery):
     admin_id = callback.from_user.id
-    duration = int(callback.data.split(":")[1])
 
     if admin_id not in selected_channels or not selected_channels[admin_id].get("final"):
         await callback.answer("❌ Please select channels first.", show_alert=True)
         return
 
-    channel_ids = selected_channels[admin_id]["final"]
-    template_id = selected_channels[admin_id].get("template", "template1")
-    chosen_channels = [database.get_channel_by_id(cid) for cid in channel_ids if database.get_channel_by_id(cid)]
-    
-    if not chosen_channels:
-        await callback.answer("❌ No valid channels found.", show_alert=True)
+    send_mode = "custom" if callback.matches[0].group(1) else "template"
+    if send_mode == "custom" and "custom_message" not in selected_channels[admin_id]:
+        await callback.answer("❌ No custom message found.", show_alert=True)
         return
 
-    # Get bot username for the "Add Your Channel" button
-    bot_username = (await client.get_me()).username
-    
-    # Generate promo message and buttons using template
-    promo_text = generate_promo_message(template_id, chosen_channels, selected_channels[admin_id]["category"], config.BOT_NAME)
-    
-    # Use special buttons for grid template
-    if template_id == "template6":
-        promo_buttons = generate_grid_promo_buttons(chosen_channels, bot_username)
-    else:
-        promo_buttons = generate_promo_buttons(chosen_channels, bot_username)
-
-    success_count = 0
-    failed_channels = []
-    last_promo_id = None
+    selected_channels[admin_id]["send_mode"] = send_mode
+    selected_channels[admin_id]["duration"] = int(callback.matches[0].group(2))
 
-    for channel in chosen_channels:
-        target = f"@{channel['username']}" if channel.get("username") else channel["channel_id"]
-        try:
-            # Check if PROMO_IMAGE exists and is valid
-            promo_image = getattr(config, "PROMO_IMAGE", None)
-            if promo_image:
-                try:
-                    # Try to send as photo first
-                    sent = await client.send_photo(
-                        chat_id=target,
-                        photo=promo_image,
-                        caption=promo_text,
-                        reply_markup=promo_buttons,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                except Exception as photo_error:
-                    # If photo fails, fall back to text message
-                    print(f"Photo send failed for {target}: {photo_error}. Falling back to text.")
-                    sent = await client.send_message(
-                        chat_id=target,
-                        text=promo_text,
-                        reply_markup=promo_buttons,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-            else:
-                sent = await client.send_message(
-                    chat_id=target,
-                    text=promo_text,
-                    reply_markup=promo_buttons,
-                    parse_mode=ParseMode.MARKDOWN
-                )
-
-            promo_id = database.save_promo_post(target, sent.id, duration)
-            last_promo_id = promo_id
-            success_count += 1
-        except Exception as e:
-            print(f"❌ Could not post in {target}: {e}")
-            failed_channels.append(channel.get('title', 'Unknown'))
+    try:
+        await callback.message.edit_text(
+            "🗓 **When should the promo go out?**\n\n"
+            "Scheduled and recurring promos use UTC.",
+            reply_markup=timing_keyboard(),
+            parse_mode=ParseMode.HTML
+        )
+    except Exception as e:
+        if "MESSAGE_NOT_MODIFIED" not in str(e):
+            await callback.answer("An error occurred. Please try again.", show_alert=True)
+            print(f"Error in choose_promo_timing: {e}")
 
-    if admin_id in selected_channels:
+def end_promo_session(admin_id):
+    """Forget a finished wizard; custom promos keep the channel selection for the next message"""
+    session = selected_channels.get(admin_id)
+    if session is None:
+        return
+    if session.get("send_mode") == "custom":
+        for key in ["mode", "custom_message", "prompt_message_id", "send_mode", "duration"]:
+            session.pop(key, None)
+    else:
         del selected_channels[admin_id]
 
-    result_text = f"✅ Promo posted in {success_count}/{len(chosen_channels)} channels!\n"
-    result_text += f"⏰ Auto-delete after {duration//3600} hours.\n"
-    result_text += f"🎨 Template: {next((t['name'] for t in get_promo_templates() if t['id'] == template_id), 'Standard')}\n"
+# ---- Step 7a: Send Promo Now ----
+@Client.on_callback_query(filters.regex(r"^promo_when:now$"))
+async def create_promo_post(client, callback: CallbackQuery):
+    admin_id = callback.from_user.id
+    session = selected_channels.get(admin_id)
+
+    if not session or not session.get("final") or "duration" not in session:
+        await callback.answer("❌ Please select channels first.", show_alert=True)
+        return
+
+    chosen_channels = await database.get_channels_by_ids(session["final"])
     
-    if last_promo_id:
-        result_text += f"📋 Promo ID: `{last_promo_id}`\n"
+    if not chosen_channels:
+        await callback.answer("❌ No valid channels found.", show_alert=True)
+        return
 
-    if failed_channels:
-        result_text += f"\n❌ Failed: {', '.join(failed_channels[:3])}"
-        if len(failed_channels) > 3:
-            result_text += f" and {len(failed_channels)-3} more..."
+    send_mode = session["send_mode"]
+    template_id = session.get("template", "template1") if send_mode == "template" else None
+    payload = await build_payload(
+        client, chosen_channels, send_mode,
+        template_id=template_id,
+        category=session.get("category"),
+        custom_message=session.get("custom_message")
+    )
+    await queue_campaign(
+        callback, chosen_channels, session["duration"], send_mode, payload,
+        template=template_id,
+        category=session.get("category")
+    )
+    end_promo_session(admin_id)
+
+# ---- Step 7b: Schedule Promo ----
+async def schedule_promo(admin_id, chat_id, next_run, rule=None):
+    """Store the wizard's promo as a schedule and return the confirmation text"""
+    session = selected_channels[admin_id]
+    send_mode = session["send_mode"]
+    schedule_id = await database.create_schedule(
+        session["final"], session["duration"], admin_id, chat_id, send_mode, next_run,
+        rule=rule,
+        template=session.get("template", "template1") if send_mode == "template" else None,
+        category=session.get("category"),
+        custom_message=session.get("custom_message")
+    )
+    reschedule()
+    end_promo_session(admin_id)
+    print(f"[SCHEDULE] Admin {admin_id} scheduled {schedule_id} for {next_run} (rule: {rule})")
+    return (
+        f"🗓 **Promo Scheduled**\n\n"
+        f"• Schedule ID: `{schedule_id}`\n"
+        f"• Next run: {next_run.strftime('%Y-%m-%d %H:%M UTC')}\n"
+        f"• Repeats: {f'`{rule}`' if rule else 'no'}\n\n"
+        "Use /schedules to see or cancel scheduled promos."
+    )
 
-    try:
-        await callback.message.edit_text(
-            result_text,
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")]]),
+SCHEDULED_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🗓 Scheduled Promos", callback_data="schedules_menu")],
+    [InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")]
+])
+
+@Client.on_callback_query(filters.regex(r"^promo_when:(in:\d+|daily|custom)$"))
+async def schedule_promo_post(client, callback: CallbackQuery):
+    admin_id = callback.from_user.id
+    session = selected_channels.get(admin_id)
+
+    if not session or not session.get("final") or "duration" not in session:
+        await callback.answer("❌ Please select channels first.", show_alert=True)
+        return
+
+    choice = callback.matches[0].group(1)
+    now = datetime.utcnow()
+    if choice == "custom":
+        await callback.answer()
+        session["mode"] = "schedule_rule"
+        prompt = await callback.message.reply_text(
+            "🗓 **Custom Schedule**\n\n"
+            "Reply with a UTC time to post once, e.g. `2025-01-31 18:30`\n"
+            "or a cron rule to repeat (minute hour day month weekday), e.g. `0 18 * * *` for every day at 18:00.\n\n"
+            "Type /cancel to cancel this operation.",
+            reply_markup=ForceReply(selective=True),
             parse_mode=ParseMode.HTML
         )
-    except Exception as e:
-        if "MESSAGE_NOT_MODIFIED" not in str(e):
-            await callback.answer("An error occurred. Please try again.", show_alert=True)
-            print(f"Error in create_promo_post: {e}")
+        session["prompt_message_id"] = prompt.id
+        return
 
+    if choice == "daily":
+        rule = f"{now.minute} {now.hour} * * *"
+        next_run = CronRule(rule).next_after(now)
+    else:
+        rule = None
+        next_run = now + timedelta(seconds=int(choice.split(":")[1]))
+
+    await callback.answer()
+    text = await schedule_promo(admin_id, callback.message.chat.id, next_run, rule)
+    await callback.message.edit_text(text, reply_markup=SCHEDULED_KEYBOARD, parse_mode=ParseMode.HTML)
+
+async def handle_schedule_reply(client, message: Message):
+    """Admin replied to the custom schedule prompt with a time or a cron rule"""
+    admin_id = message.from_user.id
+    try:
+        next_run, rule = parse_when(message.text or "", datetime.utcnow())
+    except ValueError as e:
+        await message.reply_text(f"❌ {e}\n\nReply to the prompt again or type /cancel.")
+        return
+    text = await schedule_promo(admin_id, message.chat.id, next_run, rule)
+    await message.reply_text(text, reply_markup=SCHEDULED_KEYBOARD, parse_mode=ParseMode.HTML)
 
 # ---- Back to categories ----
 @Client.on_callback_query(filters.regex(r"^promo_back_categories$"))
@@ -430,11 +510,15 @@ async def handle_admin_promo_message(client, message: Message):
     admin_id = message.from_user.id
     
     # Check if admin is in write promo mode and replying to the correct prompt
-    if admin_id not in selected_channels or selected_channels[admin_id].get("mode") != "write_promo":
+    if admin_id not in selected_channels or selected_channels[admin_id].get("mode") not in ("write_promo", "schedule_rule"):
         return
     
     if "prompt_message_id" not in selected_channels[admin_id] or selected_channels[admin_id]["prompt_message_id"] != message.reply_to_message.id:
         return
+
+    if selected_channels[admin_id]["mode"] == "schedule_rule":
+        await handle_schedule_reply(client, message)
+        return
     
     # Check if we have selected channels
     if "final" not in selected_channels[admin_id] or not selected_channels[admin_id]["final"]:
@@ -498,159 +582,6 @@ async def handle_admin_promo_message(client, message: Message):
     except Exception as e:
         print(f"Error in handle_admin_promo_message: {e}")
 
-# ---- Handle Custom Promo Duration ----
-# ---- Handle Custom Promo Duration ----
-@Client.on_callback_query(filters.regex(r"^custom_promo_duration:(\d+)$"))
-async def create_custom_promo_post(client, callback: CallbackQuery):
-    admin_id = callback.from_user.id
-    duration = int(callback.data.split(":")[1])
-
-    if admin_id not in selected_channels or not selected_channels[admin_id].get("final"):
-        await callback.answer("❌ Please select channels first.", show_alert=True)
-        return
-
-    if "custom_message" not in selected_channels[admin_id]:
-        await callback.answer("❌ No custom message found.", show_alert=True)
-        return
-
-    channel_ids = selected_channels[admin_id]["final"]
-    chosen_channels = [database.get_channel_by_id(cid) for cid in channel_ids if database.get_channel_by_id(cid)]
-    
-    if not chosen_channels:
-        await callback.answer("❌ No valid channels found.", show_alert=True)
-        return
-
-    custom_message = selected_channels[admin_id]["custom_message"]
-    bot_username = (await client.get_me()).username
-    
-    # Generate buttons for the custom promo
-    promo_buttons = generate_promo_buttons(chosen_channels, bot_username)
-
-    success_count = 0
-    failed_channels = []
-    last_promo_id = None
-
-    for channel in chosen_channels:
-        target = f"@{channel['username']}" if channel.get("username") else channel["channel_id"]
-        try:
-            # Handle forwarded messages - just forward them without buttons
-            if custom_message.get("is_forward"):
-                forwarded_msg = await client.forward_messages(
-                    chat_id=target,
-                    from_chat_id=custom_message["forward_from_chat_id"],
-                    message_ids=custom_message["forward_from_message_id"]
-                )
-                if forwarded_msg:
-                    promo_id = database.save_promo_post(target, forwarded_msg.id, duration)
-                else:
-                    sent = await client.send_message(
-                        chat_id=target,
-                        text=custom_message.get("text", "🔗 **Check out these channels:**"),
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                    promo_id = database.save_promo_post(target, sent.id, duration)
-
-            elif custom_message["message_type"] == "photo" and custom_message["media"]:
-                try:
-                    sent = await client.send_photo(
-                        chat_id=target,
-                        photo=custom_message["media"],
-                        caption=custom_message["text"],
-                        reply_markup=promo_buttons,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                except Exception as photo_error:
-                    print(f"Photo send failed for {target}: {photo_error}. Falling back to text.")
-                    sent = await client.send_message(
-                        chat_id=target,
-                        text=custom_message["text"],
-                        reply_markup=promo_buttons,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                promo_id = database.save_promo_post(target, sent.id, duration)
-
-            elif custom_message["message_type"] == "video" and custom_message["media"]:
-                try:
-                    sent = await client.send_video(
-                        chat_id=target,
-                        video=custom_message["media"],
-                        caption=custom_message["text"],
-                        reply_markup=promo_buttons,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                except Exception as video_error:
-                    print(f"Video send failed for {target}: {video_error}. Falling back to text.")
-                    sent = await client.send_message(
-                        chat_id=target,
-                        text=custom_message["text"],
-                        reply_markup=promo_buttons,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                promo_id = database.save_promo_post(target, sent.id, duration)
-
-            elif custom_message["message_type"] == "document" and custom_message["media"]:
-                try:
-                    sent = await client.send_document(
-                        chat_id=target,
-                        document=custom_message["media"],
-                        caption=custom_message["text"],
-                        reply_markup=promo_buttons,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                except Exception as doc_error:
-                    print(f"Document send failed for {target}: {doc_error}. Falling back to text.")
-                    sent = await client.send_message(
-                        chat_id=target,
-                        text=custom_message["text"],
-                        reply_markup=promo_buttons,
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                promo_id = database.save_promo_post(target, sent.id, duration)
-
-            else:
-                sent = await client.send_message(
-                    chat_id=target,
-                    text=custom_message["text"],
-                    reply_markup=promo_buttons,
-                    parse_mode=ParseMode.MARKDOWN
-                )
-                promo_id = database.save_promo_post(target, sent.id, duration)
-
-            last_promo_id = promo_id
-            success_count += 1
-        except Exception as e:
-            print(f"❌ Could not post in {target}: {e}")
-            failed_channels.append(channel.get('title', 'Unknown'))
-
-    # Clean up session state
-    if admin_id in selected_channels:
-        for key in ["mode", "custom_message", "prompt_message_id"]:
-            if key in selected_channels[admin_id]:
-                del selected_channels[admin_id][key]
-
-    result_text = f"✅ Custom promo posted in {success_count}/{len(chosen_channels)} channels!\n"
-    result_text += f"⏰ Auto-delete after {duration//3600} hours.\n"
-    
-    if last_promo_id:
-        result_text += f"📋 Promo ID: `{last_promo_id}`\n"
-
-    if failed_channels:
-        result_text += f"\n❌ Failed: {', '.join(failed_channels[:3])}"
-        if len(failed_channels) > 3:
-            result_text += f" and {len(failed_channels)-3} more..."
-
-    try:
-        await callback.message.edit_text(
-            result_text,
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")]]),
-            parse_mode=ParseMode.HTML
-        )
-    except Exception as e:
-        if "MESSAGE_NOT_MODIFIED" not in str(e):
-            await callback.answer("An error occurred. Please try again.", show_alert=True)
-            print(f"Error in create_custom_promo_post: {e}")
-
-
 # ---- Cancel Operation ----
 @Client.on_message(filters.user(config.ADMINS) & filters.command("cancel"))
 async def cancel_operation(client, message: Message):
@@ -674,16 +605,3 @@ async def cancel_operation(client, message: Message):
         )
     except Exception as e:
         print(f"Error in cancel_operation: {e}")
-
-# ---- Auto Deletion Worker ----
-async def promo_cleanup_worker(client: Client):
-    while True:
-        promos = database.get_scheduled_promos()
-        for promo in promos:
-            try:
-                await client.delete_messages(promo["channel"], promo["message_id"])
-                database.remove_promo_post(promo["channel"], promo["message_id"])
-                print(f"[PROMO] Deleted expired promo in {promo['channel']}")
-            except Exception as e:
-                print(f"[ERROR] Failed to delete promo {promo} - {e}")
-        await asyncio.sleep(60)
@@ -0,0 +1,167 @@
+# handlers/schedules.py
+from pyrogram import Client, filters
+from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery, Message
+from pyrogram.enums import ParseMode
+import asyncio
+import database
+import config
+from datetime import datetime, timedelta
+from handlers.campaigns import build_payload, wake_workers
+from utils.cron import CronRule
+from utils.outbound import send_priority, NORMAL
+
+# -----------------------------
+# Parsing admin input
+# -----------------------------
+def parse_when(text: str, now: datetime):
+    """Turn "YYYY-MM-DD HH:MM" (one-shot) or a cron rule (recurring) into (next_run, rule), all UTC"""
+    text = text.strip()
+    try:
+        run_at = datetime.strptime(text, "%Y-%m-%d %H:%M")
+    except ValueError:
+        rule = CronRule(text)  # raises ValueError with a readable reason
+        return rule.next_after(now), str(rule)
+    if run_at <= now:
+        raise ValueError("That time is already in the past")
+    return run_at, None
+
+def describe_schedule(schedule):
+    repeats = f"🔁 `{schedule['rule']}`" if schedule.get("rule") else "once"
+    template = f", {schedule['template']}" if schedule.get("template") else ""
+    return (
+        f"• **ID:** `{schedule['schedule_id']}`\n"
+        f"  **Next run:** {schedule['next_run'].strftime('%Y-%m-%d %H:%M UTC')} ({repeats})\n"
+        f"  **Promo:** {schedule['mode']}{template}, {len(schedule['channel_ids'])} channels, "
+        f"{schedule['duration']//3600}h\n"
+        f"  **Runs so far:** {schedule.get('run_count', 0)}\n"
+    )
+
+# -----------------------------
+# Timer-driven runner (one task for all schedules)
+# -----------------------------
+_changed = asyncio.Event()
+
+def reschedule():
+    """A schedule was added or removed: make the runner recompute how long to sleep"""
+    _changed.set()
+
+async def launch_schedule(client: Client, schedule: dict, start_at: datetime):
+    """Render and queue one run of a schedule; its jobs start no earlier than start_at"""
+    channels = await database.get_channels_by_ids(schedule["channel_ids"])
+    if not channels:
+        print(f"[SCHEDULE] {schedule['schedule_id']} skipped: none of its channels are available")
+        return None
+
+    payload = await build_payload(
+        client, channels, schedule["mode"],
+        template_id=schedule.get("template"),
+        category=schedule.get("category"),
+        custom_message=schedule.get("custom_message")
+    )
+    status_message_id = None
+    try:
+        status = await client.send_message(
+            schedule["admin_chat_id"],
+            f"🗓 Scheduled promo `{schedule['schedule_id']}` is posting to {len(channels)} channels...",
+            parse_mode=ParseMode.HTML
+        )
+        status_message_id = status.id
+    except Exception as e:
+        print(f"[SCHEDULE] Could not notify admin for {schedule['schedule_id']}: {e}")
+
+    campaign_id = await database.create_campaign(
+        channels, schedule["duration"], schedule["admin_id"], schedule["mode"], payload,
+        template=schedule.get("template"),
+        category=schedule.get("category"),
+        admin_chat_id=schedule["admin_chat_id"],
+        status_message_id=status_message_id,
+        start_at=start_at
+    )
+    wake_workers()
+    return campaign_id
+
+async def fire_due_schedules(client: Client, now: datetime):
+    """Launch every due schedule, staggering their start times across SCHEDULE_SPREAD_WINDOW"""
+    due = await database.get_due_schedules(now)
+    step = config.SCHEDULE_SPREAD_WINDOW / len(due) if due else 0
+    for index, schedule in enumerate(due):
+        # Advance the schedule first: a crash mid-launch skips one run rather than posting it twice
+        fields = {"last_run": now, "run_count": schedule.get("run_count", 0) + 1}
+        if schedule.get("rule"):
+            fields["next_run"] = CronRule(schedule["rule"]).next_after(now)  # missed runs collapse into this one
+        else:
+            fields["status"] = "done"
+        await database.update_schedule(schedule["schedule_id"], fields)
+
+        try:
+            campaign_id = await launch_schedule(client, schedule, now + timedelta(seconds=index * step))
+        except Exception as e:
+            print(f"[SCHEDULE] Error launching {schedule['schedule_id']}: {e}")
+            continue
+        if campaign_id:
+            await database.update_schedule(schedule["schedule_id"], {"last_campaign_id": campaign_id})
+            print(f"[SCHEDULE] {schedule['schedule_id']} launched {campaign_id} (+{index * step:.0f}s)")
+
+async def schedule_runner(client: Client):
+    """Sleep until the soonest schedule is due (or one is added), fire what is due, repeat"""
+    send_priority.set(NORMAL)  # status messages yield to interactive replies
+    print("[SCHEDULE] Scheduler started")
+    while True:
+        try:
+            _changed.clear()
+            next_run = await database.get_next_schedule_run()
+            now = datetime.utcnow()
+            if next_run is not None and next_run <= now:
+                await fire_due_schedules(client, now)
+                continue
+
+            # Wake at the next run, or earlier if schedules change; re-check hourly in case the clock moved
+            timeout = 3600 if next_run is None else min(3600, (next_run - now).total_seconds())
+            try:
+                await asyncio.wait_for(_changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        except Exception as e:
+            print(f"[SCHEDULE] Scheduler error: {e}")
+            await asyncio.sleep(30)
+
+# -----------------------------
+# Listing and cancelling schedules
+# -----------------------------
+async def schedules_view():
+    schedules = await database.get_active_schedules()
+    buttons = [
+        [InlineKeyboardButton(f"❌ Cancel {s['schedule_id'][-6:]}", callback_data=f"cancel_schedule:{s['schedule_id']}")]
+        for s in schedules[:20]
+    ]
+    buttons.append([InlineKeyboardButton("↩ Back to Admin Panel", callback_data="admin_panel")])
+    if not schedules:
+        text = "🗓 **Scheduled Promos**\n\nNothing is scheduled. Pick a time after choosing the promo duration."
+    else:
+        text = "🗓 **Scheduled Promos**\n\n" + "\n".join(describe_schedule(s) for s in schedules[:20])
+        if len(schedules) > 20:
+            text += f"\n... and {len(schedules) - 20} more"
+    return text, InlineKeyboardMarkup(buttons)
+
+@Client.on_message(filters.command("schedules") & filters.user(config.ADMINS))
+async def schedules_command(client: Client, message: Message):
+    text, keyboard = await schedules_view()
+    await message.reply_text(text, reply_markup=keyboard, parse_mode=ParseMode.HTML)
+
+@Client.on_callback_query(filters.regex(r"^schedules_menu$") & filters.user(config.ADMINS))
+async def schedules_menu(client: Client, cq: CallbackQuery):
+    await cq.answer()
+    text, keyboard = await schedules_view()
+    await cq.message.edit_text(text, reply_markup=keyboard, parse_mode=ParseMode.HTML)
+
+@Client.on_callback_query(filters.regex(r"^cancel_schedule:(.+)$") & filters.user(config.ADMINS))
+async def cancel_schedule(client: Client, cq: CallbackQuery):
+    schedule_id = cq.matches[0].group(1)
+    if await database.remove_schedule(schedule_id):
+        reschedule()
+        await cq.answer("Schedule cancelled")
+        print(f"[SCHEDULE] Admin {cq.from_user.id} cancelled {schedule_id}")
+    else:
+        await cq.answer("Schedule not found. It may have already run.", show_alert=True)
+    text, keyboard = await schedules_view()
+    await cq.message.edit_text(text, reply_markup=keyboard, parse_mode=ParseMode.HTML)
@@ -6,6 +6,7 @@ from pyrogram.errors import MessageNotModified  # Added specific exception impor
 import config
 import database  # Add this import
 from datetime import datetime
+from utils.media import send_cached
 
 # Import admin panel from admin.py
 from handlers.admin import get_admin_panel
@@ -33,8 +34,8 @@ def main_keyboard(user_id=None):
 # -----------------------------
 @Client.on_message(filters.command("start") & filters.private)
 async def start_command(client: Client, message: Message):
-    # Save user to database
-    database.save_user(message.from_user.id, message.from_user.username or "")
+    # Save user to database (buffered, so the reply never waits on Mongo)
+    database.queue_user(message.from_user.id, message.from_user.username or "")
     
     caption = (
         f"👋 Hello <b>{message.from_user.first_name}</b>,\n\n"
@@ -46,20 +47,21 @@ async def start_command(client: Client, message: Message):
     keyboard = main_keyboard(message.from_user.id)
 
     try:
+        # Media goes through the file_id cache, so Telegram fetches each URL only once
         if getattr(config, "START_MSG_VID", None):
-            await message.reply_video(
-                video=config.START_MSG_VID,
+            await send_cached(config.START_MSG_VID, "video", lambda video: message.reply_video(
+                video=video,
                 caption=caption,
                 parse_mode=ParseMode.HTML,
                 reply_markup=keyboard
-            )
+            ))
         elif getattr(config, "START_MSG_PHOTO", None):
-            await message.reply_photo(
-                photo=config.START_MSG_PHOTO,
+            await send_cached(config.START_MSG_PHOTO, "photo", lambda photo: message.reply_photo(
+                photo=photo,
                 caption=caption,
                 parse_mode=ParseMode.HTML,
                 reply_markup=keyboard
-            )
+            ))
         else:
             await message.reply_text(
                 caption,
@@ -133,9 +135,10 @@ async def cb_my_channels(client: Client, cq: CallbackQuery):
     page = int(cq.matches[0].group(1))
     user_id = cq.from_user.id
 
-    # Get ONLY approved channels from database
-    channels = database.get_user_channels(user_id, status_filter="APPROVED")
-    total = len(channels)
+    if page < 0: page = 0
+
+    # Get ONLY approved channels from database, one per page
+    channels, total = await database.get_user_channels_page(user_id, page, 1, status_filter="APPROVED")
 
     if total == 0:
         text = (
@@ -156,10 +159,11 @@ async def cb_my_channels(client: Client, cq: CallbackQuery):
             print(f"Error in cb_my_channels (no channels): {e}")
         return
 
-    if page < 0: page = 0
-    if page >= total: page = total - 1
+    if page >= total:
+        page = total - 1
+        channels, total = await database.get_user_channels_page(user_id, page, 1, status_filter="APPROVED")
 
-    channel = channels[page]
+    channel = channels[0]
     created = channel.get("added_at")
     created_str = created.strftime("%Y-%m-%d %H:%M:%S") if hasattr(created, 'strftime') else str(created or "N/A")
 
@@ -198,7 +202,7 @@ async def cb_remove_channel(client: Client, cq: CallbackQuery):
     user_id = cq.from_user.id
     
     # Remove channel from database
-    success = database.remove_channel(user_id, channel_id)
+    success = await database.remove_channel(user_id, channel_id)
     
     if success:
         text = (
@@ -6,9 +6,13 @@ import config
 import database
 import re
 from datetime import datetime
+from utils.outbound import priority, NORMAL
 
 CHANNEL_LINK_RE = re.compile(r"(https?://t\.me/[\w\d_]+)")
 
+# Range keys used before config.SUBS_RANGES; keyboards already sent to users still carry them
+LEGACY_RANGE_KEYS = {"1000-5000": "1k-5k", "5000-10000": "5k-10k", "10000+": "10k+"}
+
 # ------------------------------
 # Step 1: Handle submission input
 # ------------------------------
@@ -36,6 +40,10 @@ async def handle_submission(client: Client, message: Message):
         except Exception as e:
             return await message.reply_text(f"❌ Invalid or inaccessible channel link.\n\n{e}")
 
+    # Banned channels can't be resubmitted (in-memory check, no DB call)
+    if await database.is_channel_banned(channel_id):
+        return await message.reply_text("🚫 This channel has been banned and can't be submitted.")
+
     # Step 2: Subscriber check
     try:
         subs_count = await client.get_chat_members_count(channel_id)
@@ -53,10 +61,8 @@ async def handle_submission(client: Client, message: Message):
     # Step 3: Ask for subscriber range first
     kb = InlineKeyboardMarkup(
         [
-            [InlineKeyboardButton("500 – 999 subs", callback_data=f"range:500-999:{channel_id}")],
-            [InlineKeyboardButton("1k – 5k subs", callback_data=f"range:1000-5000:{channel_id}")],
-            [InlineKeyboardButton("5k – 10k subs", callback_data=f"range:5000-10000:{channel_id}")],
-            [InlineKeyboardButton("10k+ subs", callback_data=f"range:10000+:{channel_id}")]
+            [InlineKeyboardButton(label, callback_data=f"range:{range_key}:{channel_id}")]
+            for range_key, (label, _, _) in config.SUBS_RANGES.items()
         ]
     )
 
@@ -71,9 +77,10 @@ async def handle_submission(client: Client, message: Message):
 # ------------------------------
 # Step 4: Handle subscriber range choice
 # ------------------------------
-@Client.on_callback_query(filters.regex(r"^range:([\d\+\-]+):(-?\d+)$"))
+@Client.on_callback_query(filters.regex(r"^range:([\w\+\-]+):(-?\d+)$"))
 async def cb_range(client: Client, cq: CallbackQuery):
     subs_range = cq.matches[0].group(1)
+    subs_range = LEGACY_RANGE_KEYS.get(subs_range, subs_range)
     channel_id = int(cq.matches[0].group(2))
     user_id = cq.from_user.id
 
@@ -85,14 +92,9 @@ async def cb_range(client: Client, cq: CallbackQuery):
 
     # Verify range
     valid = False
-    if subs_range == "500-999" and 500 <= subs_count <= 999:
-        valid = True
-    elif subs_range == "1000-5000" and 1000 <= subs_count <= 5000:
-        valid = True
-    elif subs_range == "5000-10000" and 5000 <= subs_count <= 10000:
-        valid = True
-    elif subs_range == "10000+" and subs_count >= 10000:
-        valid = True
+    if subs_range in config.SUBS_RANGES:
+        _, low, high = config.SUBS_RANGES[subs_range]
+        valid = low <= subs_count and (high is None or subs_count < high)
 
     if not valid:
         return await cq.message.edit_text(
@@ -124,11 +126,12 @@ async def cb_range(client: Client, cq: CallbackQuery):
 # ------------------------------
 # Step 6: Handle category choice
 # ------------------------------
-@Client.on_callback_query(filters.regex(r"^cat:(\w+):(-?\d+):([\d\+\-]+)$"))
+@Client.on_callback_query(filters.regex(r"^cat:(\w+):(-?\d+):([\w\+\-]+)$"))
 async def cb_category(client: Client, cq: CallbackQuery):
     category = cq.matches[0].group(1)
     channel_id = int(cq.matches[0].group(2))
     subs_range = cq.matches[0].group(3)
+    subs_range = LEGACY_RANGE_KEYS.get(subs_range, subs_range)
     user_id = cq.from_user.id
 
     try:
@@ -150,7 +153,7 @@ async def cb_category(client: Client, cq: CallbackQuery):
     }
 
     # ✅ Save submission in DB
-    database.save_submission(data)
+    await database.save_submission(data)
 
     ref_id = hex(hash(f"{user_id}{channel.id}{datetime.utcnow()}"))[2:12]
 
@@ -201,12 +204,17 @@ async def cb_admin_action(client: Client, cq: CallbackQuery):
         return await cq.answer("❌ Not authorized.", show_alert=True)
 
     status = "APPROVED" if action == "approve" else "DENIED"
-    database.update_status(channel_id, status)
+    await database.update_status(channel_id, status)
 
     await cq.message.edit_text(f"Channel <code>{channel_id}</code> has been {status}.", parse_mode=ParseMode.HTML)
 
-    # Notify owner
-    ch = database.get_channel_by_id(channel_id)
+    # Notify owner (behind interactive replies in the outbound scheduler)
+    with priority(NORMAL):
+        await notify_decision(client, cq, channel_id, action, status)
+
+async def notify_decision(client: Client, cq: CallbackQuery, channel_id: int, action: str, status: str):
+    """Tell the channel owner (and the other admins, on approval) about an approve/deny"""
+    ch = await database.get_channel_by_id(channel_id)
     if ch:
         owner_id = ch["user_id"]
         try:
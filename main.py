@@ -1,12 +1,15 @@
 # main.py
-from pyrogram import Client
+from pyrogram import idle
 import config
 import logging
 import database  # MongoDB connection
 from handlers.autocrossdel import promo_cleanup_worker  # Import the worker
+from handlers.campaigns import start_campaign_workers
+from handlers.schedules import schedule_runner
 import asyncio
 from http.server import BaseHTTPRequestHandler, HTTPServer
 import threading
+from utils.outbound import ScheduledClient
 
 # Setup logging
 logging.basicConfig(
@@ -29,7 +32,7 @@ def run_health_server():
     server.serve_forever()
 
 # Create Pyrogram Client
-app = Client(
+app = ScheduledClient(
     "PromoFatherBot",
     api_id=config.API_ID,
     api_hash=config.API_HASH,
@@ -39,6 +42,9 @@ app = Client(
 
 async def main():
     try:
+        # Create collections and indexes once, before any handler runs
+        await database.init_db()
+
         LOGGER.info("🤖 Starting bot...")
         await app.start()
         
@@ -47,6 +53,15 @@ async def main():
         LOGGER.info(f"✅ Bot started successfully: @{me.username} (ID: {me.id})")
         LOGGER.info("📡 Bot is now listening for messages...")
 
+        # Start the write-behind flusher for /start user upserts
+        asyncio.create_task(database.user_flush_worker())
+
+        # Resume interrupted campaigns and start posting queued jobs
+        await start_campaign_workers(app)
+
+        # One timer for all scheduled and recurring campaigns
+        asyncio.create_task(schedule_runner(app))
+
         # Start the auto-delete worker
         if config.AUTO_DELETE_ENABLED:
             asyncio.create_task(promo_cleanup_worker(app))
@@ -54,12 +69,18 @@ async def main():
         else:
             LOGGER.info("⏸️ Auto-delete is disabled in config")
 
-        # Keep the bot running
-        await asyncio.Event().wait()
+        # Keep the bot running until SIGINT/SIGTERM
+        await idle()
         
     except Exception as e:
         LOGGER.error(f"❌ Error in main: {e}", exc_info=True)
         raise
+    finally:
+        # Don't lose buffered user upserts on shutdown
+        flushed = await database.flush_users()
+        LOGGER.info(f"💾 Flushed {flushed} buffered users before exit")
+        if app.is_connected:
+            await app.stop()
 
 if __name__ == "__main__":
     LOGGER.info("🚀 Initializing application...")
@@ -0,0 +1,44 @@
+# storage/__init__.py
+from storage.base import StorageBackend
+
+_mongo_client = None
+
+def get_mongo_client():
+    """Return the process-wide Motor client, or None when MONGO_DB_URI is not set"""
+    global _mongo_client
+    import config
+    if not config.MONGO_DB_URI:
+        return None
+    if _mongo_client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from storage.mongo import pool_listener
+        pool_listener.max_pool_size = config.MONGO_MAX_POOL_SIZE
+        options = {
+            "maxPoolSize": config.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": config.MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": config.MONGO_MAX_IDLE_TIME_MS,
+            "connectTimeoutMS": config.MONGO_CONNECT_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "waitQueueTimeoutMS": config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "appname": config.BOT_NAME,
+            "event_listeners": [pool_listener],
+        }
+        if config.MONGO_COMPRESSORS:
+            options["compressors"] = config.MONGO_COMPRESSORS
+        _mongo_client = AsyncIOMotorClient(config.MONGO_DB_URI, **options)
+    return _mongo_client
+
+def create_backend() -> StorageBackend:
+    """Build the backend selected by config.STORAGE_BACKEND"""
+    import config
+    if config.STORAGE_BACKEND == "mongo":
+        from storage.mongo import MongoBackend
+        print(f"[DB] Connected to MongoDB: {config.MONGO_DB_NAME}")
+        return MongoBackend(get_mongo_client(), config.MONGO_DB_NAME)
+    if config.STORAGE_BACKEND == "sqlite":
+        from storage.sqlite import SQLiteBackend
+        print(f"[DB] Using SQLite: {config.SQLITE_PATH}")
+        return SQLiteBackend(config.SQLITE_PATH)
+    from storage.memory import MemoryBackend
+    print("[DB] Warning: no persistent storage configured. Using in-memory store.")
+    return MemoryBackend()
@@ -0,0 +1,230 @@
+# storage/base.py
+
+class StorageBackend:
+    """Operations every storage backend implements.
+
+    database.py is the only caller: it owns caching, ban sets and write-behind
+    buffering, and delegates the actual reads/writes to one of these backends.
+    Documents are plain dicts shaped like the Mongo documents.
+    """
+
+    name = "base"
+
+    async def init(self):
+        """Create tables/collections and indexes (called once at startup)"""
+        raise NotImplementedError
+
+    # ---- users ----
+    async def upsert_users(self, users: dict):
+        """Insert or update many users at once ({user_id: username})"""
+        raise NotImplementedError
+
+    async def user_exists(self, user_id: int):
+        raise NotImplementedError
+
+    async def all_users(self):
+        raise NotImplementedError
+
+    async def users_page(self, page: int, per_page: int):
+        """Return (users on this page, total users)"""
+        raise NotImplementedError
+
+    # ---- channels (submissions) ----
+    async def save_channel(self, doc: dict):
+        """Insert or replace a channel document keyed by channel_id"""
+        raise NotImplementedError
+
+    async def set_channel_status(self, channel_id: int, status: str, updated_at):
+        """Return True if the channel exists and was updated"""
+        raise NotImplementedError
+
+    async def get_channel(self, channel_id: int):
+        raise NotImplementedError
+
+    async def get_channels(self, channel_ids: list):
+        """Channels for the given ids, in any order (missing ids skipped)"""
+        raise NotImplementedError
+
+    async def user_channels(self, user_id: int, status=None):
+        """A user's channels, newest first"""
+        raise NotImplementedError
+
+    async def user_channels_page(self, user_id: int, status, page: int, per_page: int):
+        """Return (user's channels on this page, newest first, total matching)"""
+        raise NotImplementedError
+
+    async def count_user_channels(self, user_id: int):
+        raise NotImplementedError
+
+    async def remove_channel(self, user_id: int, channel_id: int):
+        """Return True if the user's channel existed and was removed"""
+        raise NotImplementedError
+
+    async def channels_in_range(self, category: str, low, high, exclude_ids):
+        """Approved channels in a category with low <= subs_count < high (either bound may be None)"""
+        raise NotImplementedError
+
+    async def approved_channels(self, exclude_ids):
+        """Every approved channel as {channel_id, title, username, category, subs_count}, in no particular order"""
+        raise NotImplementedError
+
+    async def all_channels(self):
+        raise NotImplementedError
+
+    async def channels_page(self, page: int, per_page: int):
+        """Return (channels on this page, total channels)"""
+        raise NotImplementedError
+
+    async def counts(self):
+        """Return ({status: channel count}, users, banned users, banned channels)"""
+        raise NotImplementedError
+
+    # ---- promos ----
+    async def get_promo(self, promo_id: str):
+        raise NotImplementedError
+
+    async def promos_page(self, page: int, per_page: int):
+        """Return (promos on this page, total promos)"""
+        raise NotImplementedError
+
+    async def due_promos(self, now, limit: int):
+        """Up to `limit` promos with expires_at <= now, soonest first"""
+        raise NotImplementedError
+
+    async def insert_promos(self, docs: list):
+        """Insert many promo documents in one round trip"""
+        raise NotImplementedError
+
+    async def remove_promo(self, channel, message_id: int):
+        raise NotImplementedError
+
+    # ---- campaigns ----
+    async def insert_campaign(self, doc: dict):
+        raise NotImplementedError
+
+    async def get_campaign(self, campaign_id: str):
+        raise NotImplementedError
+
+    async def campaign_promos(self, campaign_id: str):
+        """All promo documents posted by a campaign"""
+        raise NotImplementedError
+
+    async def update_campaign(self, campaign_id: str, fields: dict):
+        raise NotImplementedError
+
+    async def finish_campaign(self, campaign_id: str, fields: dict):
+        """Move a running campaign to done with `fields`; return False if it was not running"""
+        raise NotImplementedError
+
+    async def running_campaigns(self):
+        raise NotImplementedError
+
+    async def remove_campaign_promos(self, campaign_id: str, channels: list):
+        """Delete a campaign's promo documents in the given channels; return how many were removed"""
+        raise NotImplementedError
+
+    async def remove_campaign(self, campaign_id: str):
+        """Delete a campaign with its promo and job documents; return how many promos were removed"""
+        raise NotImplementedError
+
+    async def campaigns_page(self, page: int, per_page: int):
+        """Return (campaigns on this page, newest first, total campaigns)"""
+        raise NotImplementedError
+
+    # ---- campaign jobs (one per channel) ----
+    async def insert_jobs(self, docs: list):
+        raise NotImplementedError
+
+    async def claim_job(self, now):
+        """Atomically take the oldest pending job due by `now`: mark it sending, count the attempt, return it"""
+        raise NotImplementedError
+
+    async def update_job(self, job_id: str, fields: dict):
+        raise NotImplementedError
+
+    async def settle_job(self, job_id: str, campaign_id: str, fields: dict):
+        """Apply a final outcome to a job still in sending and decrement its campaign's open_jobs.
+
+        Return the campaign's open_jobs afterwards, or None if the job was not in
+        sending (settled or requeued meanwhile) or the campaign no longer exists.
+        """
+        raise NotImplementedError
+
+    async def requeue_jobs(self, status: str, stale_before):
+        """Put jobs in `status` last updated before `stale_before` back to pending; return how many"""
+        raise NotImplementedError
+
+    async def job_counts(self, campaign_id: str):
+        """Return {status: job count} for a campaign"""
+        raise NotImplementedError
+
+    async def campaign_jobs(self, campaign_id: str, status=None):
+        raise NotImplementedError
+
+    # ---- scheduled and recurring campaigns ----
+    async def insert_schedule(self, doc: dict):
+        raise NotImplementedError
+
+    async def get_schedule(self, schedule_id: str):
+        raise NotImplementedError
+
+    async def update_schedule(self, schedule_id: str, fields: dict):
+        raise NotImplementedError
+
+    async def remove_schedule(self, schedule_id: str):
+        """Delete a schedule; return False if it did not exist"""
+        raise NotImplementedError
+
+    async def active_schedules(self):
+        """Active schedules, soonest next_run first"""
+        raise NotImplementedError
+
+    async def next_schedule_run(self):
+        """Earliest next_run of any active schedule, or None"""
+        raise NotImplementedError
+
+    async def due_schedules(self, now):
+        """Active schedules with next_run <= now, soonest first"""
+        raise NotImplementedError
+
+    # ---- channel exposure (how often each channel was featured) ----
+    async def record_exposure(self, channel_ids: list, featured_at):
+        """Add one appearance to each channel and set its last_featured_at"""
+        raise NotImplementedError
+
+    async def get_exposure(self, channel_ids: list):
+        """Return {channel_id: {channel_id, appearances, last_featured_at}} for channels featured before"""
+        raise NotImplementedError
+
+    # ---- media file_id cache ----
+    async def get_media(self, key: str):
+        """Cached upload for an asset ({key, url, media_type, file_id, updated_at}) or None"""
+        raise NotImplementedError
+
+    async def save_media(self, doc: dict):
+        """Insert or replace a cached upload keyed by key"""
+        raise NotImplementedError
+
+    async def remove_media(self, key: str):
+        raise NotImplementedError
+
+    # ---- bans ----
+    async def ban_user(self, user_id: int, banned_at):
+        raise NotImplementedError
+
+    async def unban_user(self, user_id: int):
+        raise NotImplementedError
+
+    async def banned_users(self):
+        """All banned-user documents ({user_id, banned_at})"""
+        raise NotImplementedError
+
+    async def ban_channel(self, channel_id: int, banned_at):
+        raise NotImplementedError
+
+    async def unban_channel(self, channel_id: int):
+        raise NotImplementedError
+
+    async def banned_channels(self):
+        """All banned-channel documents ({channel_id, banned_at})"""
+        raise NotImplementedError
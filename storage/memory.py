@@ -0,0 +1,342 @@
+# storage/memory.py
+import heapq
+from datetime import datetime
+from itertools import islice
+
+from storage.base import StorageBackend
+
+def _page(docs, page: int, per_page: int, total: int):
+    start = page * per_page
+    return list(islice(docs, start, start + per_page)), total
+
+class MemoryBackend(StorageBackend):
+    """Hash-indexed in-memory store (dev / load tests); nothing survives a restart"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.users = {}                 # user_id -> user doc
+        self.submissions = {}           # channel_id -> channel doc
+        self.by_user = {}               # user_id -> {channel_id: channel doc}
+        self.by_category_status = {}    # (category, status) -> {channel_id: channel doc}
+        self.promos = {}                # promo_id -> promo doc
+        self.promo_keys = {}            # (channel, message_id) -> promo_id
+        self.promo_expiry = []          # heap of (expires_at, promo_id); stale entries skipped lazily
+        self.campaigns = {}             # campaign_id -> campaign doc (ids are time-sortable, so oldest first)
+        self.campaign_posts = {}        # campaign_id -> {promo_id: promo doc}
+        self.jobs = {}                  # job_id -> job doc
+        self.job_queue = []             # heap of (not_before, job_id) for pending jobs; stale entries skipped lazily
+        self.jobs_by_campaign = {}      # campaign_id -> {job_id: job doc}
+        self.schedules = {}             # schedule_id -> schedule doc
+        self.exposure = {}              # channel_id -> exposure doc
+        self.media = {}                 # asset key -> cached upload doc
+        self.banned_user_docs = {}      # user_id -> ban doc
+        self.banned_channel_docs = {}   # channel_id -> ban doc
+
+    async def init(self):
+        pass
+
+    # ---- index maintenance ----
+    def _index(self, ch):
+        self.by_user.setdefault(ch.get("user_id"), {})[ch["channel_id"]] = ch
+        self.by_category_status.setdefault((ch.get("category"), ch.get("status")), {})[ch["channel_id"]] = ch
+
+    def _unindex(self, ch):
+        self.by_user.get(ch.get("user_id"), {}).pop(ch["channel_id"], None)
+        self.by_category_status.get((ch.get("category"), ch.get("status")), {}).pop(ch["channel_id"], None)
+
+    # ---- users ----
+    async def upsert_users(self, users: dict):
+        for user_id, username in users.items():
+            self.users[user_id] = {"user_id": user_id, "username": username}
+
+    async def user_exists(self, user_id: int):
+        return user_id in self.users
+
+    async def all_users(self):
+        return list(self.users.values())
+
+    async def users_page(self, page: int, per_page: int):
+        return _page(self.users.values(), page, per_page, len(self.users))
+
+    # ---- channels ----
+    async def save_channel(self, doc: dict):
+        old = self.submissions.pop(doc["channel_id"], None)
+        if old is not None:
+            self._unindex(old)
+        self.submissions[doc["channel_id"]] = doc
+        self._index(doc)
+
+    async def set_channel_status(self, channel_id: int, status: str, updated_at):
+        ch = self.submissions.get(channel_id)
+        if ch is None:
+            return False
+        self._unindex(ch)
+        ch["status"] = status
+        ch["updated_at"] = updated_at
+        self._index(ch)
+        return True
+
+    async def get_channel(self, channel_id: int):
+        return self.submissions.get(channel_id)
+
+    async def get_channels(self, channel_ids: list):
+        return [self.submissions[cid] for cid in channel_ids if cid in self.submissions]
+
+    async def user_channels(self, user_id: int, status=None):
+        channels = [
+            ch for ch in self.by_user.get(user_id, {}).values()
+            if not status or ch.get("status") == status
+        ]
+        channels.sort(key=lambda ch: ch.get("added_at") or datetime.min, reverse=True)
+        return channels
+
+    async def user_channels_page(self, user_id: int, status, page: int, per_page: int):
+        channels = await self.user_channels(user_id, status)
+        return _page(channels, page, per_page, len(channels))
+
+    async def count_user_channels(self, user_id: int):
+        return len(self.by_user.get(user_id, {}))
+
+    async def remove_channel(self, user_id: int, channel_id: int):
+        if channel_id not in self.by_user.get(user_id, {}):
+            return False
+        self._unindex(self.submissions.pop(channel_id))
+        return True
+
+    async def channels_in_range(self, category: str, low, high, exclude_ids):
+        channels = []
+        for cid, ch in self.by_category_status.get((category, "APPROVED"), {}).items():
+            subs = ch.get("subs_count", 0)
+            if cid in exclude_ids or (low is not None and subs < low) or (high is not None and subs >= high):
+                continue
+            channels.append(ch)
+        return channels
+
+    async def approved_channels(self, exclude_ids):
+        return [
+            ch
+            for (_, status), bucket in self.by_category_status.items() if status == "APPROVED"
+            for cid, ch in bucket.items() if cid not in exclude_ids
+        ]
+
+    async def all_channels(self):
+        return list(self.submissions.values())
+
+    async def channels_page(self, page: int, per_page: int):
+        return _page(self.submissions.values(), page, per_page, len(self.submissions))
+
+    async def counts(self):
+        by_status = {}
+        for (_, status), bucket in self.by_category_status.items():
+            by_status[status] = by_status.get(status, 0) + len(bucket)
+        return by_status, len(self.users), len(self.banned_user_docs), len(self.banned_channel_docs)
+
+    # ---- promos ----
+    def _insert_promo(self, doc: dict):
+        self.promos[doc["promo_id"]] = doc
+        self.promo_keys[(doc["channel"], doc["message_id"])] = doc["promo_id"]
+        heapq.heappush(self.promo_expiry, (doc["expires_at"], doc["promo_id"]))
+        if doc.get("campaign_id"):
+            self.campaign_posts.setdefault(doc["campaign_id"], {})[doc["promo_id"]] = doc
+
+    async def insert_promos(self, docs: list):
+        for doc in docs:
+            self._insert_promo(doc)
+
+    async def get_promo(self, promo_id: str):
+        return self.promos.get(promo_id)
+
+    async def promos_page(self, page: int, per_page: int):
+        return _page(self.promos.values(), page, per_page, len(self.promos))
+
+    async def due_promos(self, now, limit: int):
+        # Pop due entries off the heap in O(k log n), then push the live ones back:
+        # they stay due until remove_promo deletes them.
+        due = []
+        taken = []
+        heap = self.promo_expiry
+        while heap and heap[0][0] <= now and len(due) < limit:
+            entry = heapq.heappop(heap)
+            promo = self.promos.get(entry[1])
+            if promo is None or promo["expires_at"] != entry[0]:
+                continue  # removed or re-saved since it was pushed
+            due.append(promo)
+            taken.append(entry)
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return due
+
+    async def remove_promo(self, channel, message_id: int):
+        promo_id = self.promo_keys.pop((channel, message_id), None)
+        promo = self.promos.pop(promo_id, None) if promo_id else None
+        if promo and promo.get("campaign_id"):
+            self.campaign_posts.get(promo["campaign_id"], {}).pop(promo_id, None)
+
+    # ---- campaigns ----
+    async def insert_campaign(self, doc: dict):
+        self.campaigns[doc["campaign_id"]] = doc
+
+    async def get_campaign(self, campaign_id: str):
+        return self.campaigns.get(campaign_id)
+
+    async def campaign_promos(self, campaign_id: str):
+        return list(self.campaign_posts.get(campaign_id, {}).values())
+
+    async def update_campaign(self, campaign_id: str, fields: dict):
+        if campaign_id in self.campaigns:
+            self.campaigns[campaign_id].update(fields)
+
+    async def finish_campaign(self, campaign_id: str, fields: dict):
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is None or campaign.get("status") != "running":
+            return False
+        campaign.update(fields, status="done")
+        return True
+
+    async def running_campaigns(self):
+        return [c for c in self.campaigns.values() if c.get("status") == "running"]
+
+    async def remove_campaign_promos(self, campaign_id: str, channels: list):
+        channels = set(channels)
+        posts = self.campaign_posts.get(campaign_id, {})
+        removed = [promo for promo in posts.values() if promo["channel"] in channels]
+        for promo in removed:
+            posts.pop(promo["promo_id"], None)
+            self.promos.pop(promo["promo_id"], None)
+            self.promo_keys.pop((promo["channel"], promo["message_id"]), None)
+        return len(removed)
+
+    async def remove_campaign(self, campaign_id: str):
+        self.campaigns.pop(campaign_id, None)
+        for job_id in self.jobs_by_campaign.pop(campaign_id, {}):
+            self.jobs.pop(job_id, None)  # its queue entries are skipped once the job is gone
+        posts = self.campaign_posts.pop(campaign_id, {})
+        for promo in posts.values():
+            self.promos.pop(promo["promo_id"], None)
+            self.promo_keys.pop((promo["channel"], promo["message_id"]), None)
+        return len(posts)
+
+    async def campaigns_page(self, page: int, per_page: int):
+        return _page(reversed(self.campaigns.values()), page, per_page, len(self.campaigns))
+
+    # ---- campaign jobs ----
+    async def insert_jobs(self, docs: list):
+        for doc in docs:
+            self.jobs[doc["job_id"]] = doc
+            self.jobs_by_campaign.setdefault(doc["campaign_id"], {})[doc["job_id"]] = doc
+            if doc["status"] == "pending":
+                heapq.heappush(self.job_queue, (doc["not_before"], doc["job_id"]))
+
+    async def claim_job(self, now):
+        # Soonest due first, like the (not_before, job_id) sort of the other backends;
+        # entries of jobs claimed, rescheduled or removed since they were pushed are dropped here
+        heap = self.job_queue
+        while heap and heap[0][0] <= now:
+            not_before, job_id = heapq.heappop(heap)
+            job = self.jobs.get(job_id)
+            if job is None or job["status"] != "pending" or job["not_before"] != not_before:
+                continue
+            job.update(status="sending", attempts=job["attempts"] + 1, updated_at=now)
+            return dict(job)
+        return None
+
+    async def update_job(self, job_id: str, fields: dict):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        job.update(fields)
+        if job["status"] == "pending":
+            heapq.heappush(self.job_queue, (job["not_before"], job_id))
+
+    async def settle_job(self, job_id: str, campaign_id: str, fields: dict):
+        job = self.jobs.get(job_id)
+        if job is None or job["status"] != "sending":
+            return None
+        job.update(fields)
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is None:
+            return None
+        campaign["open_jobs"] -= 1
+        return campaign["open_jobs"]
+
+    async def requeue_jobs(self, status: str, stale_before):
+        stalled = [job for job in self.jobs.values() if job["status"] == status and job["updated_at"] < stale_before]
+        for job in stalled:
+            await self.update_job(job["job_id"], {"status": "pending"})
+        return len(stalled)
+
+    async def job_counts(self, campaign_id: str):
+        counts = {}
+        for job in self.jobs_by_campaign.get(campaign_id, {}).values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+    async def campaign_jobs(self, campaign_id: str, status=None):
+        return [
+            dict(job) for job in self.jobs_by_campaign.get(campaign_id, {}).values()
+            if not status or job["status"] == status
+        ]
+
+    # ---- scheduled and recurring campaigns ----
+    async def insert_schedule(self, doc: dict):
+        self.schedules[doc["schedule_id"]] = doc
+
+    async def get_schedule(self, schedule_id: str):
+        return self.schedules.get(schedule_id)
+
+    async def update_schedule(self, schedule_id: str, fields: dict):
+        if schedule_id in self.schedules:
+            self.schedules[schedule_id].update(fields)
+
+    async def remove_schedule(self, schedule_id: str):
+        return self.schedules.pop(schedule_id, None) is not None
+
+    async def active_schedules(self):
+        active = [s for s in self.schedules.values() if s["status"] == "active"]
+        return sorted(active, key=lambda s: s["next_run"])
+
+    async def next_schedule_run(self):
+        return min((s["next_run"] for s in self.schedules.values() if s["status"] == "active"), default=None)
+
+    async def due_schedules(self, now):
+        return [s for s in await self.active_schedules() if s["next_run"] <= now]
+
+    # ---- channel exposure ----
+    async def record_exposure(self, channel_ids: list, featured_at):
+        for cid in channel_ids:
+            doc = self.exposure.setdefault(cid, {"channel_id": cid, "appearances": 0, "last_featured_at": None})
+            doc["appearances"] += 1
+            doc["last_featured_at"] = featured_at
+
+    async def get_exposure(self, channel_ids: list):
+        return {cid: self.exposure[cid] for cid in channel_ids if cid in self.exposure}
+
+    # ---- media file_id cache ----
+    async def get_media(self, key: str):
+        return self.media.get(key)
+
+    async def save_media(self, doc: dict):
+        self.media[doc["key"]] = doc
+
+    async def remove_media(self, key: str):
+        self.media.pop(key, None)
+
+    # ---- bans ----
+    async def ban_user(self, user_id: int, banned_at):
+        self.banned_user_docs[user_id] = {"user_id": user_id, "banned_at": banned_at}
+
+    async def unban_user(self, user_id: int):
+        self.banned_user_docs.pop(user_id, None)
+
+    async def banned_users(self):
+        return list(self.banned_user_docs.values())
+
+    async def ban_channel(self, channel_id: int, banned_at):
+        self.banned_channel_docs[channel_id] = {"channel_id": channel_id, "banned_at": banned_at}
+
+    async def unban_channel(self, channel_id: int):
+        self.banned_channel_docs.pop(channel_id, None)
+
+    async def banned_channels(self):
+        return list(self.banned_channel_docs.values())
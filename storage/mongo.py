@@ -0,0 +1,449 @@
+# storage/mongo.py
+import asyncio
+import threading
+import time
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument, UpdateOne, monitoring
+from pymongo.errors import OperationFailure
+
+from storage.base import StorageBackend
+
+# -----------------------------
+# Connection pool statistics
+# -----------------------------
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts pool usage so MONGO_MAX_POOL_SIZE can be sized under load"""
+
+    def __init__(self, max_pool_size: int = 0):
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Motor checks out on its worker threads
+        self.max_pool_size = max_pool_size
+        self.open = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        waited = time.perf_counter() - getattr(self._local, "started", time.perf_counter())
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "max_pool_size": self.max_pool_size,
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                "max_wait_ms": self.wait_max * 1000,
+            }
+
+pool_listener = PoolStatsListener()
+
+# -----------------------------
+# Schema
+# -----------------------------
+INDEXES = {
+    "users": [IndexModel([("user_id", ASCENDING)], unique=True)],
+    "submissions": [
+        IndexModel([("channel_id", ASCENDING)], unique=True),
+        IndexModel([("category", ASCENDING), ("status", ASCENDING), ("subs_count", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("added_at", DESCENDING)]),
+    ],
+    "promos": [
+        IndexModel([("promo_id", ASCENDING)], unique=True),
+        IndexModel([("channel", ASCENDING), ("message_id", ASCENDING)]),
+        IndexModel([("expires_at", ASCENDING)]),
+        IndexModel([("campaign_id", ASCENDING)]),
+    ],
+    "campaigns": [
+        IndexModel([("campaign_id", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING)]),
+    ],
+    "jobs": [
+        IndexModel([("job_id", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING), ("not_before", ASCENDING), ("job_id", ASCENDING)]),
+        IndexModel([("campaign_id", ASCENDING), ("status", ASCENDING)]),
+    ],
+    "schedules": [
+        IndexModel([("schedule_id", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING), ("next_run", ASCENDING)]),
+    ],
+    "exposure": [IndexModel([("channel_id", ASCENDING)], unique=True)],
+    "media_cache": [IndexModel([("key", ASCENDING)], unique=True)],
+    "banned_users": [IndexModel([("user_id", ASCENDING)], unique=True)],
+    "banned_channels": [IndexModel([("channel_id", ASCENDING)], unique=True)],
+}
+
+USER_LIST_FIELDS = {"_id": 0, "user_id": 1, "username": 1}
+CHANNEL_LIST_FIELDS = {"_id": 0, "channel_id": 1, "title": 1, "username": 1, "status": 1, "subs_count": 1}
+USER_CHANNEL_FIELDS = {
+    "_id": 0, "channel_id": 1, "title": 1, "username": 1, "category": 1,
+    "subs_count": 1, "subs_range": 1, "status": 1, "added_at": 1
+}
+RANGE_LIST_FIELDS = {"_id": 0, "channel_id": 1, "title": 1, "username": 1, "subs_count": 1}
+GROUPING_FIELDS = {"_id": 0, "channel_id": 1, "title": 1, "username": 1, "category": 1, "subs_count": 1}
+PROMO_CHANNEL_FIELDS = {"_id": 0, "channel_id": 1, "username": 1, "title": 1, "subs_count": 1}
+PROMO_LIST_FIELDS = {"_id": 0, "promo_id": 1, "channel": 1, "message_id": 1, "duration": 1, "created_at": 1, "expires_at": 1}
+
+async def _page(collection, query: dict, page: int, per_page: int, projection: dict, sort):
+    """Fetch one skip/limit page plus a cheap total count, concurrently"""
+    cursor = collection.find(query, projection).sort(sort).skip(page * per_page).limit(per_page)
+    count = collection.count_documents(query) if query else collection.estimated_document_count()
+    return tuple(await asyncio.gather(cursor.to_list(length=per_page), count))
+
+class MongoBackend(StorageBackend):
+    """MongoDB through a shared Motor client"""
+
+    name = "mongo"
+
+    def __init__(self, client, db_name: str):
+        self.client = client
+        self.db = client[db_name]
+
+    async def init(self):
+        db = self.db
+        existing = set(await db.list_collection_names())
+        for name, indexes in INDEXES.items():
+            if name not in existing:
+                await db.create_collection(name)
+            try:
+                await db[name].create_indexes(indexes)
+            except OperationFailure as e:
+                # e.g. duplicate keys left over from before the unique index existed
+                print(f"[DB] Warning: could not create indexes on {name}: {e}")
+        # Promos saved before expires_at existed get it computed server-side
+        result = await db.promos.update_many(
+            {"expires_at": {"$exists": False}},
+            [{"$set": {"expires_at": {"$add": [{"$toDate": "$created_at"}, {"$multiply": ["$duration", 1000]}]}}}]
+        )
+        if result.modified_count:
+            print(f"[DB] Backfilled expires_at on {result.modified_count} promos")
+        print("[DB] Collections and indexes are ready")
+
+    # ---- users ----
+    async def upsert_users(self, users: dict):
+        await self.db.users.bulk_write(
+            [
+                UpdateOne(
+                    {"user_id": user_id},
+                    {"$set": {"user_id": user_id, "username": username}},
+                    upsert=True
+                )
+                for user_id, username in users.items()
+            ],
+            ordered=False
+        )
+
+    async def user_exists(self, user_id: int):
+        return await self.db.users.count_documents({"user_id": user_id}, limit=1) > 0
+
+    async def all_users(self):
+        return await self.db.users.find({}, {"_id": 0}).to_list(length=None)
+
+    async def users_page(self, page: int, per_page: int):
+        return await _page(self.db.users, {}, page, per_page, USER_LIST_FIELDS, [("_id", ASCENDING)])
+
+    # ---- channels ----
+    async def save_channel(self, doc: dict):
+        # channel_id is unique, so a resubmission replaces the old entry
+        await self.db.submissions.replace_one({"channel_id": doc["channel_id"]}, doc, upsert=True)
+
+    async def set_channel_status(self, channel_id: int, status: str, updated_at):
+        result = await self.db.submissions.update_one(
+            {"channel_id": channel_id},
+            {"$set": {"status": status, "updated_at": updated_at}}
+        )
+        return result.modified_count > 0
+
+    async def get_channel(self, channel_id: int):
+        return await self.db.submissions.find_one({"channel_id": channel_id})
+
+    async def get_channels(self, channel_ids: list):
+        return await self.db.submissions.find(
+            {"channel_id": {"$in": channel_ids}}, PROMO_CHANNEL_FIELDS
+        ).to_list(length=None)
+
+    async def user_channels(self, user_id: int, status=None):
+        query = {"user_id": user_id}
+        if status:
+            query["status"] = status
+        return await self.db.submissions.find(query).sort("added_at", DESCENDING).to_list(length=None)
+
+    async def user_channels_page(self, user_id: int, status, page: int, per_page: int):
+        query = {"user_id": user_id}
+        if status:
+            query["status"] = status
+        return await _page(self.db.submissions, query, page, per_page, USER_CHANNEL_FIELDS, [("added_at", DESCENDING)])
+
+    async def count_user_channels(self, user_id: int):
+        return await self.db.submissions.count_documents({"user_id": user_id})
+
+    async def remove_channel(self, user_id: int, channel_id: int):
+        result = await self.db.submissions.delete_one({"user_id": user_id, "channel_id": channel_id})
+        return result.deleted_count > 0
+
+    async def channels_in_range(self, category: str, low, high, exclude_ids):
+        # Served by the (category, status, subs_count) index
+        query = {"category": category, "status": "APPROVED"}
+        subs_count = {}
+        if low is not None:
+            subs_count["$gte"] = low
+        if high is not None:
+            subs_count["$lt"] = high
+        if subs_count:
+            query["subs_count"] = subs_count
+        if exclude_ids:
+            query["channel_id"] = {"$nin": list(exclude_ids)}
+        return await self.db.submissions.find(query, RANGE_LIST_FIELDS).sort("subs_count", ASCENDING).to_list(length=None)
+
+    async def approved_channels(self, exclude_ids):
+        query = {"status": "APPROVED"}
+        if exclude_ids:
+            query["channel_id"] = {"$nin": list(exclude_ids)}
+        return await self.db.submissions.find(query, GROUPING_FIELDS).batch_size(5000).to_list(length=None)
+
+    async def all_channels(self):
+        return await self.db.submissions.find({}, {"_id": 0}).to_list(length=None)
+
+    async def channels_page(self, page: int, per_page: int):
+        return await _page(self.db.submissions, {}, page, per_page, CHANNEL_LIST_FIELDS, [("_id", ASCENDING)])
+
+    async def counts(self):
+        db = self.db
+        status_counts, users, banned_users, banned_channels = await asyncio.gather(
+            db.submissions.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]).to_list(length=None),
+            db.users.estimated_document_count(),
+            db.banned_users.estimated_document_count(),
+            db.banned_channels.estimated_document_count(),
+        )
+        return {row["_id"]: row["count"] for row in status_counts}, users, banned_users, banned_channels
+
+    # ---- promos ----
+    async def get_promo(self, promo_id: str):
+        return await self.db.promos.find_one({"promo_id": promo_id})
+
+    async def promos_page(self, page: int, per_page: int):
+        return await _page(self.db.promos, {}, page, per_page, PROMO_LIST_FIELDS, [("_id", ASCENDING)])
+
+    async def due_promos(self, now, limit: int):
+        return await self.db.promos.find({"expires_at": {"$lte": now}}).sort("expires_at", ASCENDING).limit(limit).to_list(length=limit)
+
+    async def insert_promos(self, docs: list):
+        await self.db.promos.insert_many(docs, ordered=False)
+
+    async def remove_promo(self, channel, message_id: int):
+        await self.db.promos.delete_one({"channel": channel, "message_id": message_id})
+
+    # ---- campaigns ----
+    async def insert_campaign(self, doc: dict):
+        await self.db.campaigns.insert_one(doc)
+
+    async def get_campaign(self, campaign_id: str):
+        return await self.db.campaigns.find_one({"campaign_id": campaign_id}, {"_id": 0})
+
+    async def campaign_promos(self, campaign_id: str):
+        return await self.db.promos.find({"campaign_id": campaign_id}, {"_id": 0}).to_list(length=None)
+
+    async def update_campaign(self, campaign_id: str, fields: dict):
+        await self.db.campaigns.update_one({"campaign_id": campaign_id}, {"$set": fields})
+
+    async def finish_campaign(self, campaign_id: str, fields: dict):
+        result = await self.db.campaigns.update_one(
+            {"campaign_id": campaign_id, "status": "running"},
+            {"$set": dict(fields, status="done")}
+        )
+        return result.modified_count > 0
+
+    async def running_campaigns(self):
+        return await self.db.campaigns.find({"status": "running"}, {"_id": 0}).to_list(length=None)
+
+    async def remove_campaign_promos(self, campaign_id: str, channels: list):
+        result = await self.db.promos.delete_many({"campaign_id": campaign_id, "channel": {"$in": channels}})
+        return result.deleted_count
+
+    async def remove_campaign(self, campaign_id: str):
+        promos, _, _ = await asyncio.gather(
+            self.db.promos.delete_many({"campaign_id": campaign_id}),
+            self.db.jobs.delete_many({"campaign_id": campaign_id}),
+            self.db.campaigns.delete_one({"campaign_id": campaign_id}),
+        )
+        return promos.deleted_count
+
+    async def campaigns_page(self, page: int, per_page: int):
+        # campaign_id is time-sortable, so its unique index doubles as the recency index
+        return await _page(self.db.campaigns, {}, page, per_page, {"_id": 0}, [("campaign_id", DESCENDING)])
+
+    # ---- campaign jobs ----
+    async def insert_jobs(self, docs: list):
+        await self.db.jobs.insert_many(docs, ordered=False)
+
+    async def claim_job(self, now):
+        # find_one_and_update is atomic, so any number of workers (or processes) can claim safely
+        return await self.db.jobs.find_one_and_update(
+            {"status": "pending", "not_before": {"$lte": now}},
+            {"$set": {"status": "sending", "updated_at": now}, "$inc": {"attempts": 1}},
+            sort=[("not_before", ASCENDING), ("job_id", ASCENDING)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def update_job(self, job_id: str, fields: dict):
+        await self.db.jobs.update_one({"job_id": job_id}, {"$set": fields})
+
+    async def settle_job(self, job_id: str, campaign_id: str, fields: dict):
+        result = await self.db.jobs.update_one({"job_id": job_id, "status": "sending"}, {"$set": fields})
+        if not result.modified_count:
+            return None
+        campaign = await self.db.campaigns.find_one_and_update(
+            {"campaign_id": campaign_id},
+            {"$inc": {"open_jobs": -1}},
+            projection={"_id": 0, "open_jobs": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        return campaign["open_jobs"] if campaign else None
+
+    async def requeue_jobs(self, status: str, stale_before):
+        result = await self.db.jobs.update_many(
+            {"status": status, "updated_at": {"$lt": stale_before}}, {"$set": {"status": "pending"}}
+        )
+        return result.modified_count
+
+    async def job_counts(self, campaign_id: str):
+        rows = await self.db.jobs.aggregate([
+            {"$match": {"campaign_id": campaign_id}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]).to_list(length=None)
+        return {row["_id"]: row["count"] for row in rows}
+
+    async def campaign_jobs(self, campaign_id: str, status=None):
+        query = {"campaign_id": campaign_id}
+        if status:
+            query["status"] = status
+        return await self.db.jobs.find(query, {"_id": 0}).sort("job_id", ASCENDING).to_list(length=None)
+
+    # ---- scheduled and recurring campaigns ----
+    async def insert_schedule(self, doc: dict):
+        await self.db.schedules.insert_one(dict(doc))
+
+    async def get_schedule(self, schedule_id: str):
+        return await self.db.schedules.find_one({"schedule_id": schedule_id}, {"_id": 0})
+
+    async def update_schedule(self, schedule_id: str, fields: dict):
+        await self.db.schedules.update_one({"schedule_id": schedule_id}, {"$set": fields})
+
+    async def remove_schedule(self, schedule_id: str):
+        result = await self.db.schedules.delete_one({"schedule_id": schedule_id})
+        return result.deleted_count > 0
+
+    async def active_schedules(self):
+        return await self.db.schedules.find({"status": "active"}, {"_id": 0}).sort("next_run", ASCENDING).to_list(length=None)
+
+    async def next_schedule_run(self):
+        doc = await self.db.schedules.find_one(
+            {"status": "active"}, {"_id": 0, "next_run": 1}, sort=[("next_run", ASCENDING)]
+        )
+        return doc["next_run"] if doc else None
+
+    async def due_schedules(self, now):
+        return await self.db.schedules.find(
+            {"status": "active", "next_run": {"$lte": now}}, {"_id": 0}
+        ).sort("next_run", ASCENDING).to_list(length=None)
+
+    # ---- channel exposure ----
+    async def record_exposure(self, channel_ids: list, featured_at):
+        if not channel_ids:
+            return
+        # One round trip for the whole campaign
+        await self.db.exposure.bulk_write([
+            UpdateOne(
+                {"channel_id": cid},
+                {"$inc": {"appearances": 1}, "$set": {"last_featured_at": featured_at}},
+                upsert=True
+            )
+            for cid in channel_ids
+        ], ordered=False)
+
+    async def get_exposure(self, channel_ids: list):
+        docs = await self.db.exposure.find({"channel_id": {"$in": channel_ids}}, {"_id": 0}).to_list(length=None)
+        return {doc["channel_id"]: doc for doc in docs}
+
+    # ---- media file_id cache ----
+    async def get_media(self, key: str):
+        return await self.db.media_cache.find_one({"key": key}, {"_id": 0})
+
+    async def save_media(self, doc: dict):
+        await self.db.media_cache.replace_one({"key": doc["key"]}, doc, upsert=True)
+
+    async def remove_media(self, key: str):
+        await self.db.media_cache.delete_one({"key": key})
+
+    # ---- bans ----
+    async def ban_user(self, user_id: int, banned_at):
+        await self.db.banned_users.update_one(
+            {"user_id": user_id},
+            {"$set": {"user_id": user_id, "banned_at": banned_at}},
+            upsert=True
+        )
+
+    async def unban_user(self, user_id: int):
+        await self.db.banned_users.delete_one({"user_id": user_id})
+
+    async def banned_users(self):
+        return await self.db.banned_users.find({}, {"_id": 0}).to_list(length=None)
+
+    async def ban_channel(self, channel_id: int, banned_at):
+        await self.db.banned_channels.update_one(
+            {"channel_id": channel_id},
+            {"$set": {"channel_id": channel_id, "banned_at": banned_at}},
+            upsert=True
+        )
+
+    async def unban_channel(self, channel_id: int):
+        await self.db.banned_channels.delete_one({"channel_id": channel_id})
+
+    async def banned_channels(self):
+        return await self.db.banned_channels.find({}, {"_id": 0}).to_list(length=None)
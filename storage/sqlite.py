@@ -0,0 +1,547 @@
+# storage/sqlite.py
+import json
+import sqlite3
+from datetime import datetime
+
+from storage.base import StorageBackend
+
+# Datetimes are stored as ISO-8601 text, which sorts and compares correctly
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT
+);
+CREATE TABLE IF NOT EXISTS submissions (
+    channel_id INTEGER PRIMARY KEY,
+    user_id INTEGER,
+    username TEXT,
+    title TEXT,
+    category TEXT,
+    subs_range TEXT,
+    subs_count INTEGER,
+    status TEXT,
+    added_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS submissions_category_status_subs ON submissions (category, status, subs_count);
+CREATE INDEX IF NOT EXISTS submissions_user_status_added ON submissions (user_id, status, added_at DESC);
+CREATE TABLE IF NOT EXISTS promos (
+    promo_id TEXT PRIMARY KEY,
+    channel,
+    message_id INTEGER,
+    duration INTEGER,
+    created_at TIMESTAMP,
+    expires_at TIMESTAMP,
+    campaign_id TEXT
+);
+CREATE INDEX IF NOT EXISTS promos_channel_message ON promos (channel, message_id);
+CREATE INDEX IF NOT EXISTS promos_expires_at ON promos (expires_at);
+CREATE INDEX IF NOT EXISTS promos_campaign ON promos (campaign_id);
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign_id TEXT PRIMARY KEY,
+    admin_id INTEGER,
+    mode TEXT,
+    template TEXT,
+    category TEXT,
+    duration INTEGER,
+    post_count INTEGER,
+    failed_count INTEGER,
+    created_at TIMESTAMP,
+    expires_at TIMESTAMP,
+    status TEXT,
+    payload TEXT,
+    admin_chat_id INTEGER,
+    status_message_id INTEGER,
+    channel_count INTEGER,
+    open_jobs INTEGER,
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS campaigns_status ON campaigns (status);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    campaign_id TEXT,
+    channel_id INTEGER,
+    target,
+    title TEXT,
+    status TEXT,
+    attempts INTEGER,
+    flood_waits INTEGER,
+    not_before TIMESTAMP,
+    message_id INTEGER,
+    error TEXT,
+    sent_at TIMESTAMP,
+    updated_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS jobs_status_due ON jobs (status, not_before, job_id);
+CREATE INDEX IF NOT EXISTS jobs_campaign_status ON jobs (campaign_id, status);
+CREATE TABLE IF NOT EXISTS schedules (
+    schedule_id TEXT PRIMARY KEY,
+    admin_id INTEGER,
+    admin_chat_id INTEGER,
+    mode TEXT,
+    template TEXT,
+    category TEXT,
+    channel_ids TEXT,
+    custom_message TEXT,
+    duration INTEGER,
+    rule TEXT,
+    status TEXT,
+    next_run TIMESTAMP,
+    last_run TIMESTAMP,
+    last_campaign_id TEXT,
+    run_count INTEGER,
+    created_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS schedules_due ON schedules (status, next_run);
+CREATE TABLE IF NOT EXISTS exposure (
+    channel_id INTEGER PRIMARY KEY,
+    appearances INTEGER,
+    last_featured_at TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS media_cache (
+    key TEXT PRIMARY KEY,
+    url TEXT,
+    media_type TEXT,
+    file_id TEXT,
+    updated_at TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS banned_users (
+    user_id INTEGER PRIMARY KEY,
+    banned_at TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS banned_channels (
+    channel_id INTEGER PRIMARY KEY,
+    banned_at TIMESTAMP
+);
+"""
+
+CHANNEL_COLUMNS = ("channel_id", "user_id", "username", "title", "category", "subs_range", "subs_count", "status", "added_at", "updated_at")
+PROMO_COLUMNS = ("promo_id", "channel", "message_id", "duration", "created_at", "expires_at", "campaign_id")
+CAMPAIGN_COLUMNS = (
+    "campaign_id", "admin_id", "mode", "template", "category", "duration", "post_count", "failed_count",
+    "created_at", "expires_at", "status", "payload", "admin_chat_id", "status_message_id", "channel_count", "open_jobs", "finished_at"
+)
+SCHEDULE_COLUMNS = (
+    "schedule_id", "admin_id", "admin_chat_id", "mode", "template", "category", "channel_ids", "custom_message",
+    "duration", "rule", "status", "next_run", "last_run", "last_campaign_id", "run_count", "created_at"
+)
+JOB_COLUMNS = (
+    "job_id", "campaign_id", "channel_id", "target", "title", "status", "attempts", "flood_waits",
+    "not_before", "message_id", "error", "sent_at", "updated_at"
+)
+
+SAVE_CHANNEL = (
+    f"INSERT OR REPLACE INTO submissions ({', '.join(CHANNEL_COLUMNS)}, extra) "
+    f"VALUES ({', '.join('?' * (len(CHANNEL_COLUMNS) + 1))})"
+)
+INSERT_PROMO = f"INSERT OR REPLACE INTO promos ({', '.join(PROMO_COLUMNS)}) VALUES ({', '.join('?' * len(PROMO_COLUMNS))})"
+INSERT_CAMPAIGN = f"INSERT INTO campaigns ({', '.join(CAMPAIGN_COLUMNS)}) VALUES ({', '.join('?' * len(CAMPAIGN_COLUMNS))})"
+INSERT_SCHEDULE = f"INSERT INTO schedules ({', '.join(SCHEDULE_COLUMNS)}) VALUES ({', '.join('?' * len(SCHEDULE_COLUMNS))})"
+INSERT_JOB = f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({', '.join('?' * len(JOB_COLUMNS))})"
+
+def _row_factory(cursor, row):
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+# Columns holding dicts/lists, stored as JSON text
+JSON_COLUMNS = ("payload", "channel_ids", "custom_message")
+
+def _decode(row):
+    """Decode the JSON columns of a campaign or schedule row"""
+    if row:
+        for key in JSON_COLUMNS:
+            if row.get(key):
+                row[key] = json.loads(row[key])
+    return row
+
+def _encode(fields: dict):
+    return {key: json.dumps(value) if key in JSON_COLUMNS and value is not None else value for key, value in fields.items()}
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _json_hook(obj):
+    return datetime.fromisoformat(obj["$date"]) if obj.keys() == {"$date"} else obj
+
+def _channel(row):
+    """Merge a submission row's `extra` fields back in, so it matches the document that was saved"""
+    if row is not None:
+        extra = row.pop("extra", None)
+        if extra:
+            row.update(json.loads(extra, object_hook=_json_hook))
+    return row
+
+def _channels(rows):
+    for row in rows:
+        _channel(row)
+    return rows
+
+def _set_clause(fields: dict, columns):
+    unknown = set(fields) - set(columns)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+    return ", ".join(f"{key} = ?" for key in fields)
+
+class SQLiteBackend(StorageBackend):
+    """Single-file SQLite store for deployments without a Mongo server.
+
+    Queries run inline on the event loop: with WAL and the indexes below a
+    local lookup takes microseconds, far less than handing it to a thread.
+    Statements use fixed SQL text with ? placeholders, so sqlite3's statement
+    cache prepares each one once per connection.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(
+            path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=256,
+            check_same_thread=False,
+        )
+        self.conn.row_factory = _row_factory
+
+    async def init(self):
+        conn = self.conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable across app crashes; WAL keeps it consistent
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.executescript(SCHEMA)
+        conn.commit()
+        print(f"[DB] SQLite ready at {self.path}")
+
+    def _all(self, sql: str, params=()):
+        return self.conn.execute(sql, params).fetchall()
+
+    def _one(self, sql: str, params=()):
+        return self.conn.execute(sql, params).fetchone()
+
+    def _scalar(self, sql: str, params=()):
+        return next(iter(self._one(sql, params).values()))
+
+    def _write(self, sql: str, params=()):
+        with self.conn:
+            return self.conn.execute(sql, params).rowcount
+
+    # ---- users ----
+    async def upsert_users(self, users: dict):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO users (user_id, username) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET username = excluded.username",
+                users.items()
+            )
+
+    async def user_exists(self, user_id: int):
+        return self._one("SELECT 1 AS found FROM users WHERE user_id = ?", (user_id,)) is not None
+
+    async def all_users(self):
+        return self._all("SELECT user_id, username FROM users")
+
+    async def users_page(self, page: int, per_page: int):
+        users = self._all("SELECT user_id, username FROM users ORDER BY rowid LIMIT ? OFFSET ?", (per_page, page * per_page))
+        return users, self._scalar("SELECT COUNT(*) FROM users")
+
+    # ---- channels ----
+    async def save_channel(self, doc: dict):
+        # Fields without a column of their own are kept as JSON, like Mongo keeps the whole document
+        extra = {key: value for key, value in doc.items() if key not in CHANNEL_COLUMNS and key != "_id"}
+        self._write(
+            SAVE_CHANNEL,
+            [doc.get(col) for col in CHANNEL_COLUMNS] + [json.dumps(extra, default=_json_default) if extra else None]
+        )
+
+    async def set_channel_status(self, channel_id: int, status: str, updated_at):
+        return self._write(
+            "UPDATE submissions SET status = ?, updated_at = ? WHERE channel_id = ?",
+            (status, updated_at, channel_id)
+        ) > 0
+
+    async def get_channel(self, channel_id: int):
+        return _channel(self._one("SELECT * FROM submissions WHERE channel_id = ?", (channel_id,)))
+
+    async def get_channels(self, channel_ids: list):
+        # Chunked to stay under SQLite's bound-parameter limit
+        channels = []
+        for start in range(0, len(channel_ids), 500):
+            chunk = channel_ids[start:start + 500]
+            channels.extend(_channels(self._all(
+                f"SELECT * FROM submissions WHERE channel_id IN ({', '.join('?' * len(chunk))})", chunk
+            )))
+        return channels
+
+    async def user_channels(self, user_id: int, status=None):
+        if status:
+            return _channels(self._all(
+                "SELECT * FROM submissions WHERE user_id = ? AND status = ? ORDER BY added_at DESC",
+                (user_id, status)
+            ))
+        return _channels(self._all("SELECT * FROM submissions WHERE user_id = ? ORDER BY added_at DESC", (user_id,)))
+
+    async def user_channels_page(self, user_id: int, status, page: int, per_page: int):
+        if status:
+            where, params = "user_id = ? AND status = ?", (user_id, status)
+        else:
+            where, params = "user_id = ?", (user_id,)
+        channels = _channels(self._all(
+            f"SELECT * FROM submissions WHERE {where} ORDER BY added_at DESC LIMIT ? OFFSET ?",
+            params + (per_page, page * per_page)
+        ))
+        return channels, self._scalar(f"SELECT COUNT(*) FROM submissions WHERE {where}", params)
+
+    async def count_user_channels(self, user_id: int):
+        return self._scalar("SELECT COUNT(*) FROM submissions WHERE user_id = ?", (user_id,))
+
+    async def remove_channel(self, user_id: int, channel_id: int):
+        return self._write(
+            "DELETE FROM submissions WHERE user_id = ? AND channel_id = ?", (user_id, channel_id)
+        ) > 0
+
+    async def channels_in_range(self, category: str, low, high, exclude_ids):
+        # Served by the (category, status, subs_count) index; banned ids are few, filter them here
+        channels = self._all(
+            "SELECT channel_id, title, username, subs_count FROM submissions "
+            "WHERE category = ? AND status = 'APPROVED' AND subs_count >= ? AND subs_count < ? "
+            "ORDER BY subs_count",
+            (category, -1 << 62 if low is None else low, 1 << 62 if high is None else high)
+        )
+        if exclude_ids:
+            channels = [ch for ch in channels if ch["channel_id"] not in exclude_ids]
+        return channels
+
+    async def approved_channels(self, exclude_ids):
+        channels = self._all(
+            "SELECT channel_id, title, username, category, subs_count FROM submissions WHERE status = 'APPROVED'"
+        )
+        if exclude_ids:
+            channels = [ch for ch in channels if ch["channel_id"] not in exclude_ids]
+        return channels
+
+    async def all_channels(self):
+        return _channels(self._all("SELECT * FROM submissions"))
+
+    async def channels_page(self, page: int, per_page: int):
+        channels = self._all(
+            "SELECT channel_id, title, username, status, subs_count FROM submissions ORDER BY rowid LIMIT ? OFFSET ?",
+            (per_page, page * per_page)
+        )
+        return channels, self._scalar("SELECT COUNT(*) FROM submissions")
+
+    async def counts(self):
+        by_status = {
+            row["status"]: row["count"]
+            for row in self._all("SELECT status, COUNT(*) AS count FROM submissions GROUP BY status")
+        }
+        return (
+            by_status,
+            self._scalar("SELECT COUNT(*) FROM users"),
+            self._scalar("SELECT COUNT(*) FROM banned_users"),
+            self._scalar("SELECT COUNT(*) FROM banned_channels"),
+        )
+
+    # ---- promos ----
+    async def get_promo(self, promo_id: str):
+        return self._one("SELECT * FROM promos WHERE promo_id = ?", (promo_id,))
+
+    async def promos_page(self, page: int, per_page: int):
+        promos = self._all("SELECT * FROM promos ORDER BY rowid LIMIT ? OFFSET ?", (per_page, page * per_page))
+        return promos, self._scalar("SELECT COUNT(*) FROM promos")
+
+    async def due_promos(self, now, limit: int):
+        return self._all("SELECT * FROM promos WHERE expires_at <= ? ORDER BY expires_at LIMIT ?", (now, limit))
+
+    async def insert_promos(self, docs: list):
+        with self.conn:
+            self.conn.executemany(INSERT_PROMO, [[doc.get(col) for col in PROMO_COLUMNS] for doc in docs])
+
+    async def remove_promo(self, channel, message_id: int):
+        self._write("DELETE FROM promos WHERE channel = ? AND message_id = ?", (channel, message_id))
+
+    # ---- campaigns ----
+    async def insert_campaign(self, doc: dict):
+        doc = _encode(doc)
+        self._write(INSERT_CAMPAIGN, [doc.get(col) for col in CAMPAIGN_COLUMNS])
+
+    async def get_campaign(self, campaign_id: str):
+        return _decode(self._one("SELECT * FROM campaigns WHERE campaign_id = ?", (campaign_id,)))
+
+    async def update_campaign(self, campaign_id: str, fields: dict):
+        fields = _encode(fields)
+        self._write(
+            f"UPDATE campaigns SET {_set_clause(fields, CAMPAIGN_COLUMNS)} WHERE campaign_id = ?",
+            list(fields.values()) + [campaign_id]
+        )
+
+    async def finish_campaign(self, campaign_id: str, fields: dict):
+        fields = _encode(dict(fields, status="done"))
+        return self._write(
+            f"UPDATE campaigns SET {_set_clause(fields, CAMPAIGN_COLUMNS)} WHERE campaign_id = ? AND status = 'running'",
+            list(fields.values()) + [campaign_id]
+        ) > 0
+
+    async def running_campaigns(self):
+        return [_decode(row) for row in self._all("SELECT * FROM campaigns WHERE status = 'running'")]
+
+    async def campaign_promos(self, campaign_id: str):
+        return self._all("SELECT * FROM promos WHERE campaign_id = ?", (campaign_id,))
+
+    async def remove_campaign_promos(self, campaign_id: str, channels: list):
+        removed = 0
+        with self.conn:
+            for start in range(0, len(channels), 500):
+                chunk = channels[start:start + 500]
+                removed += self.conn.execute(
+                    f"DELETE FROM promos WHERE campaign_id = ? AND channel IN ({', '.join('?' * len(chunk))})",
+                    [campaign_id, *chunk]
+                ).rowcount
+        return removed
+
+    async def remove_campaign(self, campaign_id: str):
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM promos WHERE campaign_id = ?", (campaign_id,)).rowcount
+            self.conn.execute("DELETE FROM jobs WHERE campaign_id = ?", (campaign_id,))
+            self.conn.execute("DELETE FROM campaigns WHERE campaign_id = ?", (campaign_id,))
+        return removed
+
+    async def campaigns_page(self, page: int, per_page: int):
+        campaigns = self._all(
+            "SELECT * FROM campaigns ORDER BY campaign_id DESC LIMIT ? OFFSET ?", (per_page, page * per_page)
+        )
+        return [_decode(row) for row in campaigns], self._scalar("SELECT COUNT(*) FROM campaigns")
+
+    # ---- campaign jobs ----
+    async def insert_jobs(self, docs: list):
+        with self.conn:
+            self.conn.executemany(INSERT_JOB, [[doc.get(col) for col in JOB_COLUMNS] for doc in docs])
+
+    async def claim_job(self, now):
+        # Select and update run back to back on the one connection, so no other claim can interleave
+        job = self._one(
+            "SELECT * FROM jobs WHERE status = 'pending' AND not_before <= ? ORDER BY not_before, job_id LIMIT 1",
+            (now,)
+        )
+        if job is None:
+            return None
+        job.update(status="sending", attempts=job["attempts"] + 1, updated_at=now)
+        self._write(
+            "UPDATE jobs SET status = 'sending', attempts = ?, updated_at = ? WHERE job_id = ?",
+            (job["attempts"], now, job["job_id"])
+        )
+        return job
+
+    async def update_job(self, job_id: str, fields: dict):
+        self._write(f"UPDATE jobs SET {_set_clause(fields, JOB_COLUMNS)} WHERE job_id = ?", list(fields.values()) + [job_id])
+
+    async def settle_job(self, job_id: str, campaign_id: str, fields: dict):
+        with self.conn:
+            settled = self.conn.execute(
+                f"UPDATE jobs SET {_set_clause(fields, JOB_COLUMNS)} WHERE job_id = ? AND status = 'sending'",
+                list(fields.values()) + [job_id]
+            ).rowcount
+            if not settled:
+                return None
+            self.conn.execute("UPDATE campaigns SET open_jobs = open_jobs - 1 WHERE campaign_id = ?", (campaign_id,))
+        campaign = self._one("SELECT open_jobs FROM campaigns WHERE campaign_id = ?", (campaign_id,))
+        return campaign["open_jobs"] if campaign else None
+
+    async def requeue_jobs(self, status: str, stale_before):
+        return self._write("UPDATE jobs SET status = 'pending' WHERE status = ? AND updated_at < ?", (status, stale_before))
+
+    async def job_counts(self, campaign_id: str):
+        return {
+            row["status"]: row["count"]
+            for row in self._all("SELECT status, COUNT(*) AS count FROM jobs WHERE campaign_id = ? GROUP BY status", (campaign_id,))
+        }
+
+    async def campaign_jobs(self, campaign_id: str, status=None):
+        if status:
+            return self._all("SELECT * FROM jobs WHERE campaign_id = ? AND status = ? ORDER BY job_id", (campaign_id, status))
+        return self._all("SELECT * FROM jobs WHERE campaign_id = ? ORDER BY job_id", (campaign_id,))
+
+    # ---- scheduled and recurring campaigns ----
+    async def insert_schedule(self, doc: dict):
+        doc = _encode(doc)
+        self._write(INSERT_SCHEDULE, [doc.get(col) for col in SCHEDULE_COLUMNS])
+
+    async def get_schedule(self, schedule_id: str):
+        return _decode(self._one("SELECT * FROM schedules WHERE schedule_id = ?", (schedule_id,)))
+
+    async def update_schedule(self, schedule_id: str, fields: dict):
+        fields = _encode(fields)
+        self._write(
+            f"UPDATE schedules SET {_set_clause(fields, SCHEDULE_COLUMNS)} WHERE schedule_id = ?",
+            list(fields.values()) + [schedule_id]
+        )
+
+    async def remove_schedule(self, schedule_id: str):
+        return self._write("DELETE FROM schedules WHERE schedule_id = ?", (schedule_id,)) > 0
+
+    async def active_schedules(self):
+        return [_decode(row) for row in self._all("SELECT * FROM schedules WHERE status = 'active' ORDER BY next_run")]
+
+    async def next_schedule_run(self):
+        row = self._one("SELECT next_run FROM schedules WHERE status = 'active' ORDER BY next_run LIMIT 1")
+        return row["next_run"] if row else None
+
+    async def due_schedules(self, now):
+        return [
+            _decode(row)
+            for row in self._all("SELECT * FROM schedules WHERE status = 'active' AND next_run <= ? ORDER BY next_run", (now,))
+        ]
+
+    # ---- channel exposure ----
+    async def record_exposure(self, channel_ids: list, featured_at):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO exposure (channel_id, appearances, last_featured_at) VALUES (?, 1, ?) "
+                "ON CONFLICT (channel_id) DO UPDATE SET appearances = appearances + 1, last_featured_at = excluded.last_featured_at",
+                [(cid, featured_at) for cid in channel_ids]
+            )
+
+    async def get_exposure(self, channel_ids: list):
+        # Chunked to stay under SQLite's bound-parameter limit
+        exposure = {}
+        for start in range(0, len(channel_ids), 500):
+            chunk = channel_ids[start:start + 500]
+            for row in self._all(f"SELECT * FROM exposure WHERE channel_id IN ({', '.join('?' * len(chunk))})", chunk):
+                exposure[row["channel_id"]] = row
+        return exposure
+
+    # ---- media file_id cache ----
+    async def get_media(self, key: str):
+        return self._one("SELECT * FROM media_cache WHERE key = ?", (key,))
+
+    async def save_media(self, doc: dict):
+        self._write(
+            "INSERT OR REPLACE INTO media_cache (key, url, media_type, file_id, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (doc["key"], doc["url"], doc["media_type"], doc["file_id"], doc["updated_at"])
+        )
+
+    async def remove_media(self, key: str):
+        self._write("DELETE FROM media_cache WHERE key = ?", (key,))
+
+    # ---- bans ----
+    async def ban_user(self, user_id: int, banned_at):
+        self._write("INSERT OR REPLACE INTO banned_users (user_id, banned_at) VALUES (?, ?)", (user_id, banned_at))
+
+    async def unban_user(self, user_id: int):
+        self._write("DELETE FROM banned_users WHERE user_id = ?", (user_id,))
+
+    async def banned_users(self):
+        return self._all("SELECT user_id, banned_at FROM banned_users")
+
+    async def ban_channel(self, channel_id: int, banned_at):
+        self._write("INSERT OR REPLACE INTO banned_channels (channel_id, banned_at) VALUES (?, ?)", (channel_id, banned_at))
+
+    async def unban_channel(self, channel_id: int):
+        self._write("DELETE FROM banned_channels WHERE channel_id = ?", (channel_id,))
+
+    async def banned_channels(self):
+        return self._all("SELECT channel_id, banned_at FROM banned_channels")
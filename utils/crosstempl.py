@@ -1,4 +1,6 @@
 # utils/crosstempl.py
+from functools import lru_cache
+from types import MappingProxyType
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from pyrogram.enums import ParseMode
 
@@ -7,41 +9,45 @@ from pyrogram.enums import ParseMode
 # -----------------------------
 
 def get_promo_templates():
-    """Return list of available promo templates"""
-    return [
-        {"id": "template1", "name": "🚀 Standard Promo", "description": "Clean and professional"},
-        {"id": "template2", "name": "🔥 Viral Style", "description": "Eye-catching and engaging"},
-        {"id": "template3", "name": "💎 Premium Look", "description": "Elegant and sophisticated"},
-        {"id": "template4", "name": "🎯 Direct Call", "description": "Action-oriented and direct"},
-        {"id": "template5", "name": "🌟 Community Focus", "description": "Friendly and community-driven"},
-        {"id": "template6", "name": "📱 Grid Style Promo", "description": "Modern grid layout with channel pairs"}
-    ]
+    """Return the available promo templates, in menu order"""
+    return PROMO_TEMPLATES
+
+def get_template(template_id):
+    """O(1) lookup by id; unknown ids fall back to the standard template"""
+    return TEMPLATES_BY_ID.get(template_id, TEMPLATES_BY_ID[DEFAULT_TEMPLATE])
+
+def channel_key(channels):
+    """The only channel fields rendering reads, as a hashable tuple of (username, title)"""
+    return tuple((channel.get('username'), channel.get('title', 'Unknown Channel')) for channel in channels)
 
 def generate_promo_message(template_id, channels, category=None, bot_name="PromoFather"):
     """Generate promo message based on template"""
-    templates = {
-        "template1": _template_standard,
-        "template2": _template_viral,
-        "template3": _template_premium,
-        "template4": _template_direct,
-        "template5": _template_community,
-        "template6": _template_grid_style
-    }
-    
-    return templates.get(template_id, _template_standard)(channels, category, bot_name)
+    return _render_message(template_id, channel_key(channels), category, bot_name)
 
 def generate_promo_buttons(channels, bot_username):
-    """Generate buttons for the promo message in a grid layout with Add Your Channel button"""
+    """Generate buttons for the promo message in a grid layout with Add Your Channel button.
+
+    The markup is memoized and shared between callers, so treat it as read-only.
+    """
+    return _render_buttons(channel_key(channels), bot_username)
+
+# -----------------------------
+# MEMOIZED RENDERING
+# -----------------------------
+
+@lru_cache(maxsize=256)
+def _render_message(template_id, channels, category, bot_name):
+    return get_template(template_id)["render"](channels, category, bot_name)
+
+@lru_cache(maxsize=256)
+def _render_buttons(channels, bot_username):
     buttons = []
     row = []
     
     # Button icons for different channel types
     icons = ["📺", "📢", "🌟", "🔥", "💎", "🚀", "🎯", "📰", "🎬", "⚽", "💻", "💸"]
     
-    for i, channel in enumerate(channels):
-        username = channel.get('username')
-        title = channel.get('title', 'Unknown Channel')
-        
+    for i, (username, title) in enumerate(channels):
         if username and username != 'private':
             # Use a different icon for each button
             icon = icons[i % len(icons)]
@@ -145,7 +151,10 @@ def _template_community(channels, category=None, bot_name="PromoFather"):
     return message
 
 def _template_grid_style(channels, category=None, bot_name="PromoFather"):
-    """Grid-style template with channel pairs - clickable Join Now links in message"""
+    """Grid-style template with channel pairs - clickable Join Now links in message.
+
+    channels is a channel_key() tuple of (username, title) pairs.
+    """
     separator = "━━━━━━━━━━━━━━━━━━━━━━━━"
     
     message = "📜 𝗔𝗽𝗽 𝗛𝗮𝗰𝗸𝗶𝗻𝗴  ✅ 𝗣𝗿𝗲𝗺𝗶𝘂𝗺 𝗠𝗼𝗱𝘀 📜\n"
@@ -154,18 +163,14 @@ def _template_grid_style(channels, category=None, bot_name="PromoFather"):
     # Create pairs of channels
     for i in range(0, len(channels), 2):
         if i < len(channels):
-            ch1 = channels[i]
-            title1 = ch1.get('title', 'Unknown Channel')
-            username1 = ch1.get('username')
+            username1, title1 = channels[i]
             
             # Format the title to fit the grid style
             if len(title1) > 15:
                 title1 = title1[:12] + "..."
             
             if i + 1 < len(channels):
-                ch2 = channels[i + 1]
-                title2 = ch2.get('title', 'Unknown Channel')
-                username2 = ch2.get('username')
+                username2, title2 = channels[i + 1]
                 
                 # Format the title to fit the grid style
                 if len(title2) > 15:
@@ -207,6 +212,10 @@ def _template_grid_style(channels, category=None, bot_name="PromoFather"):
 
 def generate_grid_promo_buttons(channels, bot_username):
     """For grid template, we only want the 'Add Your Channel' button"""
+    return _render_grid_buttons(bot_username)
+
+@lru_cache(maxsize=16)
+def _render_grid_buttons(bot_username):
     buttons = []
     
     # Add only the "Add Your Channel" button
@@ -215,25 +224,37 @@ def generate_grid_promo_buttons(channels, bot_username):
     
     return InlineKeyboardMarkup(buttons) if buttons else None
 
+# -----------------------------
+# TEMPLATE REGISTRY
+# -----------------------------
+
+DEFAULT_TEMPLATE = "template1"
+
+# Built once at import and read-only afterwards; "render" is the template function
+PROMO_TEMPLATES = tuple(MappingProxyType(template) for template in (
+    {"id": "template1", "name": "🚀 Standard Promo", "description": "Clean and professional", "render": _template_standard},
+    {"id": "template2", "name": "🔥 Viral Style", "description": "Eye-catching and engaging", "render": _template_viral},
+    {"id": "template3", "name": "💎 Premium Look", "description": "Elegant and sophisticated", "render": _template_premium},
+    {"id": "template4", "name": "🎯 Direct Call", "description": "Action-oriented and direct", "render": _template_direct},
+    {"id": "template5", "name": "🌟 Community Focus", "description": "Friendly and community-driven", "render": _template_community},
+    {"id": "template6", "name": "📱 Grid Style Promo", "description": "Modern grid layout with channel pairs", "render": _template_grid_style},
+))
+
+TEMPLATES_BY_ID = MappingProxyType({template["id"]: template for template in PROMO_TEMPLATES})
+
 # -----------------------------
 # TEMPLATE SELECTION KEYBOARD
 # -----------------------------
 
+TEMPLATE_SELECTION_KEYBOARD = InlineKeyboardMarkup(
+    [[InlineKeyboardButton(template["name"], callback_data=f"promo_template:{template['id']}")] for template in PROMO_TEMPLATES]
+    + [
+        # Add the "Write Promo" button
+        [InlineKeyboardButton("✍️ Write Promo", callback_data="write_promo")],
+        [InlineKeyboardButton("↩ Back", callback_data="promo_back_categories")],
+    ]
+)
+
 def get_template_selection_keyboard():
-    """Generate keyboard for template selection"""
-    templates = get_promo_templates()
-    buttons = []
-    
-    for template in templates:
-        buttons.append([
-            InlineKeyboardButton(
-                template["name"], 
-                callback_data=f"promo_template:{template['id']}"
-            )
-        ])
-    
-    # Add the "Write Promo" button
-    buttons.append([InlineKeyboardButton("✍️ Write Promo", callback_data="write_promo")])
-    buttons.append([InlineKeyboardButton("↩ Back", callback_data="promo_back_categories")])
-    
-    return InlineKeyboardMarkup(buttons)
+    """Keyboard for template selection; static, so it is built once at import"""
+    return TEMPLATE_SELECTION_KEYBOARD
@@ -0,0 +1,20 @@
+# utils/fairness.py
+import heapq
+
+def exposure_key(exposure: dict):
+    """Fewest appearances first, then longest since last featured (never featured sorts first)"""
+    last = exposure.get("last_featured_at")
+    return exposure.get("appearances", 0), last.timestamp() if last else float("-inf")
+
+def fair_pick(channels, exposure: dict, k: int):
+    """The k least-exposed channels, in pick order.
+
+    heapify is O(n) and each pop O(log n), so a pick costs O(n + k log n)
+    and the listing is never fully sorted. Ties keep listing order.
+    """
+    heap = [
+        (*exposure_key(exposure.get(channel["channel_id"], {})), index)
+        for index, channel in enumerate(channels)
+    ]
+    heapq.heapify(heap)
+    return [channels[heapq.heappop(heap)[-1]] for _ in range(min(k, len(heap)))]
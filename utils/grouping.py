@@ -0,0 +1,64 @@
+# utils/grouping.py
+from bisect import bisect_right
+from itertools import groupby
+
+def balanced_sizes(count: int, min_size: int):
+    """Split `count` into as many groups of at least min_size as possible, sizes differing by at most one"""
+    groups = count // min_size
+    if groups == 0:
+        return []
+    base, extra = divmod(count, groups)
+    return [base + 1] * extra + [base] * (groups - extra)
+
+def range_finder(subs_ranges: dict):
+    """Map a subscriber count to its config.SUBS_RANGES key (or None) with one bisect"""
+    ordered = sorted(subs_ranges.items(), key=lambda item: item[1][1])
+    lows = [low for _, (_, low, _) in ordered]
+
+    def find(subs: int):
+        index = bisect_right(lows, subs) - 1
+        if index < 0:
+            return None
+        key, (_, _, high) = ordered[index]
+        return key if high is None or subs < high else None
+    return find
+
+def group_channels(channels, min_size: int, subs_ranges: dict):
+    """Partition channels into cross-promo groups per (category, subscriber range).
+
+    One sort by (category, range, subs_count) puts every bucket in a
+    contiguous run ordered by size; each run is then cut into consecutive
+    slices of balanced size, so a group holds the channels nearest to each
+    other in subscribers. Buckets smaller than min_size stay ungrouped.
+
+    Returns (groups, leftovers) where each group is
+    {"category", "subs_range", "channels", "min_subs", "max_subs"}.
+    """
+    find_range = range_finder(subs_ranges)
+    range_order = {key: index for index, key in enumerate(subs_ranges)}
+    keyed = []
+    leftovers = []
+    for channel in channels:
+        subs_range = find_range(channel.get("subs_count") or 0)
+        if subs_range is None:
+            leftovers.append(channel)
+        else:
+            keyed.append((channel.get("category") or "", range_order[subs_range], subs_range, channel))
+    keyed.sort(key=lambda item: (item[0], item[1], item[3].get("subs_count") or 0, item[3]["channel_id"]))
+
+    groups = []
+    for (category, _, subs_range), run in groupby(keyed, key=lambda item: item[:3]):
+        bucket = [item[3] for item in run]
+        start = 0
+        for size in balanced_sizes(len(bucket), min_size):
+            members = bucket[start:start + size]
+            start += size
+            groups.append({
+                "category": category,
+                "subs_range": subs_range,
+                "channels": members,
+                "min_subs": members[0].get("subs_count") or 0,
+                "max_subs": members[-1].get("subs_count") or 0,
+            })
+        leftovers.extend(bucket[start:])
+    return groups, leftovers
@@ -0,0 +1,62 @@
+# utils/media.py
+import asyncio
+import hashlib
+from pyrogram.errors import FileIdInvalid, FileReferenceExpired, FileReferenceInvalid, MediaEmpty
+import database
+
+# Telegram no longer accepts a cached file_id; uploading from the URL again fixes it
+STALE_FILE_ID_ERRORS = (FileIdInvalid, FileReferenceExpired, FileReferenceInvalid, MediaEmpty)
+
+_file_ids = {}  # key -> file_id, in-process copy of the persistent media cache
+_upload_locks = {}  # key -> lock, so concurrent first sends upload an asset once
+
+def media_key(url: str):
+    return hashlib.sha256(url.encode()).hexdigest()
+
+def sent_file_id(message, media_type: str):
+    """file_id of the media Telegram stored for a sent message"""
+    # A video URL may come back as an animation or document, depending on the file
+    media = getattr(message, media_type, None) or message.animation or message.document
+    return media.file_id if media else None
+
+async def cached_file_id(key: str):
+    file_id = _file_ids.get(key)
+    if file_id is None:
+        file_id = await database.get_media_file_id(key)
+        if file_id:
+            _file_ids[key] = file_id
+    return file_id
+
+async def forget(key: str):
+    _file_ids.pop(key, None)
+    await database.remove_media_file_id(key)
+
+async def send_cached(url: str, media_type: str, send):
+    """Send an asset by URL through send(media), reusing its cached file_id.
+
+    The first send passes the URL (Telegram fetches it once) and stores the
+    returned file_id; later sends pass the file_id. A rejected file_id is
+    dropped and the asset is uploaded from the URL again.
+    """
+    key = media_key(url)
+    file_id = await cached_file_id(key)
+    if file_id:
+        try:
+            return await send(file_id)
+        except STALE_FILE_ID_ERRORS as e:
+            print(f"[MEDIA] Cached file_id for {url} rejected ({e}), uploading again")
+            await forget(key)
+
+    lock = _upload_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another send may have uploaded it while we waited
+        file_id = _file_ids.get(key)
+        if file_id:
+            return await send(file_id)
+        message = await send(url)
+        file_id = sent_file_id(message, media_type)
+        if file_id:
+            _file_ids[key] = file_id
+            await database.save_media_file_id(key, url, media_type, file_id)
+            print(f"[MEDIA] Cached {media_type} file_id for {url}")
+        return message
@@ -0,0 +1,168 @@
+# utils/outbound.py
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from pyrogram import Client, raw
+import config
+
+# -----------------------------
+# Priority classes (lower goes first)
+# -----------------------------
+INTERACTIVE, NORMAL, BULK = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", NORMAL: "normal", BULK: "bulk"}
+
+# Handlers reply to users by default; workers and fan-outs lower their priority
+send_priority = contextvars.ContextVar("send_priority", default=INTERACTIVE)
+
+@contextmanager
+def priority(level: int):
+    """Run outbound calls in this block (and tasks started from it) at `level`"""
+    token = send_priority.set(level)
+    try:
+        yield
+    finally:
+        send_priority.reset(token)
+
+# Raw calls that count against Telegram's message limits
+LIMITED_CALLS = (
+    raw.functions.messages.SendMessage,
+    raw.functions.messages.SendMedia,
+    raw.functions.messages.SendMultiMedia,
+    raw.functions.messages.ForwardMessages,
+    raw.functions.messages.EditMessage,
+    raw.functions.messages.DeleteMessages,
+    raw.functions.channels.DeleteMessages,
+)
+
+def outbound_chat(query):
+    """Chat id a raw call targets, or None when it has no peer (e.g. private-chat deletes)"""
+    peer = getattr(query, "to_peer", None) or getattr(query, "peer", None) or getattr(query, "channel", None)
+    if peer is None:
+        return None
+    return getattr(peer, "channel_id", None) or getattr(peer, "chat_id", None) or getattr(peer, "user_id", None)
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self):
+        """Seconds until a token is available (0 if one is available now)"""
+        self._refill()
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def reserve(self):
+        """Take a token now, going into debt if needed; return how long to wait before using it"""
+        self._refill()
+        self.tokens -= 1
+        return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def full(self):
+        self._refill()
+        return self.tokens >= self.burst
+
+class OutboundScheduler:
+    """Admits outbound calls through per-chat buckets, then one global bucket in priority order"""
+
+    def __init__(self, global_rate: float, global_burst: float, chat_rate: float, chat_burst: float):
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.chat_buckets = {}  # chat id -> TokenBucket
+        self._queue = []  # heap of (priority, seq, future)
+        self._seq = itertools.count()
+        self._dispatcher = None
+        self.granted = {level: 0 for level in PRIORITY_NAMES}
+        self.wait_total = {level: 0.0 for level in PRIORITY_NAMES}
+        self.wait_max = {level: 0.0 for level in PRIORITY_NAMES}
+
+    async def acquire(self, chat_id, level: int = INTERACTIVE):
+        started = time.monotonic()
+        if chat_id is not None:
+            delay = self._chat_bucket(chat_id).reserve()
+            if delay:
+                await asyncio.sleep(delay)
+        await self._acquire_global(level)
+
+        waited = time.monotonic() - started
+        self.granted[level] += 1
+        self.wait_total[level] += waited
+        self.wait_max[level] = max(self.wait_max[level], waited)
+
+    def _chat_bucket(self, chat_id):
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self.chat_buckets) >= 10000:
+                # Forget chats that have been idle long enough to refill completely
+                self.chat_buckets = {cid: b for cid, b in self.chat_buckets.items() if not b.full()}
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    async def _acquire_global(self, level: int):
+        if not self._queue and self.global_bucket.delay() == 0:
+            self.global_bucket.take()
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (level, next(self._seq), future))
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        """Hand out global tokens to queued callers, highest priority first"""
+        try:
+            while self._queue:
+                delay = self.global_bucket.delay()
+                if delay:
+                    await asyncio.sleep(delay)
+                    continue
+                _, _, future = heapq.heappop(self._queue)
+                if future.done():
+                    continue  # caller was cancelled while queued
+                self.global_bucket.take()
+                future.set_result(None)
+        finally:
+            self._dispatcher = None
+
+    def stats(self):
+        queued = {level: 0 for level in PRIORITY_NAMES}
+        for level, _, future in self._queue:
+            if not future.done():
+                queued[level] += 1
+        return {
+            PRIORITY_NAMES[level]: {
+                "queued": queued[level],
+                "granted": self.granted[level],
+                "avg_wait_ms": self.wait_total[level] / self.granted[level] * 1000 if self.granted[level] else 0.0,
+                "max_wait_ms": self.wait_max[level] * 1000,
+            }
+            for level in PRIORITY_NAMES
+        } | {"chats_tracked": len(self.chat_buckets)}
+
+scheduler = OutboundScheduler(
+    config.OUTBOUND_GLOBAL_RATE, config.OUTBOUND_GLOBAL_BURST,
+    config.OUTBOUND_CHAT_RATE, config.OUTBOUND_CHAT_BURST
+)
+
+class ScheduledClient(Client):
+    """Client whose message sends, edits and deletes all pass through the outbound scheduler"""
+
+    async def invoke(self, query, *args, **kwargs):
+        if isinstance(query, LIMITED_CALLS):
+            await scheduler.acquire(outbound_chat(query), send_priority.get())
+        return await super().invoke(query, *args, **kwargs)
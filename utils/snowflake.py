@@ -0,0 +1,46 @@
+# utils/snowflake.py
+import os
+import threading
+import time
+
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+class Snowflake:
+    """Monotonic 64-bit ids: 41 bits of milliseconds, 10 bits of worker, 12 bits of sequence.
+
+    Ids sort by creation time and never repeat within a process, even when
+    thousands are drawn in the same millisecond.
+    """
+
+    def __init__(self, worker_id: int = 0):
+        self.worker_id = worker_id & ((1 << WORKER_BITS) - 1)
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self):
+        with self._lock:
+            now = int(time.time() * 1000) - EPOCH_MS
+            if now < self._last_ms:
+                now = self._last_ms  # clock went backwards: keep counting from the last tick
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    now += 1  # sequence exhausted: borrow the next millisecond
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (now << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+    @staticmethod
+    def timestamp(snowflake: int):
+        """Unix time in seconds at which an id was generated"""
+        return ((snowflake >> (WORKER_BITS + SEQUENCE_BITS)) + EPOCH_MS) / 1000
+
+_default = Snowflake(int(os.getenv("SNOWFLAKE_WORKER_ID", os.getpid())))
+
+def next_id():
+    return _default.next_id()